@@ -1,18 +1,34 @@
 import time
-from .machine import TuringMachine as _TMachine, _get_error_message, _check_determinism
+from array import array
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+from .machine import TuringMachine as _TMachine, _get_error_message
 from .tuples import TuringTuple as _TMTuple
-from .main import parse as _parse
+from .program import Program, parse as _parse, compile_program as _compile_program
+from .macro import MacroMachine as _MacroMachine
+from .history import Checkpoints as _Checkpoints, Journal as _Journal
+from .batch import run_batch, BatchResult
+from .lockstep import run_lockstep
+from .cache import ParseCache as _ParseCache
+from .analysis import ProgramReport, analyze as _analyze
+from .symbolic import SymbolicRule as _SymbolicRule
+from .profiler import Profiler as _Profiler, ProfileReport
+from .cycles import CycleDetector as _CycleDetector
+from .bench import bench_suite, run_bench, save_bench, load_bench, compare_bench, BenchCase, BenchResult, Regression
 
-def parse_tuples(input_string: str, is_file: bool = True, to_print: bool = False) -> list[_TMTuple] | list[str]:
+_parse_cache = None
+
+def parse_tuples(input_string: str | Iterable[str], is_file: bool = True, to_print: bool = False) -> list[_TMTuple] | list[str]:
     r"""
     Parses the given input and returns a parsed version of the tuples as a list. ``Input_string`` is the string that
     can either be the name of the file that contains the tuples or the tuples as a single string separated by \n based
     on the boolean ``is_file`` argument. It's recommended to read from a file though, hence the default True value of
     the argument. By default this function returns a list of TuringTuple objects, but you can set ``to_print`` to True
     to get back a print-friendly version of the parsed tuples that is however unusable in the machine.
+    ``Input_string`` can also be ``-`` to read the tuples from the standard input, or any iterable of lines (like an
+    open pipe or a generator): the lines are parsed as they arrive and they are not kept in memory.
     """
-    code_tuples, *_, code_map, pars_errors = _parse(input_string, is_file)
-    pars_errors.extend(_check_determinism(code_tuples))
+    code_tuples, *_, code_map, pars_errors = _parse(input_string, is_file, _parse_cache, keep_lines=False)
     if len(pars_errors) > 0:
         errors = [(_get_error_message([error], code_map, is_instant=True, is_keyboard=False)) for error in pars_errors]
         class ParsingError(RuntimeError):
@@ -23,15 +39,16 @@ def parse_tuples(input_string: str, is_file: bool = True, to_print: bool = False
     else:
         return code_tuples
 
-def parse_breakpoints(input_string: str, is_file: bool = True) -> list[bool]:
+def parse_breakpoints(input_string: str | Iterable[str], is_file: bool = True) -> list[bool]:
     r"""
     Parses the given input and returns a parsed version of the breakpoints as a list. ``Input_string`` is the string that
     can either be the name of the file that contains the tuples or the tuples as a single string separated by \n based
     on the boolean ``is_file`` argument. It's recommended to read from a file though, hence the default True value of
     the argument. This function returns a list of boolean values, where ``True`` represents a breakpoint.
+    Like in ``parse_tuples``, ``input_string`` can also be ``-`` for the standard input or any iterable of lines.
     """
-    code_tuples, _, remapped_breakpoint_list, *_, code_map, pars_errors = _parse(input_string, is_file)
-    pars_errors.extend(_check_determinism(code_tuples))
+    code_tuples, _, remapped_breakpoint_list, *_, code_map, pars_errors = _parse(input_string, is_file, _parse_cache,
+                                                                                 keep_lines=False)
     if len(pars_errors) > 0:
         errors = [(_get_error_message([error], code_map, is_instant=True, is_keyboard=False)) for error in pars_errors]
         class ParsingError(RuntimeError):
@@ -39,21 +56,92 @@ def parse_breakpoints(input_string: str, is_file: bool = True) -> list[bool]:
         raise ParsingError("Some errors were found while parsing the input: \n" + "\n".join(errors))
     return remapped_breakpoint_list
 
+def compile_program(input_string: str | Iterable[str], is_file: bool = True, symbolic: bool = False,
+                    workers: int | None = 1, keep_lines: bool = True) -> Program:
+    r"""
+    Parses the given input in a single pass and returns a ``Program``, an immutable object with the expanded tuples, the
+    breakpoints, the lines of the program and the compiled transition table. ``Input_string`` and ``is_file`` work like
+    in the two parsing functions. A ``Program`` can be loaded in any number of machines (see ``load_program``) without
+    parsing or compiling it again, and it can be pickled to send it to other processes.
+
+    With ``symbolic`` the tuples of each line that only differ in the symbol they read are kept as a single rule with a
+    set of symbols, instead of a tuple for each symbol: programs that use the class or the exclusion notation a lot take
+    much less memory and load faster, while the machine runs the same way.
+
+    With ``workers`` other than 1, the lines of large programs are expanded in parallel on a pool of ``workers``
+    processes (``None`` uses one for each CPU), with the same result; this is useful for generated programs with
+    hundreds of thousands of lines, but not with ``symbolic``.
+
+    Like in the parsing functions, ``input_string`` can also be ``-`` or any iterable of lines, parsed as they arrive.
+    The lines of the program are kept in the ``Program`` only if ``keep_lines``, but they are not needed to run it.
+    """
+    program = _compile_program(input_string, is_file, _parse_cache, symbolic, workers, keep_lines)
+    if len(program.errors) > 0:
+        errors = [(_get_error_message([error], program.code_map, is_instant=True, is_keyboard=False)) for error in program.errors]
+        class ParsingError(RuntimeError):
+            pass
+        raise ParsingError("\nSome errors were found while parsing the input: \n" + "\n".join(errors))
+    return program
+
+def analyze_program(input_string: str | Program, is_file: bool = True) -> ProgramReport:
+    r"""
+    Analyses the given input without running it and returns a ``ProgramReport`` with the non-deterministic rules (with
+    their line numbers), the unreachable states, the halting states and the alphabet of the program. ``Input_string``
+    and ``is_file`` work like in the parsing functions, but ``input_string`` can also be a ``Program``. Only the syntax
+    errors raise an exception, as the non-deterministic rules are reported.
+    """
+    program = input_string if isinstance(input_string, Program) else _compile_program(input_string, is_file, _parse_cache,
+                                                                                      keep_lines=False)
+    if any(isinstance(x, _SymbolicRule) for x in program.tuples[:1]):
+        raise ValueError("Symbolic programs can't be analysed, compile the program without 'symbolic'")
+    pars_errors = [error for error in program.errors if error[1] != 'non_deterministic']
+    if len(pars_errors) > 0:
+        errors = [(_get_error_message([error], program.code_map, is_instant=True, is_keyboard=False)) for error in pars_errors]
+        class ParsingError(RuntimeError):
+            pass
+        raise ParsingError("\nSome errors were found while parsing the input: \n" + "\n".join(errors))
+    return _analyze(list(program.tuples), list(program.code_map))
+
+def set_cache(enabled: bool = True, directory: str = None, max_size: int = 64 * 2 ** 20) -> None:
+    r"""
+    Enables or disables, based on ``enabled``, the cache of the parsed programs used by the two parsing functions, which
+    is disabled by default. The programs are stored in ``directory`` (by default ``tm-simulator`` inside the user cache
+    directory, the same used by the script) and, when they take more than ``max_size`` bytes, the least recently used
+    ones are deleted.
+    """
+    global _parse_cache
+    _parse_cache = _ParseCache(directory, max_size) if enabled else None
+
+def clear_cache() -> None:
+    r"""
+    Deletes all the parsed programs in the cache used by the two parsing functions
+    """
+    if _parse_cache is not None:
+        _parse_cache.clear()
+
 
 class TuringMachine:
     r"""
     This is the main class of this module where the machine is managed. This is simply a wrapper of the base machine
     class cleaned up and remodelled to make it more user-friendly. The attributes of this class are:
      - ``state: str``: the name of the state the machine is in
-     - ``tape: str``: the used part of the tape as a unique string
+     - ``tape: str``: the used part of the tape as a unique string, built only when it's read after the machine changed
+       (setting it resets the machine with the new input tape, like ``reset(tape)``)
+     - ``head: int``: the position of the head, where 0 is the first cell of the input tape
      - ``steps: int``: the number of elapsed steps since the beginning if the simulation
      - ``runtime: float``: the number of seconds, rounded to the milliseconds, the machine has taken that far to run the simulation
      - ``ended: bool``: whether the machine has halted the simulation
      - ``paused: bool``: whether the machine is in the paused state
+     - ``looping: bool``: whether the machine was found stuck in a loop (see ``set_cycle_detection``)
+     - ``cycle_length: int | None``: the number of steps after which the loop repeats, or None if no loop was found
     """
 
-    def __init__(self, parsed_tuples: list[_TMTuple], parsed_breakpoints: list[bool], input_tape: str):
-        if any([x.raw_string for x in parsed_tuples]):
+    def __init__(self, parsed_tuples: list[_TMTuple] | Program, parsed_breakpoints: list[bool] | None, input_tape: str):
+        program = parsed_tuples if isinstance(parsed_tuples, Program) else None
+        if program is not None:
+            parsed_tuples = list(program.tuples)
+            parsed_breakpoints = list(program.tuple_breakpoints)
+        elif any([x.raw_string for x in parsed_tuples]):
             print("You can only pass a list of parsed tuples!")
             exit()
         self.parsed_tuples = parsed_tuples
@@ -70,15 +158,23 @@ class TuringMachine:
                   "debug": False,
                   "keyboard": False
                   }
-        self._machine = _TMachine(self.input_tape, parsed_tuples, [False], parsed_breakpoints, [""], [0], [], self._global_var)
+        if program is not None:
+            self._machine = _TMachine.from_program(program, self.input_tape, self._global_var)
+        else:
+            self._machine = _TMachine(self.input_tape, parsed_tuples, [False], parsed_breakpoints, [""], [0], [], self._global_var)
         self.state = self._machine.state
-        self.tape = "".join(self._machine.tape).strip()
+        self._tape = None
         self.steps = self._machine.steps
         self.ended = self._machine.ended
         self.paused = False
         self.threshold = 1_000_000
         self._machine.silent = True
         self.runtime = 0
+        self.looping = False
+        self.cycle_length = None
+        self._macro = None
+        self._cycles = None
+        self._views = 0
 
     @classmethod
     def load_file(cls, filename: str, input_tape: str) -> "TuringMachine":
@@ -87,9 +183,7 @@ class TuringMachine:
         parse and the ``input_tape`` of the machine. This method is useful when running single machine as it parses
         the input each time a new class is created with this.
         """
-        parsed_tuples = parse_tuples(filename)
-        parsed_breakpoints = parse_breakpoints(filename)
-        return cls(parsed_tuples, parsed_breakpoints, input_tape)
+        return cls(compile_program(filename), None, input_tape)
 
     @classmethod
     def load_tuples(cls, parsed_tuples: list[_TMTuple], parsed_breakpoint: list[bool], input_tape: str) -> "TuringMachine":
@@ -102,6 +196,93 @@ class TuringMachine:
         """
         return cls(parsed_tuples, parsed_breakpoint, input_tape)
 
+    @classmethod
+    def load_program(cls, program: Program, input_tape: str) -> "TuringMachine":
+        r"""
+        This is the fastest method to load the data into the machine, passing a ``program`` returned by
+        ``compile_program`` along the ``input_tape`` of the machine. The program is already parsed, checked and compiled,
+        so it can be shared by all the machines that run it.
+        """
+        return cls(program, None, input_tape)
+
+    @property
+    def tape(self) -> str:
+        r"""
+        The used part of the tape as a unique string. It's built the first time it's read after the machine changed and
+        then kept until the next change, so stepping the machine doesn't pay for it (see ``cell`` and ``window`` to read
+        a few cells instead). Setting it resets the machine with the new input tape (see ``reset``)
+        """
+        if self._tape is None:
+            self._tape = self._machine.compiled.decode(self._machine.cells.used()[1]).strip()
+        return self._tape
+
+    @tape.setter
+    def tape(self, value: str) -> None:
+        self.reset(value)
+
+    @property
+    def head(self) -> int:
+        r"""The position of the head, where 0 is the first cell of the input tape"""
+        return self._machine.tape_position - self._machine.cells.origin
+
+    @property
+    def symbols(self) -> list[str]:
+        r"""The symbol of each id in the buffer of ``tape_view`` (the blank symbol, ``" "``, is always 0)"""
+        return self._machine.compiled.symbols
+
+    def cell(self, position: int | None = None) -> str:
+        r"""
+        Returns the symbol on the cell at ``position``, where 0 is the first cell of the input tape and the negative
+        positions are on its left, or on the cell under the head if ``position`` is None. The blank cells are spaces.
+        """
+        position = self.head if position is None else position
+        return self._machine.compiled.symbols[self._machine.cells.window(position, position + 1)[0]]
+
+    def window(self, radius: int = 10) -> str:
+        r"""
+        Returns the ``2 * radius + 1`` cells around the head as a string, with the cell under the head in the middle and
+        the blank cells as spaces
+        """
+        head = self.head
+        return self._machine.compiled.decode(self._machine.cells.window(head - radius, head + radius + 1))
+
+    @contextmanager
+    def tape_view(self) -> Iterator[tuple[memoryview, int]]:
+        r"""
+        Returns a context manager that gives a read-only view of the buffer of the tape, without copying it, along the
+        index of the first cell of the input tape inside it. Each item is the id of a symbol (see ``symbols``), a byte or
+        a 32-bit integer for the programs with more than 256 symbols. With the sparse tape (see ``set_sparse_tape``) the
+        buffer only holds the cells around the head.
+
+        The view is released when the ``with`` block ends and, while it's open, the machine can't run, step or be reset,
+        as that would change the cells under it: use ``copy_tape_buffer`` to keep the cells after the machine runs again.
+        """
+        cells = self._machine.cells
+        base = memoryview(cells.data)
+        view = base.toreadonly()
+        self._views += 1
+        try:
+            yield view, cells.origin
+        finally:
+            self._views -= 1
+            view.release()
+            base.release()
+
+    def copy_tape_buffer(self) -> tuple[bytes | array, int]:
+        r"""
+        Returns a copy of the buffer of the tape, like the one viewed by ``tape_view``, along the index of the first cell
+        of the input tape inside it: ``bytes``, or an ``array`` of 32-bit integers for the programs with more than 256
+        symbols. The copy costs a single memory copy of the whole buffer, and it doesn't change when the machine runs
+        again.
+        """
+        cells = self._machine.cells
+        return cells.data[:] if cells.wide else bytes(cells.data), cells.origin
+
+    def _check_views(self) -> None:
+        r"""Raises a ``ValueError`` if a view of the tape returned by ``tape_view`` is still open"""
+        if self._views:
+            raise ValueError("The tape can't change while a 'tape_view' of it is open, close it first")
+
     def set_threshold(self, value: int) -> None:
         r"""
         Sets the threshold ``value`` of steps after which the machine stops running. This is done to avoid letting a machine
@@ -110,33 +291,64 @@ class TuringMachine:
         """
         self.threshold = value if value > 0 else float("inf")
 
-    def run(self) -> None:
+    def run(self, mode: str = "normal", block: int = 8, cache_size: int = 100_000) -> None:
         r"""
         Runs the machine until the machine ends or the threshold value of steps is reached. When this function reaches
         the threshold it pauses the simulation. Calling ``run`` a second time will run the machine again for, at most,
-        the number of steps indicated by the threshold. Running an ended machine has no effect.
+        the number of steps indicated by the threshold. Running an ended or looping machine has no effect.
+
+        With ``mode="macro"`` the tape is simulated in blocks of ``block`` cells, caching up to ``cache_size``
+        macro-transitions between calls (see ``cache_info``): this is faster on very long runs that keep repeating the
+        same patterns, and the results and step counts are the same of the ``"normal"`` mode.
         """
+        self._check_views()
+        if mode not in ("normal", "macro"):
+            raise ValueError(f"Unknown simulation mode '{mode}', it can be either 'normal' or 'macro'")
+        if mode == "macro" and self._machine.profiler is not None:
+            raise ValueError("The macro mode can't be profiled, disable the profiler with 'set_profile(False)'")
+        if mode == "macro" and self._cycles is not None:
+            raise ValueError("The macro mode can't detect the cycles, disable them with 'set_cycle_detection(False)'")
         start_time = time.perf_counter()
-        consecutive_steps = 0
-        while consecutive_steps < self.threshold and not (self.ended or self.paused):
-            self._machine.step()
+        if not (self.ended or self.paused or self.looping):
+            if mode == "macro":
+                if self._macro is None or self._macro.block != block or self._macro.cache_size != cache_size:
+                    self._macro = _MacroMachine(block, cache_size)
+                self._macro.run(self._machine, self.threshold)
+            elif self._cycles is not None:
+                self._cycles.run(self._machine, self.threshold)
+                self.looping = self._cycles.looping
+                self.cycle_length = self._cycles.cycle_length
+            else:
+                self._machine.run(self.threshold)
             self.ended = self._machine.ended
             self.paused = self._machine.paused
-            consecutive_steps += 1
         self.state = self._machine.state
-        self.tape = "".join(self._machine.tape).strip()
+        self._tape = None
         self.steps = self._machine.steps
         self.runtime += round(time.perf_counter() - start_time, 6)
 
+    def cache_info(self) -> dict | None:
+        r"""
+        Returns the statistics of the macro-transition cache used by ``run(mode="macro")``: the ``block`` size, the
+        cache ``hits`` and ``misses``, its ``maxsize`` and ``currsize``. Returns None if the macro mode was never used.
+        """
+        return self._macro.cache_info() if self._macro is not None else None
+
     def reset(self, tape: str = None) -> None:
         r"""
         Resets the machine status to the initial conditions. If ``tape`` argument is provided it will overwrite the old
         initial tape, else it will keep the same as the one declared on the class initialization.
         """
-        self._machine.restart()
+        self._check_views()
+        self._machine.restart(force=True)
         self._machine.tape = list(tape) if tape is not None else list(self.input_tape)
         self.ended = False
         self._machine.paused = False
+        if self._machine.profiler is not None:
+            self._machine.profiler.clear()
+        self._forget_cycle()
+        self.state = self._machine.state
+        self._tape = None
         self.steps = 0
         self.runtime = 0
 
@@ -146,13 +358,11 @@ class TuringMachine:
         the threshold like ``run`` and so it will run until the machine ends or the number of ``times`` is reached.
         Stepping an ended machine has no effect.
         """
+        self._check_views()
         start_time = time.perf_counter()
-        for _ in range(times):
-            self._machine.step()
-            if self._machine.ended:
-                break
+        self._machine.run(times, stop_at_breakpoints=False)
         self.state = self._machine.state
-        self.tape = "".join(self._machine.tape).strip()
+        self._tape = None
         self.steps = self._machine.steps
         self.ended = self._machine.ended
         self.runtime += round(time.perf_counter() - start_time, 6)
@@ -161,13 +371,85 @@ class TuringMachine:
         r"""
         Steps the machine back the amount of times set in the ``times`` argument. Stepping an ended machine will take
         the machine back to the previous paused state you selected. Stepping a machine back before the starting state
-        has no effect. Remember that because the turing machine cannot be step back like a normal forward step and so
-        it has to run again from the start, up to the correct step. For this reason stepping back in long programs might
-        take a while.
+        has no effect. Remember that because the turing machine cannot be step back like a normal forward step, it has
+        to run again from the closest checkpoint before the correct step (see ``set_checkpoints``).
+        """
+        self._check_views()
+        start_time = time.perf_counter()
+        self._machine.paused = False
+        self._machine.rewind(self.steps - times)
+        self._forget_cycle()
+        self.state = self._machine.state
+        self._tape = None
+        self.steps = self._machine.steps
+        self.ended = self._machine.ended
+        self.runtime += round(time.perf_counter() - start_time, 6)
+
+    def set_checkpoints(self, interval: int = 10_000, memory: int = 64 * 2 ** 20) -> None:
+        r"""
+        Sets the ``interval`` of steps between the snapshots of the machine used by ``step_back`` and the maximum
+        ``memory`` in bytes they can take, after which the oldest ones are deleted. A smaller interval makes stepping
+        back faster but takes more memory. You can set ``interval`` to -1 to disable the checkpoints altogether.
+        """
+        self._machine.checkpoints = _Checkpoints(interval, memory) if interval > 0 else None
+
+    def set_journal(self, capacity: int = 100_000) -> None:
+        r"""
+        Enables the journal of the machine, that records the last ``capacity`` steps so that ``step_back`` can undo
+        them directly, without running the machine again from a checkpoint. You can set ``capacity`` to -1 to disable
+        the journal, as it is by default.
+        """
+        self._machine.journal = _Journal(capacity) if capacity > 0 else None
+
+    def set_profile(self, value: bool = True) -> None:
+        r"""
+        Enables or disables, based on ``value``, the profiler of the machine, that counts the steps done by each tuple
+        and on each cell of the tape while the machine runs or steps, until the next ``reset``. The profiled machine
+        runs slower, as the sweeps are not grouped while each step is counted.
+        """
+        if value and self._machine.profiler is None:
+            _Profiler().attach(self._machine)
+        elif not value:
+            _Profiler.detach(self._machine)
+
+    def profile(self) -> ProfileReport | None:
+        r"""
+        Returns a ``ProfileReport`` with the steps done by each line, tuple and state of the program and by the head on
+        each cell of the tape since the profiler was enabled, or None if it isn't enabled (see ``set_profile``)
+        """
+        return self._machine.profiler.report(self._machine) if self._machine.profiler is not None else None
+
+    def set_sparse_tape(self, value: bool = True) -> None:
+        r"""
+        Enables or disables, based on ``value``, the sparse tape of the machine, for programs that touch cells far apart
+        from each other: only a window of cells around the head is kept in a buffer and the rest of the tape is stored in
+        chunks of 4096 cells, only for the chunks that are not blank, so the memory grows with the cells that were
+        written and not with the distance the head travelled. The machine runs the same way, a bit slower when the head
+        keeps going back and forth across the edge of the window, and the cells on the tape are kept.
+        """
+        self._check_views()
+        self._machine.set_sparse_tape(value)
+
+    def set_cycle_detection(self, value: bool = True) -> None:
+        r"""
+        Enables or disables, based on ``value``, the detection of the loops in ``run``. The machine is checked only
+        every few thousand steps, so the cost is small, and when it's found to repeat the same configuration, or the same
+        configuration shifted along the tape (like a machine that keeps writing on the right of the tape), ``run`` stops
+        early instead of going on until the threshold: ``looping`` is set and ``cycle_length`` tells after how many steps
+        the loop repeats.
+        """
+        self._cycles = _CycleDetector() if value else None
+        self._forget_cycle()
+
+    def _forget_cycle(self) -> None:
+        r"""
+        Forgets the found loop and the configurations saved by the cycle detection, that don't hold anymore after the
+        machine is reset or stepped back
         """
-        step_goal = self.steps - times if self.steps - times > 0 else 0
-        self.reset()
-        self.step(step_goal)
+        self.looping = False
+        self.cycle_length = None
+        if self._cycles is not None:
+            self._cycles.reset()
 
     def set_breakpoints(self, value: bool = True) -> None:
         r"""
@@ -182,6 +464,9 @@ class TuringMachine:
         formatted_runtime = (f"{self.runtime * 1000:.0f} ms" if self.runtime < 5 else f"{self.runtime:.3f} s") if \
                             self.runtime > 0.05 else f"{self.runtime * 1000:.3f} ms"
         print(f"Steps: {self.steps}    State: {self.state}    Tape: {self.tape.strip().upper()}    "
-              f"Status: {'Ended' if self.ended else 'Paused'}    Time elapsed: {formatted_runtime}")
+              f"Status: {'Ended' if self.ended else 'Looping' if self.looping else 'Paused'}    Time elapsed: {formatted_runtime}")
 
-__all__ = ["parse_tuples", "parse_breakpoints", "TuringMachine"]
+__all__ = ["parse_tuples", "parse_breakpoints", "compile_program", "Program", "analyze_program", "ProgramReport",
+           "ProfileReport", "TuringMachine", "run_batch", "BatchResult", "run_lockstep", "bench_suite", "run_bench",
+           "save_bench", "load_bench", "compare_bench", "BenchCase", "BenchResult", "Regression", "set_cache",
+           "clear_cache"]
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import NamedTuple
+try:
+    from .tuples import TuringTuple
+    from .engine import _remapped_char
+except ImportError:
+    from tuples import TuringTuple
+    from engine import _remapped_char
+
+class ProgramReport(NamedTuple):
+    r"""
+    The result of the static analysis of a program. The fields are:
+     - ``conflicts``: the non-deterministic rules, as ``(state, symbol, lines)`` with the numbers of the lines (from 1)
+       of all the tuples that read ``symbol`` in ``state``
+     - ``states``: all the states, in order of appearance
+     - ``unreachable_states``: the states with rules that can't be reached from the state ``0``
+     - ``halting_states``: the states without any rule, where the machine always halts
+     - ``alphabet``: all the symbols read or written by the tuples, where ``" "`` is the blank symbol
+    """
+    conflicts: tuple[tuple[str, str, tuple[int, ...]], ...]
+    states: tuple[str, ...]
+    unreachable_states: tuple[str, ...]
+    halting_states: tuple[str, ...]
+    alphabet: tuple[str, ...]
+
+    def summary(self) -> str:
+        r"""Returns a printable version of the report"""
+        lines = [f"States: {len(self.states)}    Symbols: {len(self.alphabet)}",
+                 "Alphabet: " + " ".join({" ": "-", "-": "\\-"}.get(x, x) for x in self.alphabet),
+                 "Halting states: " + (", ".join(self.halting_states) or "none"),
+                 "Unreachable states: " + (", ".join(self.unreachable_states) or "none")]
+        if self.conflicts:
+            lines.append(f"Non-deterministic rules: {len(self.conflicts)}")
+            lines.extend(f" - state {state}, symbol '{symbol}' at lines {', '.join(map(str, numbers))}"
+                         for state, symbol, numbers in self.conflicts)
+        else:
+            lines.append("The program is deterministic")
+        return "\n".join(lines)
+
+def _find_conflicts(parsed_code: list[TuringTuple]) -> list[list[int]]:
+    r"""
+    Groups the tuples by ``current_state`` and ``current_symbol`` in a single pass and returns, for each group with
+    tuples that lead to different results, the indexes of all its tuples
+    """
+    groups = {}
+    conflicting = {}
+    for i, element in enumerate(parsed_code):
+        key = (element.current_state, element.current_symbol)
+        result = (element.new_state, element.new_symbol, element.movement)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = (result, [i])
+        else:
+            group[1].append(i)
+            if group[0] != result:
+                conflicting[key] = None
+    return [groups[key][1] for key in groups if key in conflicting]
+
+def analyze(parsed_code: list[TuringTuple], code_map: list[int] = None) -> ProgramReport:
+    r"""
+    Analyses the tuples in ``parsed_code`` without running them and returns a ``ProgramReport``.
+
+    ``code_map`` maps the tuples back to the lines of the program (when missing, the ``index`` of each tuple is used).
+    It takes linear time: the tuples are grouped with dictionaries and the reachable states are found with a visit of
+    the graph of the states.
+    """
+    code_map = code_map if code_map is not None else [x.index for x in parsed_code]
+    states = {"0": None}
+    symbols = {" ": None}
+    edges = {}
+    for element in parsed_code:
+        states[element.current_state] = None
+        states[element.new_state] = None
+        symbols[_remapped_char(element.current_symbol)] = None
+        symbols[_remapped_char(element.new_symbol)] = None
+        edges.setdefault(element.current_state, set()).add(element.new_state)
+    conflicts = []
+    for indexes in _find_conflicts(parsed_code):
+        element = parsed_code[indexes[0]]
+        lines = tuple(dict.fromkeys(code_map[i] + 1 for i in indexes))
+        conflicts.append((element.current_state, _remapped_char(element.current_symbol), lines))
+    reached = {"0"}
+    queue = deque(["0"])
+    while queue:
+        for state in edges.get(queue.popleft(), ()):
+            if state not in reached:
+                reached.add(state)
+                queue.append(state)
+    return ProgramReport(tuple(conflicts), tuple(states), tuple(x for x in states if x in edges and x not in reached),
+                         tuple(x for x in states if x not in edges), tuple(symbols))
@@ -0,0 +1,117 @@
+import os
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator, NamedTuple
+try:
+    from .tuples import TuringTuple
+    from .machine import TuringMachine
+    from .program import Program
+    from .cycles import CycleDetector
+except ImportError:
+    from tuples import TuringTuple
+    from machine import TuringMachine
+    from program import Program
+    from cycles import CycleDetector
+
+_worker_machine = None
+
+class BatchResult(NamedTuple):
+    r"""
+    The outcome of the run of one of the tapes passed to ``run_batch()``: ``cycle_length`` is the length of the loop
+    found when ``status`` is ``"looping"``, else None
+    """
+    index: int
+    tape: str
+    state: str
+    steps: int
+    status: str
+    runtime: float
+    cycle_length: int | None = None
+
+def _new_machine(parsed_tuples: list[TuringTuple] | Program) -> TuringMachine:
+    r"""Returns a silent machine for ``parsed_tuples``, without checkpoints since batch runs never step back"""
+    global_var = {"speed": 10, "tape_size": 30, "code_size": 30, "slim_tape": False, "pars_errors": [],
+                  "instant": True, "breakpoints": False, "debug": False, "keyboard": False}
+    if isinstance(parsed_tuples, Program):
+        machine = TuringMachine.from_program(parsed_tuples, " ", global_var)
+    else:
+        machine = TuringMachine(" ", parsed_tuples, [False], [False] * len(parsed_tuples), [""], [0], [], global_var)
+    machine.silent = True
+    machine.checkpoints = None
+    return machine
+
+def _init_worker(parsed_tuples: list[TuringTuple] | Program) -> None:
+    r"""Compiles the program once in each worker process of the pool"""
+    global _worker_machine
+    _worker_machine = _new_machine(parsed_tuples)
+
+def _run_tape(machine: TuringMachine, index: int, tape: str, threshold: int | float,
+              detect_cycles: bool = False) -> BatchResult:
+    r"""
+    Runs ``machine`` from the start on ``tape`` for at most ``threshold`` steps, stopping early on a loop if
+    ``detect_cycles``
+    """
+    start_time = time.perf_counter()
+    machine.input_tape = tape.upper() if tape else " "
+    machine.restart(force=True)
+    machine.paused = False
+    detector = CycleDetector() if detect_cycles else None
+    if detector is not None:
+        detector.run(machine, threshold)
+    else:
+        machine.run(threshold)
+    status = "halted" if machine.ended else "looping" if detector is not None and detector.looping else "timeout"
+    return BatchResult(index, "".join(machine.tape).strip(), machine.state, machine.steps, status,
+                       round(time.perf_counter() - start_time, 6), detector.cycle_length if detector is not None else None)
+
+def _run_chunk(args: tuple[list[tuple[int, str]], int | float, bool]) -> list[BatchResult]:
+    r"""Runs a chunk of ``(index, tape)`` pairs on the machine of the worker"""
+    chunk, threshold, detect_cycles = args
+    return [_run_tape(_worker_machine, index, tape, threshold, detect_cycles) for index, tape in chunk]
+
+def _run_batch(parsed_tuples: list[TuringTuple] | Program, tapes: list[tuple[int, str]], workers: int,
+               threshold: int | float, ordered: bool, chunk_size: int | None,
+               detect_cycles: bool) -> Iterator[BatchResult]:
+    r"""Yields the results of ``run_batch()``, with arguments that were already checked"""
+    if workers == 1 or len(tapes) <= 1:
+        machine = _new_machine(parsed_tuples)
+        for index, tape in tapes:
+            yield _run_tape(machine, index, tape, threshold, detect_cycles)
+        return None
+    chunk_size = chunk_size if chunk_size is not None else max(1, len(tapes) // (workers * 4))
+    chunks = [(tapes[i:i + chunk_size], threshold, detect_cycles) for i in range(0, len(tapes), chunk_size)]
+    with Pool(min(workers, len(chunks)), initializer=_init_worker, initargs=(parsed_tuples,)) as pool:
+        for results in (pool.imap if ordered else pool.imap_unordered)(_run_chunk, chunks):
+            yield from results
+
+def run_batch(parsed_tuples: list[TuringTuple] | Program, tapes: Iterable[str], workers: int | None = None,
+              threshold: int = 1_000_000, ordered: bool = True, chunk_size: int | None = None,
+              detect_cycles: bool = False) -> Iterator[BatchResult]:
+    r"""
+    Runs the program of ``parsed_tuples`` (or a ``Program``) on each of the ``tapes``, yielding a ``BatchResult`` for
+    each of them.
+
+    The tapes are split in chunks of ``chunk_size`` tapes (by default about four chunks for each worker) and run on a
+    pool of ``workers`` processes (by default one for each CPU). The program is sent and compiled only once for each
+    worker, when the pool starts. With ``workers=1`` the tapes are run in this process, without a pool.
+
+    Each run stops when the machine halts (``status`` is ``"halted"``) or after ``threshold`` steps (``status`` is
+    ``"timeout"``), and -1 disables the threshold. With ``detect_cycles`` the machines that are found to be stuck in a
+    loop, repeating the same configuration or the same configuration shifted along the tape, stop early with the
+    ``"looping"`` status (see ``cycles.CycleDetector``): this costs little and saves the whole threshold for each of
+    them. The results are yielded in the same order of ``tapes`` or, if ``ordered`` is False, as soon as each chunk is
+    completed: ``index`` is the position of the tape in ``tapes``.
+
+    The arguments are checked when the function is called, raising a ``ValueError``, while the tapes only run when the
+    results are read.
+    """
+    if not isinstance(parsed_tuples, Program) and any(x.raw_string for x in parsed_tuples):
+        raise ValueError("You can only pass a list of parsed tuples")
+    threshold = threshold if threshold > 0 else float("inf")
+    tapes = list(enumerate(tapes))
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("The number of workers needs to be positive")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("The size of the chunks needs to be positive")
+    return _run_batch(parsed_tuples, tapes, workers, threshold, ordered, chunk_size, detect_cycles)
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import platform
+import tracemalloc
+import multiprocessing
+from typing import NamedTuple
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+try:
+    from .program import compile_program
+    from .batch import _new_machine, _run_tape
+except ImportError:
+    from program import compile_program
+    from batch import _new_machine, _run_tape
+
+_examples_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "examples")
+_lower_is_better = {"parse_time": True, "steps_per_second": False, "peak_memory": True, "wall_time": True}
+
+class BenchCase(NamedTuple):
+    r"""
+    A case of the benchmark suite: the program in ``source`` (the name of a file in the examples folder when ``example``
+    is True, else the text of the program) is run on ``tape`` for at most ``max_steps`` steps
+    """
+    name: str
+    source: str
+    tape: str
+    max_steps: int
+    example: bool = False
+
+class BenchResult(NamedTuple):
+    r"""
+    The measures of a case of the benchmark suite. The fields are:
+     - ``name``: the name of the case
+     - ``parse_time``: the seconds taken to parse and compile the program, without the cache
+     - ``steps``: the steps done by the machine
+     - ``steps_per_second``: the steps done in a second of run
+     - ``peak_memory``: the peak of the memory allocated by the parsing and the run, in bytes
+     - ``wall_time``: the seconds taken by the whole case, from the parsing to the end of the run
+    The times are the best of all the repeats, to keep out the noise of the other processes.
+    """
+    name: str
+    parse_time: float
+    steps: int
+    steps_per_second: float
+    peak_memory: int
+    wall_time: float
+
+class Regression(NamedTuple):
+    r"""
+    A measure of a case that got worse between two runs of the suite: ``change`` is how much worse, as a fraction of
+    the ``old`` value (0.25 means 25% slower, or more memory)
+    """
+    name: str
+    metric: str
+    old: float
+    new: float
+    change: float
+
+def _notation_program(groups: int = 200) -> str:
+    r"""Returns a generated program of ``2 * groups`` lines that use all the notations, expanded in many tuples"""
+    lines = ["(0, -, s0_a, -, -)"]
+    for i in range(groups):
+        lines.append(f"(s{i}_[a..e], {{0..9}}, s{i + 1}_[a..e], {{0..9}}, >)")
+        lines.append(f"(s{i}_[a..e], ^0..9, s{i}_[a..e], -, <)  # skips the other symbols")
+    return "\n".join(lines)
+
+def bench_suite() -> list[BenchCase]:
+    r"""
+    Returns the cases of the benchmark suite: the examples with large inputs, three busy beavers (the five states one
+    stopped after three million steps), two programs that grow the tape at each step and a program with many notations
+    """
+    return [BenchCase("bin-dec", "bin-dec.txt", "1" * 14, 10_000_000, True),
+            BenchCase("int-division", "int-division.txt", "987654/43", 10_000_000, True),
+            BenchCase("reverse", "reverse.txt", "AB" * 1000, 10_000_000, True),
+            BenchCase("palindrome", "palindrome.txt", "ABBA" * 500, 10_000_000, True),
+            BenchCase("even-odd", "even-odd.txt", "1234567890" * 10_000, 10_000_000, True),
+            BenchCase("dots", "dots.txt", "." * 100_000, 10_000_000, True),
+            BenchCase("benchmark", "benchmark.txt", ".", 3_000_000, True),
+            BenchCase("busy-beaver-3", "(0, -, B, 1, >)\n(0, 1, H, 1, >)\n(B, -, C, -, >)\n(B, 1, B, 1, >)\n"
+                                       "(C, -, C, 1, <)\n(C, 1, 0, 1, <)", "", 1_000),
+            BenchCase("busy-beaver-4", "(0, -, B, 1, >)\n(0, 1, B, 1, <)\n(B, -, 0, 1, <)\n(B, 1, C, -, <)\n"
+                                       "(C, -, H, 1, >)\n(C, 1, D, 1, <)\n(D, -, D, 1, >)\n(D, 1, 0, -, >)", "", 1_000),
+            BenchCase("busy-beaver-5", "(0, -, B, 1, >)\n(0, 1, C, 1, <)\n(B, -, C, 1, >)\n(B, 1, B, 1, >)\n"
+                                       "(C, -, D, 1, >)\n(C, 1, E, -, <)\n(D, -, 0, 1, <)\n(D, 1, D, 1, <)\n"
+                                       "(E, -, H, 1, >)\n(E, 1, 0, -, <)", "", 3_000_000),
+            BenchCase("tape-growth-right", "(0, -, 1, 1, >)\n(1, -, 0, 1, >)", "", 2_000_000),
+            BenchCase("tape-growth-left", "(0, -, 1, 1, <)\n(1, -, 0, 1, <)", "", 2_000_000),
+            BenchCase("parse-notations", _notation_program(), "", 1_000)]
+
+def _measure(case: BenchCase, source: str, is_file: bool) -> tuple[float, int, float, float]:
+    r"""Parses and runs ``case`` once, returning the parsing time, the steps, the running time and the total time"""
+    start_time = time.perf_counter()
+    program = compile_program(source, is_file, keep_lines=False)
+    parse_time = time.perf_counter() - start_time
+    if program.errors:
+        raise ValueError(f"The program of the benchmark case '{case.name}' has some errors: {program.errors}")
+    result = _run_tape(_new_machine(program), 0, case.tape, case.max_steps)
+    return parse_time, result.steps, result.runtime, time.perf_counter() - start_time
+
+def _peak_memory(case: BenchCase, source: str, is_file: bool) -> int:
+    r"""
+    Parses and runs ``case`` once, returning the growth of the peak memory of the process in bytes. Where ``resource``
+    is available it's called in a new process, forked by the ``forkserver`` of ``multiprocessing`` so that its peak
+    doesn't start from the one of the other cases, else the memory is traced with ``tracemalloc`` (that slows down
+    the machine a lot)
+    """
+    if resource is None:
+        tracemalloc.start()
+        try:
+            _measure(case, source, is_file)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    _measure(case, source, is_file)
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) * (1 if sys.platform == "darwin" else 1024)
+
+def run_bench(cases: list[BenchCase] = None, repeats: int = 3, warmup: int = 1, examples: str = None,
+              report=None) -> list[BenchResult]:
+    r"""
+    Runs each of the ``cases`` (by default the whole ``bench_suite()``) ``warmup`` times without measuring it and then
+    ``repeats`` times, returning a ``BenchResult`` for each case. The peak memory is measured in one more run, in a new
+    process (see ``_peak_memory()``). ``report``, if given, is called with each result as soon as it's ready.
+
+    The examples are looked for in ``examples`` (by default the examples folder next to the module, only present in a
+    copy of the repository): the cases of the examples that are not found are skipped.
+    """
+    if repeats < 1 or warmup < 0:
+        raise ValueError("The number of repeats needs to be positive and the number of warmup runs can't be negative")
+    examples = examples if examples is not None else _examples_directory
+    results = []
+    for case in cases if cases is not None else bench_suite():
+        source = os.path.join(examples, case.source) if case.example else case.source
+        if case.example and not os.path.isfile(source):
+            continue
+        for _ in range(warmup):
+            _measure(case, source, case.example)
+        measures = [_measure(case, source, case.example) for _ in range(repeats)]
+        if resource is not None:
+            with multiprocessing.get_context("forkserver").Pool(1) as pool:
+                peak_memory = pool.apply(_peak_memory, (case, source, case.example))
+        else:
+            peak_memory = _peak_memory(case, source, case.example)
+        run_time = min(x[2] for x in measures)
+        result = BenchResult(case.name, round(min(x[0] for x in measures), 6), measures[0][1],
+                             round(measures[0][1] / run_time if run_time else 0.0, 1), peak_memory,
+                             round(min(x[3] for x in measures), 6))
+        results.append(result)
+        if report is not None:
+            report(result)
+    return results
+
+def save_bench(results: list[BenchResult], path: str) -> None:
+    r"""Writes ``results`` to the JSON file at ``path``, along the versions of Python and of the system"""
+    with open(path, "w") as file:
+        json.dump({"python": platform.python_version(), "implementation": platform.python_implementation(),
+                   "platform": platform.platform(), "results": [x._asdict() for x in results]}, file, indent=1)
+
+def load_bench(path: str) -> list[BenchResult]:
+    r"""Reads the results written by ``save_bench()`` in the JSON file at ``path``"""
+    with open(path) as file:
+        return [BenchResult(**x) for x in json.load(file)["results"]]
+
+def compare_bench(old: list[BenchResult], new: list[BenchResult], threshold: float = 0.1,
+                  min_time: float = 0.001) -> list[Regression]:
+    r"""
+    Compares the ``new`` results with the ``old`` ones of the same cases, returning a ``Regression`` for each measure
+    that got worse by more than ``threshold`` (as a fraction of the old value). The times below ``min_time`` seconds in
+    both results are ignored, as they are mostly noise.
+    """
+    old_results = {x.name: x for x in old}
+    regressions = []
+    for result in new:
+        if result.name not in old_results:
+            continue
+        for metric, lower_is_better in _lower_is_better.items():
+            old_value, new_value = getattr(old_results[result.name], metric), getattr(result, metric)
+            if metric.endswith("_time") and max(old_value, new_value) < min_time or not old_value or not new_value:
+                continue
+            change = new_value / old_value - 1 if lower_is_better else old_value / new_value - 1
+            if change > threshold:
+                regressions.append(Regression(result.name, metric, old_value, new_value, round(change, 4)))
+    return regressions
+
+def format_result(result: BenchResult) -> str:
+    r"""Returns a printable line with ``result``"""
+    return (f"{result.name:<20} parse {result.parse_time * 1000:>9.2f} ms   {result.steps:>10} steps   "
+            f"{result.steps_per_second:>12.0f} steps/s   peak {result.peak_memory / 2 ** 20:>8.2f} MiB   "
+            f"total {result.wall_time * 1000:>9.2f} ms")
+
+def format_regression(regression: Regression) -> str:
+    r"""Returns a printable line with ``regression``"""
+    return (f"{regression.name:<20} {regression.metric:<17} {regression.old:>14} -> {regression.new:<14} "
+            f"({regression.change:+.1%})")
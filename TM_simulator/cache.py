@@ -0,0 +1,127 @@
+import os
+import hashlib
+import marshal
+import zlib
+try:
+    from .tuples import TuringTuple
+except ImportError:
+    from tuples import TuringTuple
+
+_tuple_fields = ("string_tuple", "index", "current_state", "current_symbol", "new_state", "new_symbol", "movement")
+_parser_version = 5  # needs to be increased each time the parsing changes the output for the same input
+
+def _default_directory() -> str:
+    r"""Returns the directory of the cache, inside the user cache directory"""
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")), "tm-simulator")
+
+def _restore_tuple(values: tuple) -> TuringTuple:
+    r"""Returns the parsed ``TuringTuple`` stored in ``values``, without splitting its string again"""
+    element = TuringTuple.__new__(TuringTuple)
+    element.__dict__ = dict(zip(_tuple_fields, values), raw_string=False, pars_errors=[])
+    return element
+
+class ParseCache:
+
+    def __init__(self, directory: str | None = None, max_size: int = 64 * 2 ** 20) -> None:
+        r"""
+        Creates a new instance of ``ParseCache``, that keeps the output of ``program.parse()`` in ``directory`` (by
+        default ``tm-simulator`` inside the user cache directory) so that the same program doesn't need to be parsed
+        again.
+
+        Each program is stored in its own file, named after the hash of its lines and of ``_parser_version``, as a
+        compressed ``marshal`` dump of the expanded tuples, the breakpoints, ``code_map`` and the errors (determinism
+        included), so a program loaded from the cache reports the same errors of a parsed one. When the files take more
+        than ``max_size`` bytes, the least recently used ones are deleted. Any error reading or writing the cache is
+        treated as a miss, but only the files that can't be decoded are deleted.
+        """
+
+        self.directory = directory if directory is not None else _default_directory()
+        self.max_size = max_size
+
+    def _path(self, raw_tuples: list[str]) -> str:
+        r"""Returns the path of the cache file of the program made of ``raw_tuples``"""
+        digest = hashlib.sha256(f"{_parser_version}:{marshal.version}\n".encode())
+        digest.update("\n".join(raw_tuples).encode("utf-8", "surrogatepass"))
+        return os.path.join(self.directory, digest.hexdigest() + ".bin")
+
+    def load(self, raw_tuples: list[str]) -> tuple | None:
+        r"""
+        Returns the output of ``program.parse()`` for the program made of ``raw_tuples``, or None if it's not in the
+        cache
+        """
+        path = self._path(raw_tuples)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            code, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors = marshal.loads(zlib.decompress(data))
+            code_tuples = [_restore_tuple(x) for x in code]
+            if any(len(x) != len(_tuple_fields) for x in code) or len(code_map) != len(code_tuples):
+                raise ValueError("The cached program doesn't match its tuples")
+        except (ValueError, EOFError, TypeError, zlib.error):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors
+
+    def store(self, raw_tuples: list[str], parsed: tuple) -> None:
+        r"""Stores ``parsed``, the output of ``program.parse()`` of ``raw_tuples``, and evicts the oldest files if needed"""
+        code_tuples, breakpoint_list, remapped_breakpoint_list, _, code_map, pars_errors = parsed
+        code = [tuple(getattr(x, field) for field in _tuple_fields) for x in code_tuples]
+        data = zlib.compress(marshal.dumps((code, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors)))
+        if len(data) > self.max_size:
+            return None
+        path = self._path(raw_tuples)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + f".{os.getpid()}.tmp", "wb") as file:
+                file.write(data)
+            os.replace(path + f".{os.getpid()}.tmp", path)
+        except OSError:
+            return None
+        self._evict()
+
+    def clear(self) -> None:
+        r"""Deletes all the files of the cache"""
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        r"""Returns the path, the last access time and the size of each file of the cache"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith(".bin"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        r"""Deletes the least recently used files until the cache takes at most ``max_size`` bytes"""
+        entries = sorted(self._entries(), key=lambda x: x[1])
+        size = sum(x[2] for x in entries)
+        for path, _, file_size in entries:
+            if size <= self.max_size:
+                break
+            self._remove(path)
+            size -= file_size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        r"""Deletes the file at ``path``, if it exists"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
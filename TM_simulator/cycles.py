@@ -0,0 +1,187 @@
+import copy
+try:
+    from .profiler import Profiler
+except ImportError:
+    from profiler import Profiler
+
+def _configuration(machine) -> tuple:
+    r"""
+    Returns the configuration of ``machine`` as ``(state_id, head, start, content)``: ``content`` holds the bytes of the
+    cells from the first to the last one that is not blank, ``start`` is the position of the first of them and ``head``
+    is the position of the head, both counted from the first cell of the input tape
+    """
+    tape = machine.cells
+    start, cells = tape.used()
+    if not cells:
+        return machine.state_id, machine.tape_position - tape.origin, 0, b""
+    return machine.state_id, machine.tape_position - tape.origin, start, cells.tobytes() if tape.wide else bytes(cells)
+
+def _window(configuration: tuple, first: int, last: int, size: int) -> bytes:
+    r"""Returns the bytes of the cells from ``first`` to ``last`` (included) of ``configuration``"""
+    _, _, start, content = configuration
+    low, high = first - start, last - start + 1
+    middle = content[max(low, 0) * size:max(min(high, len(content) // size), 0) * size] if high > 0 else b""
+    left = min(max(-low, 0), high - low)
+    return b"\0" * size * left + middle + b"\0" * (size * (high - low - left) - len(middle))
+
+def _beyond(configuration: tuple, position: int, shift: int, size: int) -> bytes:
+    r"""
+    Returns the bytes of the cells of ``configuration`` from ``position`` to the last cell that is not blank in the
+    direction of ``shift`` (to the right if it's positive, else to the left)
+    """
+    _, _, start, content = configuration
+    end = start + len(content) // size
+    if not content or (position >= end if shift > 0 else position < start):
+        return b""
+    return _window(configuration, position, end - 1, size) if shift > 0 else _window(configuration, start, position, size)
+
+def _is_shifted(before: tuple, after: tuple, low: int, high: int, shift: int, size: int) -> bool:
+    r"""
+    Tells if the configuration ``after`` is ``before`` shifted by ``shift`` cells, after a run that executed tuples only
+    from the cell ``low`` to ``high``. The cells behind the run (on the left of ``low`` when the machine moves to the
+    right) are never read again, so they are not compared: all the others need to be the same, shifted, and then the
+    run repeats forever, shifted again each time
+    """
+    if not shift:
+        return before == after
+    edge = low if shift > 0 else high
+    return before[0] == after[0] and after[1] == before[1] + shift and \
+        _beyond(before, edge, shift, size) == _beyond(after, edge + shift, shift, size)
+
+def _repeats_after(machine, steps: int, shift: int) -> bool:
+    r"""
+    Tells if a copy of ``machine`` is back in the same configuration after ``steps`` steps, shifted by ``shift`` cells
+    """
+    clone = copy.copy(machine)
+    clone.cells = machine.cells.copy()
+    clone.journal = None
+    clone.checkpoints = None
+    Profiler.detach(clone)
+    bounds = [0, 0]
+    done = clone.run(steps, stop_at_breakpoints=False, bounds=bounds if shift else None)
+    return done == steps and not clone.ended and \
+        _is_shifted(_configuration(machine), _configuration(clone), *bounds, shift, 4 if machine.cells.wide else 1)
+
+class CycleDetector:
+
+    def __init__(self, interval: int = 4096) -> None:
+        r"""
+        Creates a new instance of ``CycleDetector``, that runs a machine until it halts or until it's proven to be in an
+        endless loop, setting ``looping``.
+
+        The machine runs with ``TuringMachine.run()`` and its configuration (the state, the position of the head and the
+        used part of the tape) is only sampled every ``interval`` steps, or eight times the size of the tape if larger,
+        so the cost of reading it stays bounded. The samples are taken on the steps of the machine, whatever the size of
+        the chunks passed to ``run()``, and they are compared with Brent's algorithm: a sample is saved each time the
+        number of samples reaches a power of two, and every sample is compared with the saved one, so a loop is found
+        after a number of steps proportional to its length.
+
+        A sample that is the same of the saved one is an exact cycle. A sample in the same state of the saved one, with
+        the head moved and the same cells past the head, can be a translated cycle, where the machine keeps doing the
+        same thing shifted along the tape (like a machine that writes forever on the right of the tape): it's checked by
+        running the same number of steps again keeping track of the cells where the machine runs (the ``bounds`` of
+        ``TuringMachine.run()``, see ``_is_shifted()``), at most once for each saved sample. The steps of the check are
+        steps of the run, not done again.
+
+        After a loop is found, ``cycle_length`` is the shortest number of steps after which the configuration repeats
+        and ``cycle_shift`` is the number of cells it's shifted by (0 for an exact cycle).
+        """
+
+        self.interval = interval
+        self.reset()
+
+    def reset(self) -> None:
+        r"""Forgets the saved sample and the found loop, to run a restarted machine"""
+        self.looping = False
+        self.cycle_length = None
+        self.cycle_shift = None
+        self.saved = None
+        self.power = 1
+        self.samples = 0
+        self.checked = False
+        self.check = None
+        self.next_sample = 0
+
+    def run(self, machine, max_steps: int | float = float("inf"), stop_at_breakpoints: bool = True) -> int:
+        r"""
+        Runs ``machine`` (a ``machine.TuringMachine``) like ``TuringMachine.run()``, also stopping when it's found to
+        be looping. Returns the number of steps performed.
+        """
+        steps = 0
+        while steps != max_steps and not (machine.ended or self.looping):
+            if self.check is not None:
+                chunk = min(self.check[1], max_steps - steps)
+                done = self._continue_check(machine, chunk, stop_at_breakpoints)
+            else:
+                if machine.steps >= self.next_sample:
+                    self._sample(machine)
+                    continue
+                chunk = min(self.next_sample - machine.steps, max_steps - steps)
+                done = machine.run(chunk, stop_at_breakpoints)
+            steps += done
+            if done != chunk:
+                break
+        return steps
+
+    def _sample(self, machine) -> None:
+        r"""Compares the configuration of ``machine`` with the saved one, starting the check of a translated cycle"""
+        configuration = _configuration(machine)
+        size = 4 if machine.cells.wide else 1
+        self.next_sample = machine.steps + max(self.interval, 8 * len(machine.cells))
+        if self.saved is not None:
+            saved_steps, saved = self.saved
+            length, shift = machine.steps - saved_steps, configuration[1] - saved[1]
+            if configuration == saved:
+                self._found(machine, length, 0)
+                return None
+            if not self.checked and shift and configuration[0] == saved[0] and \
+               _beyond(saved, saved[1], shift, size) == _beyond(configuration, configuration[1], shift, size):
+                self.checked = True
+                self.check = [configuration, length, length, shift, configuration[1], configuration[1]]
+                return None
+        self.samples += 1
+        if self.saved is None or self.samples == self.power:
+            self.saved = (machine.steps, configuration)
+            self.power *= 2
+            self.samples = 0
+            self.checked = False
+
+    def _continue_check(self, machine, max_steps: int, stop_at_breakpoints: bool) -> int:
+        r"""
+        Runs ``machine`` for at most ``max_steps`` steps of the check of a translated cycle and, when all its steps are
+        done, checks if the machine ended up in the configuration of the start, shifted. Returns the number of steps
+        performed.
+        """
+        configuration, remaining, length, shift, low, high = self.check
+        bounds = []
+        done = machine.run(max_steps, stop_at_breakpoints, bounds)
+        run_low, run_high = bounds
+        self.check[1:] = remaining - done, length, shift, min(low, run_low), max(high, run_high)
+        if machine.ended:
+            self.check = None
+        elif self.check[1] == 0:
+            self.check = None
+            self.next_sample = machine.steps + max(self.interval, 8 * len(machine.cells))
+            if _is_shifted(configuration, _configuration(machine), min(low, run_low), max(high, run_high), shift,
+                           4 if machine.cells.wide else 1):
+                self._found(machine, length, shift)
+        return done
+
+    def _found(self, machine, length: int, shift: int) -> None:
+        r"""
+        Records the loop of ``machine``, that repeats after ``length`` steps shifted by ``shift`` cells, reducing it to
+        the shortest one: each prime factor of ``length`` is removed while the machine still repeats after the shorter
+        length, shifted by the same fraction of ``shift``
+        """
+        factor, rest = 2, length
+        while factor * factor <= rest:
+            while rest % factor == 0:
+                rest //= factor
+                if shift % factor == 0 and _repeats_after(machine, length // factor, shift // factor):
+                    length, shift = length // factor, shift // factor
+            factor += 1
+        if rest > 1 and shift % rest == 0 and _repeats_after(machine, length // rest, shift // rest):
+            length, shift = length // rest, shift // rest
+        self.looping = True
+        self.cycle_length = length
+        self.cycle_shift = shift
@@ -0,0 +1,171 @@
+try:
+    from .tuples import TuringTuple
+except ImportError:
+    from tuples import TuringTuple
+
+_special_chars = {'-': ' ', '\\\\': '\\', '\\-': '-', '\\(': '(', '\\)': ')', '\\^': '^', '\\,': ',', '\\#': '#',
+                  '\\[': '[', '\\]': ']', '\\{': '{', '\\}': '}'}
+_movements = {"<": -1, "-": 0, ">": 1}
+_identity_table = bytes(range(256))
+
+def _remapped_char(char: str) -> str:
+    r"""Returns the escaped version of ``char`` if ``char`` is a special char"""
+    return _special_chars.get(char, char)
+
+class CompiledCode:
+
+    def __init__(self, code: list[TuringTuple], breakpoints: list[bool] = None, extra_symbols: tuple[str, ...] = ()) -> None:
+        r"""
+        Creates a new instance of ``CompiledCode`` based on the parsed tuples in ``code``.
+
+        States and symbols are interned to small integers (the state ``0`` and the blank symbol always have id 0) and
+        every escape is resolved once, here. The transitions are stored in flat lists indexed by
+        ``state_id * n_symbols + symbol_id``: ``rules`` holds the index of the tuple in ``code`` (-1 when the machine
+        halts), ``new_states``, ``new_symbols`` and ``movements`` hold the interned values of the tuple.
+        ``extra_symbols`` are symbols that are not used by any tuple but still need an id (e.g. from the input tape).
+
+        If two tuples share the same ``current_state`` and ``current_symbol``, the last one wins.
+
+        The self-looping transitions (same state, moving left or right) are also grouped in ``sweeps``, using the
+        ``breakpoints`` of the tuples to know where a sweep needs to stop, see ``_compile_sweeps()``.
+        """
+
+        self.code = code
+        self.breakpoints = breakpoints if breakpoints is not None else [False] * len(code)
+        self.extra_symbols = extra_symbols
+        self.states = ["0"]
+        self.state_ids = {"0": 0}
+        self.symbols = [" "]
+        self.symbol_ids = {" ": 0}
+        for _, current_state, current_symbol, new_state, new_symbol, _ in self._transitions(code):
+            self._intern_state(current_state)
+            self._intern_state(new_state)
+            self._intern_symbol(current_symbol)
+            self._intern_symbol(new_symbol)
+        for symbol in extra_symbols:
+            self._intern_symbol(symbol)
+        self.n_symbols = len(self.symbols)
+        size = len(self.states) * self.n_symbols
+        self.rules = [-1] * size
+        self.new_states = [0] * size
+        self.new_symbols = [0] * size
+        self.movements = [0] * size
+        for i, current_state, current_symbol, new_state, new_symbol, movement in self._transitions(code):
+            index = self.index(current_state, current_symbol)
+            self.rules[index] = i
+            self.new_states[index] = self.state_ids[new_state]
+            self.new_symbols[index] = self.symbol_ids[new_symbol]
+            self.movements[index] = movement
+        self.sweeps = self._compile_sweeps()
+
+    def _transitions(self, code: list[TuringTuple]):
+        r"""
+        Yields the index of each tuple in ``code`` along its ``current_state``, ``current_symbol``, ``new_state``,
+        ``new_symbol`` (with the escapes resolved) and its movement (-1, 0 or 1)
+        """
+        for i, element in enumerate(code):
+            yield (i, element.current_state, _remapped_char(element.current_symbol), element.new_state,
+                   _remapped_char(element.new_symbol), _movements.get(element.movement, 0))
+
+    def _compile_sweeps(self) -> list:
+        r"""
+        Finds, for each state and direction, the symbols whose transition keeps the machine in the same state and moves
+        the head that way: on a run of those symbols the machine just rewrites them while moving, so the whole run can be
+        done in one bulk operation.
+
+        Returns a list, indexed like the transitions, with ``None`` or a tuple with the direction, the ``stop_table``
+        (a translation table that maps the symbols of the sweep to 0 and all the others to 1), the same table with the
+        symbols of the breakpoint tuples also mapped to 1 and the ``write_table`` (``None`` when no symbol changes).
+        Sweeps are only available when the symbol ids fit in a byte.
+        """
+        sweeps = [None] * len(self.rules)
+        if self.n_symbols > 256:
+            return sweeps
+        for state in range(len(self.states)):
+            row = state * self.n_symbols
+            for direction in (-1, 1):
+                loop_symbols = [symbol for symbol in range(self.n_symbols) if self.rules[row + symbol] >= 0 and
+                                self.new_states[row + symbol] == state and self.movements[row + symbol] == direction]
+                if not loop_symbols:
+                    continue
+                stop_table = bytearray(b"\x01" * 256)
+                write_table = bytearray(_identity_table)
+                for symbol in loop_symbols:
+                    stop_table[symbol] = 0
+                    write_table[symbol] = self.new_symbols[row + symbol]
+                stop_breakpoints_table = bytearray(stop_table)
+                for symbol in loop_symbols:
+                    if self.breakpoints[self.rules[row + symbol]]:
+                        stop_breakpoints_table[symbol] = 1
+                sweep = (direction, bytes(stop_table), bytes(stop_breakpoints_table),
+                         bytes(write_table) if write_table != _identity_table else None)
+                for symbol in loop_symbols:
+                    sweeps[row + symbol] = sweep
+        return sweeps
+
+    def _intern_state(self, state: str) -> int:
+        r"""Returns the id of ``state``, assigning a new one if it's the first time it's seen"""
+        if state not in self.state_ids:
+            self.state_ids[state] = len(self.states)
+            self.states.append(state)
+        return self.state_ids[state]
+
+    def _intern_symbol(self, symbol: str) -> int:
+        r"""Returns the id of ``symbol``, assigning a new one if it's the first time it's seen"""
+        if symbol not in self.symbol_ids:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self.symbol_ids[symbol]
+
+    def index(self, state: str, symbol: str) -> int:
+        r"""Returns the position in the transition lists of the (``state``, ``symbol``) pair"""
+        return self.state_ids[state] * self.n_symbols + self.symbol_ids[symbol]
+
+    def with_symbols(self, symbols: str) -> "CompiledCode":
+        r"""
+        Returns a ``CompiledCode`` that also has an id for every character in ``symbols``. The ids already assigned
+        are kept, so the same instance is returned if no new symbol is found.
+        """
+        new_symbols = tuple(x for x in dict.fromkeys(symbols) if x not in self.symbol_ids)
+        if not new_symbols:
+            return self
+        return type(self)(self.code, self.breakpoints, self.extra_symbols + new_symbols)
+
+    def encode(self, tape: str) -> list[int]:
+        r"""Converts the characters of ``tape`` to symbol ids (every character needs to have an id already)"""
+        return [self.symbol_ids[x] for x in tape]
+
+    def decode(self, cells) -> str:
+        r"""Converts the symbol ids in ``cells`` back to a string"""
+        symbols = self.symbols
+        return "".join([symbols[x] for x in cells])
+
+def _sweep_length(data, position: int, bound: int, direction: int, stop_table: bytes) -> int:
+    r"""
+    Returns the number of cells of ``data``, starting from ``position`` and moving in ``direction`` up to ``bound``
+    (excluded), that a sweep with ``stop_table`` can cover. The cells are scanned in windows that double in size, so
+    the cost is proportional to the length of the run and not to the length of the tape.
+    """
+    window = 64
+    if direction > 0:
+        start = position
+        while True:
+            stop = min(start + window, bound)
+            found = data[start:stop].translate(stop_table).find(1)
+            if found >= 0:
+                return start + found - position
+            if stop == bound:
+                return bound - position
+            start = stop
+            window *= 2
+    else:
+        stop = position + 1
+        while True:
+            start = max(stop - window, bound + 1)
+            found = data[start:stop].translate(stop_table).rfind(1)
+            if found >= 0:
+                return position - start - found
+            if start == bound + 1:
+                return position - bound
+            stop = start
+            window *= 2
@@ -0,0 +1,124 @@
+from bisect import bisect_right
+from collections import deque
+
+class Checkpoints:
+
+    def __init__(self, interval: int = 10_000, memory: int = 64 * 2 ** 20) -> None:
+        r"""
+        Creates a new instance of ``Checkpoints``, that keeps the snapshots of a machine taken every ``interval`` steps.
+
+        Each snapshot keeps the step counter, the state, the position of the head, the last tuple used and a copy of the
+        tape. When the snapshots take more than ``memory`` bytes, the oldest ones are evicted.
+        """
+
+        if interval < 1:
+            raise ValueError("The interval between checkpoints needs to be positive")
+        self.interval = interval
+        self.memory = memory
+        self.snapshots = []
+        self.steps = []
+        self.size = 0
+        self.next_step = interval
+
+    def clear(self) -> None:
+        r"""Deletes all the snapshots"""
+        self.snapshots = []
+        self.steps = []
+        self.size = 0
+        self.next_step = self.interval
+
+    def save(self, machine) -> None:
+        r"""Takes a snapshot of ``machine`` (a ``machine.TuringMachine``) if it has reached the next checkpoint"""
+        if machine.steps < self.next_step:
+            return None
+        if self.steps and self.steps[-1] >= machine.steps:
+            self.next_step = machine.steps - machine.steps % self.interval + self.interval
+            return None
+        tape = machine.cells.copy()
+        self.snapshots.append((machine.steps, machine.state_id, machine.tape_position, machine.prec_index, tape))
+        self.steps.append(machine.steps)
+        self.size += len(tape.data) * (4 if tape.wide else 1) + 200
+        while self.size > self.memory and self.snapshots:
+            evicted = self.snapshots.pop(0)
+            self.steps.pop(0)
+            self.size -= len(evicted[4].data) * (4 if evicted[4].wide else 1) + 200
+        self.next_step = machine.steps - machine.steps % self.interval + self.interval
+
+    def restore(self, machine, steps: int) -> bool:
+        r"""
+        Restores ``machine`` to the latest snapshot taken at or before ``steps`` steps, deleting the ones after it.
+
+        Returns False, leaving the machine untouched, if there is no such snapshot
+        """
+        index = bisect_right(self.steps, steps)
+        if index == 0:
+            self.clear()
+            return False
+        for evicted in self.snapshots[index:]:
+            self.size -= len(evicted[4].data) * (4 if evicted[4].wide else 1) + 200
+        del self.snapshots[index:]
+        del self.steps[index:]
+        machine.steps, machine.state_id, machine.tape_position, machine.prec_index, tape = self.snapshots[-1]
+        machine.cells = tape.copy()
+        self.next_step = machine.steps - machine.steps % self.interval + self.interval
+        return True
+
+class Journal:
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        r"""
+        Creates a new instance of ``Journal``, a ring buffer that keeps what is needed to undo the last ``capacity``
+        entries of a machine.
+
+        For each step it only records the position of the transition in the ``CompiledCode`` lists, that is
+        ``state_id * n_symbols + symbol_id``: it holds both the previous state and the overwritten symbol and, through
+        the movement of the transition, the previous position of the head. Positions are never stored, so the entries
+        stay valid when the tape buffer grows on the left. A whole sweep (see ``CompiledCode.sweeps``) is recorded as a
+        single entry, a tuple with ``state_id * n_symbols`` and the overwritten symbols in the order they were read.
+        """
+
+        if capacity < 1:
+            raise ValueError("The capacity of the journal needs to be positive")
+        self.capacity = capacity
+        self.entries = deque(maxlen=capacity)
+
+    def clear(self) -> None:
+        r"""Deletes all the entries"""
+        self.entries.clear()
+
+    def covers(self, times: int) -> bool:
+        r"""Returns True if the journal has recorded more than ``times`` steps"""
+        steps = 0
+        for entry in reversed(self.entries):
+            steps += 1 if isinstance(entry, int) else len(entry[1])
+            if steps > times:
+                return True
+        return False
+
+    def undo(self, machine, times: int) -> None:
+        r"""Undoes the last ``times`` steps of ``machine`` (a ``machine.TuringMachine``), as long as they're recorded"""
+        compiled = machine.compiled
+        n_symbols, movements = compiled.n_symbols, compiled.movements
+        data = machine.cells.data
+        position = machine.tape_position
+        entries = self.entries
+        while times > 0 and entries:
+            entry = entries.pop()
+            base, symbols = (entry - entry % n_symbols, (entry % n_symbols,)) if isinstance(entry, int) else entry
+            undone = min(times, len(symbols))
+            for symbol in reversed(symbols[len(symbols) - undone:]):
+                position -= movements[base + symbol]
+                if not 0 <= position < len(data):
+                    position += machine.cells.reserve(position, position + 1)
+                data[position] = symbol
+            if undone < len(symbols):
+                entries.append((base, symbols[:len(symbols) - undone]))
+            machine.state_id = base // n_symbols
+            machine.steps -= undone
+            times -= undone
+        machine.tape_position = position
+        if entries:
+            last = entries[-1]
+            machine.prec_index = compiled.rules[last if isinstance(last, int) else last[0] + last[1][-1]]
+        else:
+            machine.prec_index = 0
@@ -1,4 +1,148 @@
 import os
+import sys
+import signal
+import threading
+
+_code_rows = {"upper", "state", "lower", "bar", "arrow", "upper_tape", "tape", "lower_tape", "input_separator", "input",
+              "blank"}
+
+class _Renderer:
+
+    def __init__(self) -> None:
+        r"""
+        Creates a new instance of ``_Renderer``, that draws the frames of the interface on the terminal.
+
+        The last drawn frame is kept, so that only the changed part of each row is written, moving the cursor with the
+        ANSI escape sequences. The size of the terminal is queried again only when it changes (on ``SIGWINCH``, where
+        it's available), and then the whole frame is drawn again. ``redraw`` is set when the frame needs to be drawn
+        again while the machine is idle, by a resize or by ``request_redraw()``.
+        """
+
+        self.size = None
+        self.last_rows = None
+        self.watching = False
+        self.redraw = threading.Event()
+
+    def _resized(self, signum, frame) -> None:
+        r"""Handles ``SIGWINCH``, forgetting the size of the terminal"""
+        self.size = None
+        self.redraw.set()
+
+    def terminal_size(self) -> tuple[int, int]:
+        r"""Returns the size of the terminal as ``(columns, lines)``"""
+        if not self.watching and hasattr(signal, "SIGWINCH"):
+            try:
+                signal.signal(signal.SIGWINCH, self._resized)
+                self.watching = True
+            except ValueError:  # the handler can only be set from the main thread
+                pass
+        if self.size is None or not self.watching:
+            size = tuple(os.get_terminal_size())
+            if size != self.size:
+                self.last_rows = None
+            self.size = size
+        return self.size
+
+    def draw(self, rows: list[str]) -> None:
+        r"""
+        Draws ``rows``, one for each line of the terminal: only the part of each row that is different from the last
+        drawn frame is written, or the whole frame if the terminal was cleared or resized. A row of a different length
+        is written whole and the rest of the line is erased, so a shorter row doesn't leave the end of the old one
+        """
+        if self.last_rows is None or len(self.last_rows) != len(rows):
+            if os.name == "nt" and self.last_rows is None:
+                os.system("")  # enables the ANSI escape sequences on the Windows console
+            buffer_list = ["\x1b[2J"] + [f"\x1b[{i + 1};1H{row}" for i, row in enumerate(rows)]
+        else:
+            buffer_list = []
+            for i, (old_row, row) in enumerate(zip(self.last_rows, rows)):
+                if old_row == row:
+                    continue
+                if len(old_row) != len(row):
+                    buffer_list.append(f"\x1b[{i + 1};1H{row}\x1b[K")
+                    continue
+                start = len(os.path.commonprefix((old_row, row)))
+                end = len(row) - len(os.path.commonprefix((old_row[::-1], row[::-1])))
+                buffer_list.append(f"\x1b[{i + 1};{start + 1}H{row[start:end]}")
+        self.last_rows = rows
+        if buffer_list:
+            sys.stdout.write("".join(buffer_list) + f"\x1b[{len(rows)};{len(rows[-1])}H")
+            sys.stdout.flush()
+
+_renderer = _Renderer()
+_layouts = {}
+
+def terminal_size() -> tuple[int, int]:
+    r"""Returns the size of the terminal as ``(columns, lines)``, queried again only when it changes"""
+    return _renderer.terminal_size()
+
+def request_redraw() -> None:
+    r"""Wakes up ``wait_redraw()``, as something shown by the interface has changed"""
+    _renderer.redraw.set()
+
+def wait_redraw() -> None:
+    r"""
+    Blocks until ``request_redraw()`` is called or the terminal is resized. Where the resizes can't be watched, it also
+    returns after half a second, so that the size is checked again.
+    """
+    _renderer.redraw.wait(None if _renderer.watching else 0.5)
+    _renderer.redraw.clear()
+
+def _layout(length: int, height: int, code_size: int, tape_size: int, slim_tape: bool) -> list[tuple[str, str]]:
+    r"""
+    Returns the kind of each row of the interface, with its content when it doesn't change between frames (or an empty
+    string). The rows are computed once for each size of the terminal and of the panels.
+    """
+    key = (length, height, code_size, tape_size, slim_tape)
+    if key in _layouts:
+        return _layouts[key]
+    c = (height - 8) // 2
+    no_code = code_size == 0
+    left_size = length - 2 if no_code else length - code_size - 2
+
+    def centered(content: str) -> str:
+        return f"║{content.center(left_size)}║" if no_code else f"║{content.center(left_size)}│"
+
+    rows = []
+    for i in range(height):
+        if i == 0:
+            rows.append(("top", f"╔{'═' * (length - 2)}╗"))
+        elif i == 1:
+            rows.append(("title", f"║{'Turing Machine Simulator'.center(length)[1:-1]}║"))
+        elif i == 2:
+            rows.append(("separator", f"╠{'═' * (length - 2)}╣" if no_code else
+                                      f"╠{'═' * (length - code_size - 2)}╤{'═' * (code_size - 1)}╣"))
+        elif i == c - 6:
+            rows.append(("upper", centered(f"┌{'─' * (tape_size - 2)}┐")))
+        elif i == c - 5:
+            rows.append(("state", ""))
+        elif i == c - 4:
+            rows.append(("lower", centered(f"└{'─' * (tape_size - 2)}┘")))
+        elif i == c + 2:
+            rows.append(("bar", centered("│")))
+        elif i == c + 3:
+            rows.append(("arrow", ""))
+        elif i == c + 4:
+            rows.append(("upper_tape", centered(f"─{('┬─' if slim_tape else '─┬──') * (tape_size + 1)}")))
+        elif i == c + 5:
+            rows.append(("tape", ""))
+        elif i == c + 6:
+            rows.append(("lower_tape", centered(f"─{('┴─' if slim_tape else '─┴──') * (tape_size + 1)}")))
+        elif i == height - 5:
+            rows.append(("input_separator", f"╟{'─' * (length - 2)}╢" if no_code else f"╟{'─' * left_size}┤"))
+        elif i == height - 4:
+            rows.append(("input", ""))
+        elif i == height - 3:
+            rows.append(("bottom_separator", f"╠{'═' * (length - 2)}╣" if no_code else
+                                             f"╠{'═' * (length - code_size - 2)}╧{'═' * (code_size - 1)}╣"))
+        elif i == height - 2:
+            rows.append(("status", ""))
+        elif i == height - 1:
+            rows.append(("bottom", f"╚{'═' * (length - 2)}╝"))
+        else:
+            rows.append(("blank", centered(" " * left_size)))
+    _layouts[key] = rows
+    return rows
 
 class Interface:
 
@@ -27,82 +171,44 @@ class Interface:
 
     def show(self) -> None:
         r"""
-        Prints the interface based on the current values of the machine.
-        It buffers the whole string representing the interface and prints it all at once at the end.
-        Previous interfaces printed are not deleted to avoid flashing images due to the high refresh frequency.
+        Draws the interface based on the current values of the machine.
+        The rows that don't depend on the machine come from ``_layout()``, and only the parts of the rows that changed
+        since the last drawn interface are written to the terminal, so nothing flashes even at the highest speeds.
         """
 
         def show_code(index: int, arrow: bool) -> str:
             return (f" {'->' if arrow else '  '} {'!' if self.view_code[index - 3][0] else ' '}"
-                    f" {self.view_code[index - 3][1]}").ljust(self.global_var["code_size"] - 1)[:self.global_var["code_size"] - 1] + "║\n"
-        length, height = tuple(os.get_terminal_size())
+                    f" {self.view_code[index - 3][1]}").ljust(self.global_var["code_size"] - 1)[:self.global_var["code_size"] - 1] + "║"
+        length, height = terminal_size()
         if self.global_var["code_size"] + self.global_var["tape_size"] * (2 if self.global_var["slim_tape"] else 4) + 10 > length or height < 20 or length < 120:
             os.system("cls" if os.name == "nt" else "clear")
             print("The terminal window size was changed while the simulator was running and the new size is not supported")
             exit()
 
-        c = (height - 8) // 2
-        buffer_string = ''
         no_code = self.global_var["code_size"] == 0
-        for i in range(height):
-            if i == 0:
-                buffer_string += f"╔{'═' * (length - 2)}╗"
-            elif i == 1:
-                buffer_string += f"║{'Turing Machine Simulator'.center(length)[1:-1]}║"
-            elif i == 2:
-                buffer_string += f"╠{'═' * (length - self.global_var['code_size'] - 2)}╤{'═' * (self.global_var['code_size'] - 1)}╣" if not no_code \
-                            else f"╠{'═' * (length - 2)}╣"
-            elif i == c - 6:
-                upper_part = f"┌{'─' * (self.global_var['tape_size'] - 2)}┐"
-                buffer_string += (f"║{upper_part.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{upper_part.center(length - 2)}║"
-            elif i == c - 5:
+        left_size = length - 2 if no_code else length - self.global_var["code_size"] - 2
+        rows = []
+        for i, (kind, row) in enumerate(_layout(length, height, self.global_var["code_size"], self.global_var["tape_size"],
+                                                self.global_var["slim_tape"])):
+            if kind == "state":
                 text = f"│{self.state.center(self.global_var['tape_size'] - 2)}│"
-                buffer_string += (f"║{text.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{text.center(length - 2)}║"
-            elif i == c - 4:
-                lower_part = f"└{'─' * (self.global_var['tape_size'] - 2)}┘"
-                buffer_string += (f"║{lower_part.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{lower_part.center(length - 2)}║"
-            elif i == c + 2:
-                buffer_string += (f"║{'│'.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{'│'.center(length - 2)}║"
-            elif i == c + 3:
-                arrow_tip = '*' if self.writing else 'V'
-                buffer_string += (f"║{arrow_tip.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, True)) if not no_code \
-                            else f"║{arrow_tip.center(length - 2)}║"
-            elif i == c + 4:
-                upper_tape = f"─{('┬─' if self.global_var['slim_tape'] else '─┬──') * (self.global_var['tape_size'] + 1)}"
-                buffer_string += (f"║{upper_tape.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{upper_tape.center(length - 2)}║"
-            elif i == c + 5:
+                row = f"║{text.center(left_size)}{'║' if no_code else '│'}"
+            elif kind == "arrow":
+                row = f"║{('*' if self.writing else 'V').center(left_size)}{'║' if no_code else '│'}"
+            elif kind == "tape":
                 tape_content = f"  │ {' │ '.join(self.view_tape.upper())} │  "
                 tape_content = f" {tape_content.replace(' │ ', '│')} " if self.global_var['slim_tape'] else tape_content
-                buffer_string += (f"║{tape_content.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{tape_content.center(length - 2)}║"
-            elif i == c + 6:
-                lower_tape = f"─{('┴─' if self.global_var['slim_tape'] else '─┴──') * (self.global_var['tape_size'] + 1)}"
-                buffer_string += (f"║{lower_tape.center(length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{lower_tape.center(length - 2)}║"
-            elif i == height - 5:
-                buffer_string += (f"╟{'─' * (length - self.global_var['code_size'] - 2)}┤" + show_code(i, False)) if not no_code \
-                            else f"╟{'─' * (length - 2)}╢"
-            elif i == height - 4:
+                row = f"║{tape_content.center(left_size)}{'║' if no_code else '│'}"
+            elif kind == "input":
                 input_string = self.input_tape.upper()
-                buffer_string += (f"║  Input: {input_string.ljust(length - self.global_var['code_size'] - 10)}"[:length - self.global_var["code_size"] - 1] +
-                                  '│' + show_code(i, False)) if not no_code \
-                            else f"║  Input: {input_string.ljust(length - 1)}"[:length - 1] + '║'
-            elif i == height - 3:
-                buffer_string += f"╠{'═' * (length - self.global_var['code_size'] - 2)}╧{'═' * (self.global_var['code_size'] - 1)}╣" if not no_code \
-                            else f"╠{'═' * (length - 2)}╣"
-            elif i == height - 2:
-                text = f"  Simulation speed: {self.global_var['speed']}   Steps counter: {self.steps}    " + \
+                row = f"║  Input: {input_string.ljust(length - 1)}"[:length - 1] + '║' if no_code \
+                      else f"║  Input: {input_string.ljust(left_size - 8)}"[:left_size + 1] + '│'
+            elif kind == "status":
+                rate = self.global_var.get("rate")
+                speed = self.global_var["speed"] if rate is None else f"{rate} steps/s" if rate else "max"
+                text = f"  Simulation speed: {speed}   Steps counter: {self.steps}    " + \
                        ("Press \"q\" at any moment to stop the simulation... " if not self.status_bar else
                         self.status_bar)
-                buffer_string += f"║{text.ljust(length - 2)}║"
-            elif i == height - 1:
-                buffer_string += f"╚{'═' * (length - 2)}╝"
-            else:
-                buffer_string += (f"║{' ' * (length - self.global_var['code_size'] - 2)}│" + show_code(i, False)) if not no_code \
-                            else f"║{' ' * (length - 2)}║"
-        print(buffer_string, end='', flush=True)
+                row = f"║{text.ljust(length - 2)}║"
+            rows.append(row + show_code(i, kind == "arrow") if not no_code and kind in _code_rows else row)
+        _renderer.draw(rows)
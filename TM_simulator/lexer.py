@@ -0,0 +1,51 @@
+import re
+from typing import NamedTuple
+
+_comment_start = re.compile(r'(?:[^\\#]|\\.|\\\Z)*', re.S)
+_tokens = re.compile(r'(?P<space> +)|(?P<escape>\\ *[^ ]?)|(?P<range>\. *\.)|(?P<punctuation>[(),^\[\]{}])|'
+                     r'(?P<text>(?:[^\\ (),^\[\]{}.]|\.(?! *\.))+)', re.S)
+_punctuation_kinds = {"(": "open", ")": "close", ",": "separator", "^": "exclusion", "[": "class_open",
+                      "{": "class_open", "]": "class_close", "}": "class_close"}
+
+class Token(NamedTuple):
+    r"""
+    A token of a line of a program: ``kind`` is one of ``"breakpoint"``, ``"open"``, ``"close"``, ``"separator"``,
+    ``"range"``, ``"exclusion"``, ``"class_open"``, ``"class_close"``, ``"escape"``, ``"text"`` (state names and
+    symbols) or ``"comment"``, ``text`` is its uppercase text without spaces and ``column`` is the position of its first
+    character in the line (from 0)
+    """
+    kind: str
+    text: str
+    column: int
+
+def tokenize(line: str) -> tuple[list[Token], str]:
+    r"""
+    Splits ``line`` in ``Token`` with a single scan of a regular expression, without any recursion or copy of the rest
+    of the line, so it takes linear time.
+
+    Returns the tokens and the uppercase text of the line without the comment and the spaces, the one the notations are
+    expanded from. The comment starts at the first ``#`` not escaped in ``line`` itself, while the other escapes pair a
+    ``\`` with the first character after it that is not a space, like the expansion of the notations does.
+
+    tokenize("!(a, \\,) # c") -> ([("breakpoint", "!", 0), ("open", "(", 1), ("text", "A", 2), ("separator", ",", 3),
+                                   ("escape", "\\,", 5), ("close", ")", 7), ("comment", "# C", 9)], "!(A,\\,)")
+    """
+
+    end = _comment_start.match(line).end()
+    tokens = []
+    for match in _tokens.finditer(line, 0, end):
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        text, column = match.group().upper().replace(" ", ""), match.start()
+        if kind == "punctuation":
+            kind = _punctuation_kinds[text]
+        elif kind == "text" and not tokens and text[0] == "!":
+            tokens.append(Token("breakpoint", "!", column))
+            if len(text) == 1:
+                continue
+            text, column = text[1:], column + 1
+        tokens.append(Token(kind, text, column))
+    if end < len(line):
+        tokens.append(Token("comment", line[end:].upper(), end))
+    return tokens, line[:end].upper().replace(" ", "")
@@ -0,0 +1,102 @@
+import time
+from typing import Iterable
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from .tuples import TuringTuple
+    from .engine import CompiledCode
+    from .batch import BatchResult
+    from .program import Program
+except ImportError:
+    from tuples import TuringTuple
+    from engine import CompiledCode
+    from batch import BatchResult
+    from program import Program
+
+def _grow(cells, origin: int, left: bool):
+    r"""Doubles the width of the ``cells`` matrix, adding blank columns on the left if ``left``, else on the right"""
+    blank = np.zeros_like(cells)
+    return (np.hstack((blank, cells)), origin + cells.shape[1]) if left else (np.hstack((cells, blank)), origin)
+
+def run_lockstep(parsed_tuples: list[TuringTuple] | Program, tapes: Iterable[str], threshold: int = 1_000_000) -> list[BatchResult]:
+    r"""
+    Runs the program of ``parsed_tuples`` (or a ``Program``) on each of the ``tapes`` at the same time, advancing all
+    the machines by one step for each iteration, and returns a list of ``BatchResult`` in the same order of ``tapes``.
+
+    The states, the positions of the heads and the tapes (a matrix with one row for each machine) are kept in NumPy
+    arrays, so each step is a gather from the compiled transition table for all the machines still running. Halted
+    machines are dropped from the active set, while the matrix grows in width like a ``Tape`` (doubling) when any head
+    reaches one of its sides. The results are the same of ``run_batch()``, except that ``runtime`` is the time elapsed
+    since the start of the whole batch when each machine stopped.
+
+    This engine is faster than ``run_batch()`` on many short runs of the same length, and it needs NumPy to be
+    installed (``pip install TM-simulator[numpy]``).
+    """
+    if np is None:
+        raise ImportError("The lockstep engine needs NumPy, install it with 'pip install TM-simulator[numpy]'")
+    if not isinstance(parsed_tuples, Program) and any(x.raw_string for x in parsed_tuples):
+        raise ValueError("You can only pass a list of parsed tuples")
+    start_time = time.perf_counter()
+    limit = threshold if threshold > 0 else -1
+    tapes = [x.upper() if x else " " for x in tapes]
+    compiled = parsed_tuples.compiled if isinstance(parsed_tuples, Program) else CompiledCode(parsed_tuples)
+    compiled = compiled.with_symbols("".join(tapes))
+    n_symbols = compiled.n_symbols
+    rules = np.array(compiled.rules, dtype=np.int32)
+    new_states = np.array(compiled.new_states, dtype=np.int32)
+    new_symbols = np.array(compiled.new_symbols, dtype=np.uint8 if n_symbols <= 256 else np.uint32)
+    movements = np.array(compiled.movements, dtype=np.int64)
+    width = max(map(len, tapes), default=1)
+    origin = 16
+    cells = np.zeros((len(tapes), origin + width + 16), dtype=new_symbols.dtype)
+    for row, tape in enumerate(tapes):
+        cells[row, origin:origin + len(tape)] = compiled.encode(tape)
+    final_states = np.zeros(len(tapes), dtype=np.int32)
+    final_steps = np.zeros(len(tapes), dtype=np.int64)
+    halted = np.zeros(len(tapes), dtype=bool)
+    runtimes = [0.0] * len(tapes)
+    rows = np.arange(len(tapes))
+    states = np.zeros(len(tapes), dtype=np.int32)
+    positions = np.full(len(tapes), origin, dtype=np.int64)
+    steps = 0
+    while rows.size and steps != limit:
+        # the heads move at most one cell for each step, so the matrix can't be left for a while
+        margin = min(int(positions.min()), cells.shape[1] - 1 - int(positions.max()))
+        if margin == 0:
+            left = int(positions.min()) == 0
+            cells, new_origin = _grow(cells, origin, left)
+            positions += new_origin - origin
+            origin = new_origin
+            continue
+        flat = cells.reshape(-1)
+        bases = rows * cells.shape[1]
+        for _ in range(margin if limit < 0 else min(margin, limit - steps)):
+            index = states * n_symbols + flat[bases + positions]
+            rule = rules[index]
+            stopped = rule < 0
+            if stopped.any():
+                elapsed = round(time.perf_counter() - start_time, 6)
+                for row in rows[stopped]:
+                    runtimes[row] = elapsed
+                final_states[rows[stopped]] = states[stopped]
+                final_steps[rows[stopped]] = steps
+                halted[rows[stopped]] = True
+                running = ~stopped
+                rows, states, positions, bases, index = rows[running], states[running], positions[running], \
+                                                         bases[running], index[running]
+                if not rows.size:
+                    break
+            flat[bases + positions] = new_symbols[index]
+            states = new_states[index]
+            positions += movements[index]
+            steps += 1
+    elapsed = round(time.perf_counter() - start_time, 6)
+    for row in rows:
+        runtimes[row] = elapsed
+    final_states[rows] = states
+    final_steps[rows] = steps
+    return [BatchResult(row, compiled.decode(cells[row].tolist()).strip(), compiled.states[final_states[row]],
+                        int(final_steps[row]), "halted" if halted[row] else "timeout", runtimes[row])
+            for row in range(len(tapes))]
@@ -2,10 +2,20 @@ import os
 import time
 try:
     from .tuples import TuringTuple
-    from .interface import Interface
+    from .interface import Interface, terminal_size, request_redraw
+    from .engine import CompiledCode, _sweep_length
+    from .tape import Tape, SparseTape
+    from .history import Checkpoints, Journal
+    from .analysis import _find_conflicts
+    from .progress import Progress
 except ImportError:
     from tuples import TuringTuple
-    from interface import Interface
+    from interface import Interface, terminal_size, request_redraw
+    from engine import CompiledCode, _sweep_length
+    from tape import Tape, SparseTape
+    from history import Checkpoints, Journal
+    from analysis import _find_conflicts
+    from progress import Progress
 
 def _get_error_message(pars_errors, code_map, is_instant: bool, is_keyboard: bool) -> str:
     r"""Returns the error message based on the first error occurrence in ``self.pars_errors``"""
@@ -14,7 +24,8 @@ def _get_error_message(pars_errors, code_map, is_instant: bool, is_keyboard: boo
     line_error_list = list(dict.fromkeys([str(code_map[i] + 1) for i in pars_errors[0][0]]))[:5] if multiple_lines \
                       else pars_errors[0][0]
     error_lines = ", ".join(line_error_list) if multiple_lines else line_error_list[0] + 1
-    error_message = f'Error at line{"s" if multiple_lines else ""} {error_lines}: '
+    error_column = f", column {pars_errors[0][2] + 1}" if len(pars_errors[0]) > 2 else ""
+    error_message = f'Error at line{"s" if multiple_lines else ""} {error_lines}{error_column}: '
     match error_code:
         case 'incompatible_dot_limiters':
             error_message += 'the characters limiting the dot notation are not of the same time'
@@ -52,31 +63,137 @@ def _get_error_message(pars_errors, code_map, is_instant: bool, is_keyboard: boo
     return error_message + f" (Press \"{'q' if is_keyboard else 'Ctrl+C'}\" to quit)" if not is_instant else error_message
 
 def _check_determinism(parsed_code) -> list:
-    r"""Scans the code to find any non-deterministic combination of tuples, adding any error to ``self.pars_errors``"""
-    dictionary = {}
-    for element in parsed_code:
-        current_param = (element.current_state, element.current_symbol)
-        new_param = (element.new_state, element.new_symbol, element.movement)
-        if current_param not in dictionary:
-            dictionary.update({current_param: [new_param]})
-        else:
-            dictionary[current_param].append(new_param)
-    pars_errors = []
-    for current_param, new_param_list in list(dictionary.items()):
-        if len(list(dict.fromkeys(new_param_list))) != 1:
-            index_list = []
-            for i, element in enumerate(parsed_code):
-                for new_param in new_param_list:
-                    if (element.current_state, element.current_symbol) == current_param and \
-                            (element.new_state, element.new_symbol, element.movement) != new_param:
-                        index_list.append(i)
-            pars_errors.append((index_list, 'non_deterministic'))
-    return pars_errors
+    r"""Scans the code in a single pass to find any non-deterministic combination of tuples, returning their errors"""
+    return [(indexes, 'non_deterministic') for indexes in _find_conflicts(parsed_code)]
+
+_run_source = r"""
+def _run(self, max_steps=float("inf"), stop_at_breakpoints=True, bounds=None):
+    if bounds is not None:  # [plain]
+        return _tracked_run(self, max_steps, stop_at_breakpoints, bounds)  # [plain]
+    if self.ended:
+        if bounds is not None:
+            bounds[:] = [self.tape_position - self.cells.origin] * 2
+        return 0
+    compiled = self.compiled
+    rules, new_states, new_symbols, movements = compiled.rules, compiled.new_states, compiled.new_symbols, compiled.movements
+    n_symbols = compiled.n_symbols
+    sweeps = compiled.sweeps
+    sweeps = [None] * len(rules)  # [profile]
+    profiler = self.profiler  # [profile]
+    rule_hits, visits = profiler.rule_hits, profiler.visits  # [profile]
+    visits_get = visits.get  # [profile]
+    log = self.journal.entries.append if self.journal is not None else None
+    breakpoints = self.remapped_breakpoints_list
+    check_breakpoints = self.global_var["breakpoints"] and not self.paused
+    tape = self.cells
+    data = tape.data
+    origin = tape.origin
+    last = len(data) - 1
+    position = self.tape_position
+    state = self.state_id
+    prec_index = self.prec_index
+    limit = max_steps if max_steps != float("inf") else -1
+    low = high = position  # [track]
+    steps = 0
+    while steps != limit:
+        index = state * n_symbols + data[position]
+        i = rules[index]
+        if i < 0:
+            self.ended = True
+            break
+        sweep = sweeps[index]
+        if sweep is not None and 0 < position < last:
+            direction, stop_table, stop_breakpoints_table, write_table = sweep
+            if check_breakpoints:
+                stop_table = stop_breakpoints_table
+            if not stop_table[data[position + direction]]:
+                bound = last if direction > 0 else 0
+                if limit >= 0:
+                    bound = min(bound, position + limit - steps) if direction > 0 else max(bound, position - limit + steps)
+                length = _sweep_length(data, position, bound, direction, stop_table)
+                if length > 1:
+                    start, end = (position, position + length) if direction > 0 else (position - length + 1, position + 1)
+                    prec_index = rules[state * n_symbols + data[end - 1 if direction > 0 else start]]
+                    if log is not None:
+                        log((state * n_symbols, data[start:end] if direction > 0 else data[start:end][::-1]))
+                    if write_table is not None:
+                        data[start:end] = data[start:end].translate(write_table)
+                    low, high = min(low, start), max(high, end - 1)  # [track]
+                    position += direction * length
+                    steps += length
+                    continue
+        if position < low:  # [track]
+            low = position  # [track]
+        elif position > high:  # [track]
+            high = position  # [track]
+        rule_hits[i] += 1  # [profile]
+        visits[position - origin] = visits_get(position - origin, 0) + 1  # [profile]
+        prec_index = i
+        if log is not None:
+            log(index)
+        data[position] = new_symbols[index]
+        state = new_states[index]
+        steps += 1
+        if position == 0 or position == last:
+            grown = tape.grow(position)
+            low, high = low + grown - position, high + grown - position  # [track]
+            position = grown
+            origin = tape.origin
+            last = len(data) - 1
+        position += movements[index]
+        if check_breakpoints and breakpoints[i]:
+            self.paused = True
+            check_breakpoints = False
+            if stop_at_breakpoints:
+                break
+    if bounds is not None:  # [track]
+        bounds[:] = low - tape.origin, high - tape.origin  # [track]
+    self.state_id = state
+    self.tape_position = position
+    self.prec_index = prec_index
+    self.steps += steps
+    return steps
+"""
+
+def _run_variant(name: str, tags: set[str], **names):
+    r"""
+    Returns the function ``name`` compiled from ``_run_source`` with only the lines tagged with one of ``tags`` (the
+    lines without a tag are always kept), that can see the global ``names``.
+
+    The loop of the machine is written once and compiled in three variants, so the instrumentation is chosen once and
+    never checked on each step: ``_plain_run`` is the normal loop of ``TuringMachine._run()`` and calls ``_tracked_run``
+    when ``bounds`` is given, ``_tracked_run`` also keeps track of the bounds of the run and ``_profiled_run``, installed
+    by ``Profiler.attach()``, also counts each step in the profiler, without grouping the sweeps.
+    """
+    lines = []
+    for line in _run_source.split("\n"):
+        code, _, tag = line.partition("  # [")
+        if not tag or tag[:-1] in tags:
+            lines.append(code)
+    namespace = {"_sweep_length": _sweep_length, **names}
+    exec(compile("\n".join(lines), f"<TuringMachine.{name}>", "exec"), namespace)
+    function = namespace["_run"]
+    function.__name__ = function.__qualname__ = name
+    function.__doc__ = r"""
+        Runs the machine like ``run()``, without saving the checkpoints.
+
+        The whole loop runs in this function with local variables and the breakpoints are checked only when enabled.
+        When a self-looping transition is found on a run of at least two cells, the whole run is done at once (see
+        ``CompiledCode.sweeps``), stopping before any breakpoint tuple, the end of the buffer or the ``max_steps`` limit.
+        If ``bounds`` is given, the leftmost and the rightmost positions where a tuple was executed (counted from the
+        first cell of the input tape) are stored in it. Returns the number of steps performed.
+        """
+    return function
+
+_tracked_run = _run_variant("_tracked_run", {"track"})
+_plain_run = _run_variant("_plain_run", {"plain"}, _tracked_run=_tracked_run)
+_profiled_run = _run_variant("_profiled_run", {"track", "profile"})
 
 class TuringMachine:
 
     def __init__(self, input_tape: str, code: list[TuringTuple], breakpoints_list: list[bool], remapped_breakpoints_list: list[bool],
-                 raw_code: list[str], code_map: list[int], pars_errors: list, global_var: dict) -> None:
+                 raw_code: list[str], code_map: list[int], pars_errors: list, global_var: dict, checked: bool = False,
+                 compiled: CompiledCode = None) -> None:
         r"""
         Creates a new instance of ``TuringMachine`` based on the parsed tuples in ``code``.
 
@@ -84,22 +201,30 @@ class TuringMachine:
         ``raw_code`` is the code as it is in the file, ``code_map`` maps all the expanded tuples back to the original raw_tuple,
         ``pars_errors`` represents all the errors in the parsing process and ``global_var`` keeps all the global variables
 
-        When the machine is initiated it runs ``_check_determinism()``
+        The tuples are compiled in a ``CompiledCode`` transition table (unless it's given as ``compiled``), so ``state``
+        and ``tape`` are stored as interned ids (``state_id`` and the ``Tape`` buffer ``cells``, a ``SparseTape`` when
+        ``global_var["sparse_tape"]`` is set) and converted back to strings only when they are read.
+
+        Every ``checkpoints.interval`` steps a snapshot of the machine is saved in ``checkpoints`` (set it to None to
+        disable them), so stepping back only needs to run the steps from the closest one (see ``rewind()``). The
+        optional ``journal`` (a ``Journal``) records each step, so the most recent ones can also be undone directly.
+
+        When the machine is initiated it runs ``_check_determinism()``, unless the tuples were already ``checked`` while
+        parsing them
         """
 
         self.global_var = global_var
         self.input_tape = input_tape
         self.code = code
-        self.code_hashmap = {(state, char): i for (state, char, i) in zip(
-                            [self.code[x].current_state for x in range(len(code))],
-                            [self._remapped_char(self.code[x].current_symbol) for x in range(len(code))],
-                            range(len(code)))}
+        self.compiled = compiled if compiled is not None else CompiledCode(code, remapped_breakpoints_list)
         self.raw_code = raw_code
         self.code_map = code_map
         self.breakpoints_list = breakpoints_list
         self.remapped_breakpoints_list = remapped_breakpoints_list
-        self.state = "0"
+        self.state_id = 0
         self.tape_position = 0
+        self.checkpoints = Checkpoints()
+        self.journal = None
         self.tape = list(input_tape)
         self.steps = 0
         self.paused = global_var["keyboard"]
@@ -109,10 +234,10 @@ class TuringMachine:
         self.prec_index = 0
         self.first_view = True
         self.pars_errors = pars_errors
-        self.last_time = time.time()
-        self.last_steps = 0
-        self.steps_sec = ""
-        self.pars_errors.extend(_check_determinism(code)) if not self.silent else None
+        self.progress = None
+        self.profiler = None
+        self.cycles = None
+        self.pars_errors.extend(_check_determinism(code)) if not (self.silent or checked) else None
         if len(self.pars_errors) != 0:
             is_direct = isinstance(self.pars_errors[0][0], list)
             error_line = self.pars_errors[0][0][0] if is_direct else self.pars_errors[0][0]
@@ -124,10 +249,59 @@ class TuringMachine:
                 [print(_get_error_message([error], self.code_map, global_var["instant"], global_var["keyboard"])) for error in pars_errors]
                 exit()
 
+    @classmethod
+    def from_program(cls, program, input_tape: str, global_var: dict) -> "TuringMachine":
+        r"""Creates a new instance of ``TuringMachine`` from ``program`` (a ``program.Program``), already checked and compiled"""
+        return cls(input_tape, list(program.tuples), list(program.breakpoints), list(program.tuple_breakpoints),
+                   list(program.raw_lines), list(program.code_map), list(program.errors), global_var, checked=True,
+                   compiled=program.compiled)
+
+    @property
+    def state(self) -> str:
+        r"""The name of the state the machine is in"""
+        return self.compiled.states[self.state_id]
+
+    @state.setter
+    def state(self, value: str) -> None:
+        self.state_id = self.compiled.state_ids[value]
+
+    @property
+    def tape(self) -> list[str]:
+        r"""The characters on the tape, from the first to the last cell that is not blank"""
+        return list(self.compiled.decode(self.cells.used()[1]))
+
+    @tape.setter
+    def tape(self, value: list[str]) -> None:
+        self.compiled = self.compiled.with_symbols(value)
+        tape_class = SparseTape if self.global_var.get("sparse_tape") else Tape
+        self.cells = tape_class(self.compiled.encode(value), wide=self.compiled.n_symbols > 256)
+        self.initial_cells = self.cells.copy()
+        if self.checkpoints is not None:
+            self.checkpoints.clear()
+        if self.journal is not None:
+            self.journal.clear()
+
+    def set_sparse_tape(self, value: bool = True) -> None:
+        r"""
+        Stores the tape in a ``SparseTape``, or in a ``Tape`` if not ``value``, from now on, moving the cells of the
+        current and of the initial tape there (the checkpoints are deleted)
+        """
+        self.global_var["sparse_tape"] = value
+        tape_class = SparseTape if value else Tape
+        if type(self.cells) is not tape_class:
+            head = self.tape_position - self.cells.origin
+            self.cells = tape_class.from_used(*self.cells.used(), self.cells.wide)
+            self.tape_position = head + self.cells.origin
+            self.tape_position += self.cells.reserve(self.tape_position, self.tape_position + 1)
+            self.initial_cells = tape_class.from_used(*self.initial_cells.used(), self.initial_cells.wide)
+            self.initial_cells.reserve(self.initial_cells.origin, self.initial_cells.origin + 1)
+            if self.checkpoints is not None:
+                self.checkpoints.clear()
+
     def _get_view_code(self, index: int, direct: bool = False) -> list[tuple[bool, str]]:
         r"""Returns the visible part of the code to be displayed"""
         return_list = []
-        code_height = tuple(os.get_terminal_size())[1] - 6
+        code_height = terminal_size()[1] - 6
         code_index = self.code_map[index] if not direct else index
         for i in range(code_index - code_height // 2 + 1, code_index + code_height // 2 + 2):
             try:
@@ -141,29 +315,26 @@ class TuringMachine:
 
     def _get_view_tape(self) -> str:
         r"""Returns the visible part of the tape to be displayed"""
-        return_string = ""
-        for i in range(self.tape_position - self.global_var["tape_size"] // 2, self.tape_position + self.global_var["tape_size"] // 2 + 1):
-            try:
-                if i < 0:
-                    raise IndexError
-                return_string += self.tape[i]
-            except IndexError:
-                return_string += " "
-        return return_string
-
-    def _remapped_char(self, char: str) -> str:
-        r"""Returns the escaped version of ``char`` if ``char`` is a special char"""
-        special_view_chars = [' ', '\\', '-', '(', ')', '^', ',', '#', '[', ']', '{', '}']
-        special_code_char = ['-', '\\\\', '\\-', '\\(', '\\)', '\\^', '\\,', '\\#', '\\[', '\\]', '\\{', '\\}']
-        current_char = char
-        if current_char in special_code_char:
-            current_char = special_view_chars[special_code_char.index(current_char)]
-        return current_char
+        symbols = self.compiled.symbols
+        head = self.tape_position - self.cells.origin
+        cells = self.cells.window(head - self.global_var["tape_size"] // 2, head + self.global_var["tape_size"] // 2 + 1)
+        return "".join([symbols[x] for x in cells])
+
+    def _get_status_message(self) -> str | None:
+        r"""Returns the message of the status bar when the machine is paused or ended, else None"""
+        if not (self.paused or self.ended):
+            return None
+        elif self.steps == 0:
+            return "Press \"space\" to start the simulation"
+        elif self.paused:
+            return "Simulation paused! (Press \"space\" to resume)"
+        return f"Simulation ended! (Press \"{'q' if self.global_var['keyboard'] else 'Ctrl+C'}\" to quit)"
 
     def pause(self) -> None:
         r"""Pauses or resumes the simulation"""
         if not self.silent and not self.error and not self.ended:
             self.paused = not self.paused
+            request_redraw()
 
     def move_right(self) -> None:
         r"""Moves the tape to the right if ``self.ended``, else it steps forward once"""
@@ -175,39 +346,34 @@ class TuringMachine:
             self.step(stepping=True)
             self.change_speed(old_speed)
         elif self.ended:
-            if self.tape_position == len(self.tape) - 1:
-                self.tape = self.tape + [" "]
+            if self.journal is not None:
+                self.journal.clear()
+            if self.tape_position == len(self.cells) - 1:
+                self.tape_position = self.cells.grow(self.tape_position)
             self.tape_position += 1
+        request_redraw()
 
     def move_left(self) -> None:
         r"""
-        Moves the tape to the left if ``self.ended``, else it steps back once.
-
-        Since stepping backward in a turing machine will lead to non-deterministic results, this functions runs a new instance
-        of ``TuringMachine`` up to a step before the main one, then sets the main ``TuringMachine`` variables to the other ones.
+        Moves the tape to the left if ``self.ended``, else it steps back once with ``rewind()``.
         """
         if self.silent or self.error:
             return None
         elif self.paused:
-            back_machine = TuringMachine(self.input_tape, self.code, self.breakpoints_list, self.remapped_breakpoints_list, self.raw_code, self.code_map, self.pars_errors, self.global_var)
-            back_machine.silent = True
-            while back_machine.steps < self.steps - 1:
-                back_machine.step()
-            self.state = back_machine.state
-            self.tape_position = back_machine.tape_position
-            self.tape = back_machine.tape
-            self.steps = back_machine.steps
-            self.prec_index = back_machine.prec_index
+            self.rewind(self.steps - 1)
         elif self.ended:
+            if self.journal is not None:
+                self.journal.clear()
             if self.tape_position == 0:
-                self.tape = [" "] + self.tape
-                self.tape_position += 1
+                self.tape_position = self.cells.grow(self.tape_position)
             self.tape_position -= 1
+        request_redraw()
 
     def change_speed(self, value: int) -> None:
         r"""Changes the simulation speed to ``value``"""
         if self.paused:
             self.global_var["speed"] = 10 if value == 0 else value
+            request_redraw()
 
     def terminate(self) -> None:
         r"""Terminates the simulation"""
@@ -218,9 +384,9 @@ class TuringMachine:
         input()
         os._exit(0)
 
-    def restart(self) -> None:
-        r"""Resets all the parameters and restarts the simulation"""
-        if self.paused or self.ended:
+    def restart(self, force: bool = False) -> None:
+        r"""Resets all the parameters and restarts the simulation (only when paused or ended, unless ``force``)"""
+        if self.paused or self.ended or force:
             #time.sleep(0.1)
             self.steps = 0
             self.state = "0"
@@ -228,81 +394,138 @@ class TuringMachine:
             self.tape_position = 0
             self.ended = False
             self.paused = True
+            request_redraw()
+
+    def rewind(self, steps: int) -> None:
+        r"""
+        Takes the machine back to the configuration it had after ``steps`` steps.
+
+        The steps still in the ``journal`` are undone one by one. Otherwise, since stepping backward in a turing machine
+        will lead to non-deterministic results, this function restores the closest checkpoint before ``steps`` (or the
+        initial tape, if there is none) and runs the machine from there.
+        """
+        steps = max(steps, 0)
+        if self.journal is not None:
+            if self.journal.covers(self.steps - steps - (steps == 0)):
+                self.journal.undo(self, self.steps - steps)
+                self.ended = False
+                return None
+            self.journal.clear()
+        if self.checkpoints is None or not self.checkpoints.restore(self, steps):
+            self.steps = 0
+            self.state_id = 0
+            self.cells = self.initial_cells.copy()
+            self.tape_position = self.cells.origin
+            self.prec_index = 0
+        self.ended = False
+        self.run(steps - self.steps, stop_at_breakpoints=False)
+
+    def run(self, max_steps: int | float = float("inf"), stop_at_breakpoints: bool = True,
+            bounds: list[int] | None = None) -> int:
+        r"""
+        Runs the machine without the interface until it halts or ``max_steps`` steps are performed. When the breakpoints
+        are enabled, reaching one pauses the machine and, if ``stop_at_breakpoints``, stops the run. If ``bounds`` is
+        given, the leftmost and the rightmost positions where a tuple was executed are stored in it (see ``_run()``).
+
+        The run is split at each checkpoint to save the snapshots. Returns the number of steps performed.
+        """
+        if self.checkpoints is None:
+            return self._run(max_steps, stop_at_breakpoints, bounds)
+        steps = 0
+        chunk_bounds = [] if bounds is not None else None
+        while steps != max_steps and not self.ended:
+            chunk = min(self.checkpoints.next_step - self.steps, max_steps - steps)
+            done = self._run(chunk, stop_at_breakpoints, chunk_bounds)
+            if bounds is not None:
+                bounds[:] = chunk_bounds if not steps else [min(bounds[0], chunk_bounds[0]), max(bounds[1], chunk_bounds[1])]
+            steps += done
+            self.checkpoints.save(self)
+            if done != chunk:
+                break
+        return steps
+
+    _run = _plain_run
+
+    def _count_step(self, index: int, position: int) -> None:
+        r"""Counts a step done by ``step()`` with the tuple ``index`` on the cell at ``position`` (see ``Profiler``)"""
+
+    def print_profile(self) -> None:
+        r"""Prints the report of the ``profiler``, as a table or as JSON if ``global_var["profile"]`` is ``"json"``"""
+        if self.profiler is not None:
+            report = self.profiler.report(self)
+            print("\n" + (report.to_json() if self.global_var.get("profile") == "json" else report.summary()))
+
+    def _run_instant(self) -> None:
+        r"""
+        Runs the machine for a chunk of steps and reports the progress of the instant mode with ``progress`` (a
+        ``Progress`` created on the first call, with the mode in ``global_var["progress"]``). When ``cycles`` is set (a
+        ``CycleDetector``) the simulation also ends when the machine is found looping.
+        """
+        if self.progress is None:
+            self.progress = Progress(self.global_var.get("progress", "spinner"))
+            self.progress.start(self)
+        chunk_time = time.perf_counter()
+        if self.cycles is not None:
+            steps = self.cycles.run(self, self.progress.chunk, stop_at_breakpoints=False)
+        else:
+            steps = self.run(self.progress.chunk, stop_at_breakpoints=False)
+        self.progress.update(self, steps, time.perf_counter() - chunk_time)
+        if self.ended or self.cycles is not None and self.cycles.looping:
+            self.progress.finish(self, self.cycles)
+            self.print_profile()
+            exit()
 
     def step(self, stepping: bool = False) -> None:
         r"""
         Steps the machine forward once, updating its status and displaying the changes to the interface (if selected).
         ``stepping`` is used when the machine is manually stepped by the user (``move_right``).
+
+        Silent machines step with ``run()`` and in instant mode each call runs a whole chunk of steps with ``_run_instant()``.
         """
         if self.global_var["debug"]:
             exit()
         if self.error:
             self.error.show()
             return None
-        if ((self.paused and not stepping) or self.ended) and not self.global_var["instant"] and not self.silent:
-            if self.steps == 0:
-                status_message = "Press \"space\" to start the simulation"
-            elif self.paused:
-                status_message = "Simulation paused! (Press \"space\" to resume)"
-            else:
-                status_message = f"Simulation ended! (Press \"{'q' if self.global_var['keyboard'] else 'Ctrl+C'}\" to quit)"
+        if self.silent:
+            self.run(1, stop_at_breakpoints=False)
+            return None
+        if self.global_var["instant"]:
+            self._run_instant()
+            return None
+        if (self.paused and not stepping) or self.ended:
             Interface(self.state, self.input_tape, self.steps, self._get_view_code(self.prec_index), self._get_view_tape(),
-                      self.global_var, status_bar=status_message)
+                      self.global_var, status_bar=self._get_status_message())
             return None
         sleep_time = 1 / self.global_var["speed"] - 0.1
-        i = 0
-        if not self.ended:
-            i = self.code_hashmap.get((self.state, self.tape[self.tape_position]))
-            if i is None:
-                self.ended = True
-                return None
-        if self.global_var["instant"] and not self.silent:
-            if self.ended:
-                print("\rSimulation ended!"
-                      f"\n\nSteps: {self.steps}    State: {self.state}    Output: {''.join(self.tape).strip().upper()}")
-                exit()
-            else:
-                if time.time() - self.last_time > 1:
-                    steps_second = (self.steps - self.last_steps) / (time.time() - self.last_time)
-                    self.steps_sec = f"       {steps_second:.0f} steps/s".ljust(40) if steps_second else ""
-                    self.last_time = time.time()
-                    self.last_steps = self.steps
-                threshold = 1_000_000
-                simulating_string = "Simulating... "
-                if self.steps == 0:
-                    print(f"\n{simulating_string + '─' + self.steps_sec}", end='', flush=True)
-                elif self.steps == threshold:
-                    info_string = "This program might be stuck in an infinite loop. To stop the simulation press \"Ctrl + C\""
-                    print(f"\r{info_string}\n{simulating_string + '─' + self.steps_sec}", end='', flush=True)
-                if self.steps % (mod := 4000) == 0:
-                    print_char = ['─', '\\', '|', '/'][(self.steps % (mod * 4)) // mod]
-                    print(f"\r{simulating_string + print_char + self.steps_sec}", end='', flush=True)
+        compiled = self.compiled
+        index = self.state_id * compiled.n_symbols + self.cells.data[self.tape_position]
+        i = compiled.rules[index]
+        if i < 0:
+            self.ended = True
+            return None
         self.steps += 1
-        self.tape[self.tape_position] = self._remapped_char(self.code[i].new_symbol)
-        if self.first_view and not (self.global_var["instant"] or self.global_var["keyboard"]):
+        self._count_step(i, self.tape_position - self.cells.origin)
+        if self.journal is not None:
+            self.journal.entries.append(index)
+        self.cells.data[self.tape_position] = compiled.new_symbols[index]
+        if self.first_view and not self.global_var["keyboard"]:
             Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var)
             time.sleep(2)
             self.first_view = False
-        if not self.global_var["instant"] and not self.silent:
-            Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var, writing=True)
-            time.sleep(sleep_time)
-        self.state = self.code[i].new_state
-        if not self.global_var["instant"] and not self.silent:
-            Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var)
-            time.sleep(sleep_time)
+        Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var, writing=True)
+        time.sleep(sleep_time)
+        self.state_id = compiled.new_states[index]
+        Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var)
+        time.sleep(sleep_time)
         self.prec_index = i
-        if self.tape_position == 0:
-            self.tape = [" "] + self.tape
-            self.tape_position += 1
-        if self.tape_position == len(self.tape) - 1:
-            self.tape = self.tape + [" "]
-        if self.code[i].movement == ">":
-            self.tape_position += 1
-        elif self.code[i].movement == "<":
-            self.tape_position -= 1
-        if not self.global_var["instant"] and not self.silent:
-            Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var)
-            time.sleep(sleep_time)
+        if self.tape_position == 0 or self.tape_position == len(self.cells.data) - 1:
+            self.tape_position = self.cells.grow(self.tape_position)
+        self.tape_position += compiled.movements[index]
+        Interface(self.state, self.input_tape, self.steps, self._get_view_code(i), self._get_view_tape(), self.global_var)
+        time.sleep(sleep_time)
         if self.remapped_breakpoints_list[i] and self.global_var["breakpoints"] and not self.paused:
             self.paused = True
+        if self.checkpoints is not None:
+            self.checkpoints.save(self)
         return None
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+try:
+    from .engine import CompiledCode
+except ImportError:
+    from engine import CompiledCode
+
+_stuck = ()
+
+class MacroMachine:
+
+    def __init__(self, block: int, cache_size: int = 100_000, max_inner_steps: int = 10_000) -> None:
+        r"""
+        Creates a new instance of ``MacroMachine``, that simulates a machine treating each block of ``block`` cells of
+        the tape as a single macro-symbol.
+
+        A macro-transition takes the state, the content of the block and the position of the head inside it and
+        returns the state, the block and the position of the head when the head leaves the block (or the machine
+        halts), along with the number of steps performed, so step counts stay exact. Macro-transitions are computed on
+        demand from the compiled tuples and kept in a LRU cache of ``cache_size`` entries. A block where the machine
+        runs for more than ``max_inner_steps`` steps without leaving it is simulated normally.
+        """
+
+        if block < 1 or cache_size < 1:
+            raise ValueError("The block size and the cache size need to be positive")
+        self.block = block
+        self.cache_size = cache_size
+        self.max_inner_steps = max_inner_steps
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self) -> dict:
+        r"""Returns the statistics of the macro-transition cache"""
+        return {"block": self.block, "hits": self.hits, "misses": self.misses, "maxsize": self.cache_size,
+                "currsize": len(self.cache)}
+
+    def _compute(self, compiled: CompiledCode, state: int, cells: bytes, offset: int) -> tuple:
+        r"""
+        Simulates the machine inside a block, starting from ``state`` with the head on ``offset``.
+
+        Returns a tuple with the new state, the new block, the position of the head (-1 or ``self.block`` if it left
+        the block), the number of steps, the index of the last tuple used (-1 if none), whether the machine halted and
+        whether a breakpoint tuple was used, or ``_stuck`` if the machine didn't leave the block in time.
+        """
+        rules, new_states, new_symbols, movements = compiled.rules, compiled.new_states, compiled.new_symbols, compiled.movements
+        n_symbols = compiled.n_symbols
+        breakpoints = compiled.breakpoints
+        block = bytearray(cells)
+        size = self.block
+        steps = 0
+        rule = -1
+        halted = False
+        has_breakpoint = False
+        while 0 <= offset < size:
+            if steps == self.max_inner_steps:
+                return _stuck
+            index = state * n_symbols + block[offset]
+            i = rules[index]
+            if i < 0:
+                halted = True
+                break
+            has_breakpoint = has_breakpoint or breakpoints[i]
+            block[offset] = new_symbols[index]
+            state = new_states[index]
+            offset += movements[index]
+            steps += 1
+            rule = i
+        return state, bytes(block), offset, steps, rule, halted, has_breakpoint
+
+    def _add(self, compiled: CompiledCode, key: tuple) -> tuple:
+        r"""Computes with ``_compute()`` the macro-transition of ``key``, missing from the cache, and adds it"""
+        self.misses += 1
+        result = self._compute(compiled, *key)
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def run(self, machine, max_steps: int | float = float("inf"), stop_at_breakpoints: bool = True) -> int:
+        r"""
+        Runs ``machine`` (a ``machine.TuringMachine``) like its ``run()`` method does, but one macro-transition at a
+        time. When a macro-transition can't be used as a whole (it would go past ``max_steps``, it uses a breakpoint
+        tuple while the breakpoints are enabled or the machine is stuck in the block) the machine steps normally. The
+        macro-transitions are not recorded in the journal of the machine, so it's cleared after each one.
+
+        Returns the number of steps performed.
+        """
+        if machine.ended:
+            return 0
+        tape = machine.cells
+        if tape.wide:
+            return machine.run(max_steps, stop_at_breakpoints)
+        compiled = machine.compiled
+        size = self.block
+        cache = self.cache
+        data = tape.data
+        check_breakpoints = machine.global_var["breakpoints"] and not machine.paused
+        limit = max_steps if max_steps != float("inf") else -1
+        steps = 0
+        while steps != limit and not machine.ended:
+            position = machine.tape_position
+            start = position - (position - tape.origin) % size
+            if start < 0 or start + size > len(data):
+                shift = tape.reserve(start, start + size)
+                start += shift
+                position += shift
+            key = (machine.state_id, bytes(data[start:start + size]), position - start)
+            result = cache.get(key)
+            if result is not None:
+                self.hits += 1
+                cache.move_to_end(key)
+            else:
+                result = self._add(compiled, key)
+            if result is _stuck or (limit >= 0 and result[3] > limit - steps) or (check_breakpoints and result[6]):
+                budget = result[3] if result is not _stuck else self.max_inner_steps
+                budget = min(budget, limit - steps) if limit >= 0 else budget
+                machine.tape_position = position
+                steps += machine.run(budget, stop_at_breakpoints)
+                if check_breakpoints and machine.paused:
+                    check_breakpoints = False
+                    if stop_at_breakpoints:
+                        break
+                continue
+            state, cells, offset, count, rule, halted, _ = result
+            data[start:start + size] = cells
+            machine.state_id = state
+            machine.tape_position = start + offset
+            machine.steps += count
+            if rule >= 0:
+                machine.prec_index = rule
+            machine.ended = halted
+            steps += count
+            if machine.checkpoints is not None:
+                machine.checkpoints.save(machine)
+            if machine.journal is not None:
+                machine.journal.clear()
+        machine.tape_position += tape.reserve(machine.tape_position, machine.tape_position + 1)
+        return steps
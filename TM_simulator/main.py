@@ -1,13 +1,30 @@
 import os
+import sys
 import argparse
 try:
-    from .tuples import TuringTuple
-    from .machine import TuringMachine
+    from .machine import TuringMachine, _get_error_message
+    from .analysis import analyze
+    from .history import Journal
+    from .cache import ParseCache
+    from .program import Program, parse, compile_program
+    from .player import Player
+    from .interface import wait_redraw
+    from .profiler import Profiler
+    from .cycles import CycleDetector
+    from .bench import bench_suite, run_bench, save_bench, load_bench, compare_bench, format_result, format_regression
 except ImportError:
-    from tuples import TuringTuple
-    from machine import TuringMachine
+    from machine import TuringMachine, _get_error_message
+    from analysis import analyze
+    from history import Journal
+    from cache import ParseCache
+    from program import Program, parse, compile_program
+    from player import Player
+    from interface import wait_redraw
+    from profiler import Profiler
+    from cycles import CycleDetector
+    from bench import bench_suite, run_bench, save_bench, load_bench, compare_bench, format_result, format_regression
 
-def setup_cli():
+def setup_cli(has_program: bool = False):
     global_var = {"speed": 0,
                   "tape_size": 0,
                   "code_size": 0,
@@ -15,24 +32,56 @@ def setup_cli():
                   "pars_errors": [],
                   "instant": False,
                   "breakpoints": False,
-                  "debug": False}
+                  "debug": False,
+                  "cache": True,
+                  "check": False,
+                  "symbolic": False,
+                  "parse_workers": 1,
+                  "rate": None,
+                  "progress": "spinner",
+                  "profile": None,
+                  "detect_cycles": False,
+                  "sparse_tape": False}
 
     arg_parser = argparse.ArgumentParser(add_help=False)
     arg_parser.add_argument('--help', '-h', '-?', action='help', help=argparse.SUPPRESS)
     arg_parser.add_argument('--debug', action='store_true', help=argparse.SUPPRESS)
-    arg_parser.add_argument("filename", type=str, help="Name of the file with the tuples")
-    arg_parser.add_argument("input", type=str, help="The initial tape of the machine", default=" ")
+    arg_parser.add_argument("filename", type=str, nargs="?", help="Name of the file with the tuples, or - to read them from the standard input")
+    arg_parser.add_argument("input", type=str, nargs="?", help="The initial tape of the machine", default=" ")
     arg_parser.add_argument("--speed", "-s", dest="speed", metavar="<int>", type=int, help="set the step speed of the simulation, in a range from 1 to 10", default=9)
+    arg_parser.add_argument("--rate", "-r", dest="rate", metavar="<int>", type=int, help="run the machine apart from the interface at the given steps per second (0 for the highest speed)", default=None)
     arg_parser.add_argument("--breakpoints", "-b", dest="breakpoints", help="enable the breakpoints, pausing the simulation when one is encountered", action="store_true")
     arg_parser.add_argument("--instant", "-i", dest="instant", help="return the final tape when the machine stops, without the interface", action="store_true")
+    arg_parser.add_argument("--progress", dest="progress", choices=["spinner", "json"], help="report the progress of the instant mode with a spinner or with JSON lines on the standard error", default="spinner")
+    arg_parser.add_argument("--profile", dest="profile", nargs="?", const="table", choices=["table", "json"], help="count the steps done by each line, state and tape cell, printing them as a table or as JSON when the simulation ends", default=None)
+    arg_parser.add_argument("--detect-cycles", dest="detect_cycles", help="stop the instant mode when the machine is found stuck in a loop, even one that moves along the tape", action="store_true")
+    arg_parser.add_argument("--sparse", dest="sparse", help="store only the chunks of the tape that are not blank, for machines that touch cells far apart from each other", action="store_true")
     arg_parser.add_argument("--auto", "-a", dest="auto", help="finds the best interface options based on the terminal size", action="store_true")
     arg_parser.add_argument("--keyboard", "-k", dest="keyboard", help="enables keyboard to control the simulation (still buggy)", action="store_true")
     arg_parser.add_argument("--slim", dest="slim", help="make the cells in the tape smaller, useful when the terminal window is small", action="store_true")
     arg_parser.add_argument("--csize", dest="csize", metavar="<int>", type=int, help="set the size of the left code panel, measured in characters", default=None)
     arg_parser.add_argument("--tsize", dest="tsize", metavar="<int>", type=int, help="set the number of cells visible on the tape", default=None)
-    arg_parser.usage = ("tm-simulator [filename <path>] [input <string>] [-s | --speed <int>] [-b | --breakpoints] [-i | --instant] [-a | --auto] [-k | --keyboard] [--slim] [--csize <int>] [--tsize <int>] \n"
+    arg_parser.add_argument("--no-cache", dest="no_cache", help="parse the tuples again without using the cache of the parsed programs", action="store_true")
+    arg_parser.add_argument("--symbolic", dest="symbolic", help="keep the tuples that only differ in the symbol they read as a single rule, to load large programs faster", action="store_true")
+    arg_parser.add_argument("--parse-workers", dest="parse_workers", metavar="<int>", type=int, help="expand the lines of large programs on the given number of processes (0 to use all the CPUs)", default=1)
+    arg_parser.add_argument("--check", dest="check", help="analyse the program without running it, printing the non-deterministic rules, the unreachable and halting states and the alphabet", action="store_true")
+    arg_parser.add_argument("--clear-cache", dest="clear_cache", help="delete the cache of the parsed programs and exit", action="store_true")
+    arg_parser.usage = ("tm-simulator [filename <path>] [input <string>] [-s | --speed <int>] [-r | --rate <int>] [-b | --breakpoints] [-i | --instant] [--progress spinner|json] [--profile [table|json]] [--detect-cycles] [--sparse] [-a | --auto] [-k | --keyboard] [--slim] [--csize <int>] [--tsize <int>] [--no-cache] [--symbolic] [--parse-workers <int>] \n"
+                        "usage: tm-simulator [filename <path>] --check \n"
+                        "usage: tm-simulator [--clear-cache] \n"
+                        "usage: tm-simulator bench [-h | --help] [options] \n"
                         "usage: tm-simulator [-h | --help] ")
     args = arg_parser.parse_args()
+    if args.clear_cache:
+        ParseCache().clear()
+        print("The cache of the parsed programs was cleared")
+        exit()
+    if has_program:
+        # the program is already compiled, so the only positional argument is the input
+        args.filename, args.input = None, args.filename
+    elif args.filename is None:
+        print("The filename of the program needs to be specified")
+        exit()
     global_var["debug"] = args.debug
     global_var["speed"] = args.speed
     global_var["tape_size"] = args.tsize
@@ -41,6 +90,15 @@ def setup_cli():
     global_var["breakpoints"] = args.breakpoints
     global_var["instant"] = args.instant
     global_var["keyboard"] = args.keyboard
+    global_var["cache"] = not args.no_cache
+    global_var["check"] = args.check
+    global_var["symbolic"] = args.symbolic
+    global_var["parse_workers"] = args.parse_workers if args.parse_workers != 0 else None
+    global_var["rate"] = args.rate
+    global_var["progress"] = args.progress
+    global_var["profile"] = args.profile
+    global_var["detect_cycles"] = args.detect_cycles
+    global_var["sparse_tape"] = args.sparse
     auto = args.auto
     filename = args.filename
     input_tape = args.input.upper() if args.input else " "
@@ -48,13 +106,19 @@ def setup_cli():
     if global_var["speed"] < 1 or global_var["speed"] > 10:
         print("The simulation speed is not within the range")
         exit()
-    if not (auto or (global_var["code_size"] or global_var["tape_size"]) or global_var["instant"]):
+    if not (auto or (global_var["code_size"] or global_var["tape_size"]) or global_var["instant"] or global_var["check"]):
         print("Either auto mode or the specific sizes needs to be specified")
         exit()
+    if global_var["rate"] is not None and global_var["rate"] < 0:
+        print("The simulation rate can't be negative")
+        exit()
+    if args.parse_workers < 0:
+        print("The number of parsing processes can't be negative")
+        exit()
     if global_var["keyboard"] and global_var["instant"]:
         print("You cannot use both keyboard mode and instant mode at the same time")
         exit()
-    if not global_var["instant"] and not global_var["debug"]:
+    if not global_var["instant"] and not global_var["debug"] and not global_var["check"]:
         try:
             length, height = tuple(os.get_terminal_size())
         except OSError:
@@ -86,49 +150,91 @@ def setup_cli():
     return global_var, filename, input_tape
 
 
-def parse(input_string: str, is_file: bool = True):
-    if is_file:
-        try:
-            with open(input_string) as file:
-                raw_tuples = [x.removesuffix('\n') for x in file]
-        except (FileNotFoundError, OSError) as e:
-            print("The file with the program was not found")
-            exit()
-    else:
-        raw_tuples = input_string.split("\n")
-
-    code_tuples = []
-    code_map = []
-    breakpoint_list = []
-    remapped_breakpoint_list = []
-    pars_errors = []
-    for i, raw_tuple in enumerate(raw_tuples):
-        parsed_tuples = TuringTuple(raw_tuple, i, True)
-        pars_errors.extend(parsed_tuples.pars_errors) if parsed_tuples.pars_errors else None
-        parsed_tuples = [x for x in parsed_tuples.expanded_tuple if x != ""]
-        code_tuples.extend([TuringTuple(x, i, False) for x in parsed_tuples])
-        code_map.extend([i for _ in parsed_tuples])
-        breakpoint_list.append(TuringTuple(raw_tuple, i, True).has_breakpoint())
-        remapped_breakpoint_list.extend([breakpoint_list[-1]] * len(parsed_tuples))
-
-    return code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors
+def bench_cli(argv: list[str]):
+    arg_parser = argparse.ArgumentParser(prog="tm-simulator bench", description="Runs the benchmark suite of the simulator")
+    arg_parser.add_argument("--output", "-o", dest="output", metavar="<path>", type=str, help="write the results to a JSON file", default=None)
+    arg_parser.add_argument("--compare", dest="compare", metavar="<path>", type=str, nargs="+", help="compare the results with the ones in a JSON file (or two JSON files between them, without running the suite), exiting with 1 if there are regressions", default=None)
+    arg_parser.add_argument("--threshold", dest="threshold", metavar="<float>", type=float, help="the fraction a measure needs to get worse by to be a regression, default is 0.1", default=0.1)
+    arg_parser.add_argument("--repeats", dest="repeats", metavar="<int>", type=int, help="the number of measured runs of each case, default is 3", default=3)
+    arg_parser.add_argument("--warmup", dest="warmup", metavar="<int>", type=int, help="the number of runs of each case before measuring it, default is 1", default=1)
+    arg_parser.add_argument("--cases", dest="cases", metavar="<names>", type=str, help="run only the cases with these names, separated by commas", default=None)
+    args = arg_parser.parse_args(argv)
+    if args.compare is not None and len(args.compare) > 2:
+        print("Only two files of results can be compared")
+        exit()
+    if args.repeats < 1 or args.warmup < 0:
+        print("The number of repeats needs to be positive and the number of warmup runs can't be negative")
+        exit()
+    try:
+        old_results = load_bench(args.compare[0]) if args.compare is not None else None
+        results = load_bench(args.compare[1]) if args.compare is not None and len(args.compare) == 2 else None
+    except (OSError, ValueError, KeyError, TypeError):
+        print("The results to compare can't be read")
+        exit()
+    if results is None:
+        cases = bench_suite()
+        if args.cases is not None:
+            names = args.cases.split(",")
+            unknown = [name for name in names if name not in [case.name for case in cases]]
+            if unknown:
+                print(f"Unknown benchmark cases: {', '.join(unknown)} (the cases are: {', '.join(case.name for case in cases)})")
+                exit()
+            cases = [case for case in cases if case.name in names]
+        results = run_bench(cases, args.repeats, args.warmup, report=lambda result: print(format_result(result)))
+        if args.output is not None:
+            save_bench(results, args.output)
+    if old_results is not None:
+        regressions = compare_bench(old_results, results, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}:")
+            [print(format_regression(regression)) for regression in regressions]
+            exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%}")
 
-def main():
-    global_var, filename, input_tape = setup_cli()
-    code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors = parse(filename)
-    turing_machine = TuringMachine(input_tape, code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples,
-                                   code_map, pars_errors, global_var)
+def main(program: Program = None):
+    if program is None and sys.argv[1:2] == ["bench"]:
+        bench_cli(sys.argv[2:])
+        exit()
+    global_var, filename, input_tape = setup_cli(program is not None)
+    if program is None:
+        program = compile_program(filename, cache=ParseCache() if global_var["cache"] else None,
+                                  symbolic=global_var["symbolic"] and not global_var["check"],
+                                  workers=global_var["parse_workers"],
+                                  keep_lines=not (global_var["instant"] or global_var["check"]) or global_var["profile"] is not None)
+    if global_var["check"]:
+        pars_errors = [error for error in program.errors if error[1] != 'non_deterministic']
+        if pars_errors:
+            [print(_get_error_message([error], program.code_map, True, False)) for error in pars_errors]
+        else:
+            print(analyze(list(program.tuples), list(program.code_map)).summary())
+        exit()
+    turing_machine = TuringMachine.from_program(program, input_tape, global_var)
+    if not global_var["instant"]:
+        turing_machine.journal = Journal()
+    if global_var["profile"] is not None:
+        Profiler().attach(turing_machine)
+    if global_var["detect_cycles"]:
+        turing_machine.cycles = CycleDetector()
+    player = None
+    if global_var["rate"] is not None and not (global_var["instant"] or global_var["debug"] or turing_machine.error):
+        player = Player(turing_machine, global_var["rate"] or None)
     if not global_var["instant"] and global_var["keyboard"]:
         import keyboard
+        controls = player if player is not None else turing_machine
         keyboard.on_press_key("q", lambda _: turing_machine.terminate()) if not global_var["instant"] else None
-        keyboard.on_press_key("space", lambda _: turing_machine.pause())
-        keyboard.on_press_key("right", lambda _: turing_machine.move_right())
-        keyboard.on_press_key("left", lambda _: turing_machine.move_left())
-        [keyboard.on_press_key(x + 1, lambda _, y=x: turing_machine.change_speed(y)) for x in range(11)[1:]]
-        keyboard.on_press_key("r", lambda _: turing_machine.restart())
+        keyboard.on_press_key("space", lambda _: controls.pause())
+        keyboard.on_press_key("right", lambda _: controls.move_right())
+        keyboard.on_press_key("left", lambda _: controls.move_left())
+        if player is None:
+            [keyboard.on_press_key(x + 1, lambda _, y=x: turing_machine.change_speed(y)) for x in range(11)[1:]]
+        keyboard.on_press_key("r", lambda _: controls.restart())
     try:
+        if player is not None:
+            player.play()
         while True:
             turing_machine.step()
+            if not global_var["instant"] and (turing_machine.paused or turing_machine.ended or turing_machine.error):
+                wait_redraw()
     except KeyboardInterrupt:
         if not global_var["instant"]:
             os.system("cls") if os.name == "nt" else os.system("clear")
@@ -137,6 +243,7 @@ def main():
         if turing_machine.ended:
             print("\rSimulation ended!"
                  f"\n\nSteps: {turing_machine.steps}    State: {turing_machine.state}    Output: {''.join(turing_machine.tape).strip().upper()}")
+        turing_machine.print_profile()
         exit()
 
 if __name__ == "__main__":
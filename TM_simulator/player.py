@@ -0,0 +1,109 @@
+import time
+import threading
+try:
+    from .machine import TuringMachine
+    from .interface import Interface, request_redraw, wait_redraw
+except ImportError:
+    from machine import TuringMachine
+    from interface import Interface, request_redraw, wait_redraw
+
+class Player:
+
+    def __init__(self, machine: TuringMachine, rate: int | None = None, fps: int = 30) -> None:
+        r"""
+        Creates a new instance of ``Player``, that runs ``machine`` in a worker thread while the interface is drawn on
+        the calling thread.
+
+        The machine runs at ``rate`` steps per second, or as fast as it can if ``rate`` is None, in chunks of steps done
+        with ``machine.run()``: the size of the chunks adapts so that each one takes a few milliseconds. The interface
+        draws a snapshot of the machine ``fps`` times per second, taken between two chunks, so it's always consistent.
+
+        Since ``run()`` stops exactly on the step of a breakpoint, the breakpoints pause the machine like in the normal
+        mode. The controls (``pause()``, ``move_right()``, ``move_left()`` and ``restart()``) change the machine between
+        two chunks, so a pause takes effect after the last step of the current chunk and the interface shows that step.
+        """
+
+        self.machine = machine
+        self.rate = rate
+        self.fps = fps
+        self.condition = threading.Condition()
+        self.chunk = 1
+
+    def _work(self) -> None:
+        r"""Runs the machine while it's not paused or ended, pacing it to ``rate``"""
+        machine = self.machine
+        start_time, start_steps = time.perf_counter(), machine.steps
+        while True:
+            with self.condition:
+                if machine.paused or machine.ended:
+                    while machine.paused or machine.ended:
+                        self.condition.wait()
+                    start_time, start_steps = time.perf_counter(), machine.steps
+                limit = self.chunk
+                if self.rate is not None:
+                    limit = min(limit, int((time.perf_counter() - start_time) * self.rate) - machine.steps + start_steps)
+                if limit > 0:
+                    chunk_time = time.perf_counter()
+                    done = machine.run(limit)
+                    chunk_time = time.perf_counter() - chunk_time
+                    if chunk_time < 0.002 and done == limit == self.chunk:
+                        self.chunk *= 2
+                    elif chunk_time > 0.008:
+                        self.chunk = max(self.chunk // 2, 1)
+            if limit > 0:
+                time.sleep(0)  # lets the interface take the lock between two chunks
+            else:
+                time.sleep(max(min((machine.steps - start_steps + 1) / self.rate + start_time - time.perf_counter(),
+                                   1 / self.fps), 0))
+
+    def _snapshot(self) -> tuple:
+        r"""Returns the values of the machine shown by the interface, all taken at the same step"""
+        machine = self.machine
+        with self.condition:
+            return (machine.state, machine.steps, machine._get_view_code(machine.prec_index), machine._get_view_tape(),
+                    machine._get_status_message())
+
+    def play(self) -> None:
+        r"""
+        Starts the worker thread and draws the interface forever (until the process is stopped). While the machine is
+        paused or ended, the interface is drawn again only after a control or a resize of the terminal.
+        """
+        machine = self.machine
+        if not machine.global_var["keyboard"] and not machine.paused:
+            state, steps, view_code, view_tape, status_message = self._snapshot()
+            Interface(state, machine.input_tape, steps, view_code, view_tape, machine.global_var, status_bar=status_message)
+            time.sleep(2)
+        threading.Thread(target=self._work, daemon=True).start()
+        next_frame = time.perf_counter()
+        while True:
+            state, steps, view_code, view_tape, status_message = self._snapshot()
+            Interface(state, machine.input_tape, steps, view_code, view_tape, machine.global_var, status_bar=status_message)
+            if status_message is not None:
+                wait_redraw()
+            next_frame = max(next_frame + 1 / self.fps, time.perf_counter())
+            time.sleep(max(next_frame - time.perf_counter(), 0))
+
+    def pause(self) -> None:
+        r"""Pauses or resumes the machine"""
+        with self.condition:
+            self.machine.pause()
+            self.condition.notify()
+
+    def move_right(self) -> None:
+        r"""Steps the paused machine forward once, or moves the tape to the right if it ended"""
+        with self.condition:
+            if self.machine.paused and not self.machine.error:
+                self.machine.run(1, stop_at_breakpoints=False)
+                request_redraw()
+            else:
+                self.machine.move_right()
+
+    def move_left(self) -> None:
+        r"""Steps the paused machine back once, or moves the tape to the left if it ended"""
+        with self.condition:
+            self.machine.move_left()
+
+    def restart(self) -> None:
+        r"""Restarts the paused or ended machine"""
+        with self.condition:
+            self.machine.restart()
@@ -0,0 +1,128 @@
+import json
+from types import MethodType
+from typing import NamedTuple
+try:
+    from .machine import _profiled_run
+except ImportError:
+    from machine import _profiled_run
+
+class ProfileReport(NamedTuple):
+    r"""
+    The counters collected by a ``Profiler`` while a machine was running. The fields are:
+     - ``steps``: the number of profiled steps
+     - ``lines``: the lines of the program that were executed, as ``(line, hits, text)`` with the number of the line
+       (from 1), the steps done by its tuples and its text (empty if the lines of the program were not kept), from the
+       one with the most hits
+     - ``rules``: the expanded tuples that were executed, as ``(rule, line, hits)``, from the one with the most hits
+     - ``states``: the steps done in each state, as ``(state, steps)``, from the state with the most steps
+     - ``min_position`` and ``max_position``: the leftmost and the rightmost positions of the head when it executed a
+       tuple, where 0 is the first cell of the input tape (None if no step was profiled)
+     - ``cells``: the number of tuples executed on each cell, as ``(position, visits)``, from the leftmost cell
+    """
+    steps: int
+    lines: tuple[tuple[int, int, str], ...]
+    rules: tuple[tuple[str, int, int], ...]
+    states: tuple[tuple[str, int], ...]
+    min_position: int | None
+    max_position: int | None
+    cells: tuple[tuple[int, int], ...]
+
+    def summary(self, top: int = 10) -> str:
+        r"""Returns a printable version of the report, with the ``top`` lines and states and a histogram of the cells"""
+        lines = [f"Steps: {self.steps}    Lines: {len(self.lines)}    Rules: {len(self.rules)}    "
+                 f"States: {len(self.states)}    Head positions: {self.min_position} to {self.max_position}",
+                 "Hottest lines:"]
+        lines.extend(f" {hits:>12}  {hits / self.steps:>6.1%}  line {line:<6} {text.strip()}"
+                     for line, hits, text in self.lines[:top])
+        lines.append("Steps per state:")
+        lines.extend(f" {steps:>12}  {steps / self.steps:>6.1%}  {state}" for state, steps in self.states[:top])
+        if self.cells:
+            lines.append("Visits per tape cell:")
+            width = -(-(self.max_position - self.min_position + 1) // top)
+            bins = {}
+            for position, visits in self.cells:
+                start = self.min_position + (position - self.min_position) // width * width
+                bins[start] = bins.get(start, 0) + visits
+            most = max(bins.values())
+            lines.extend(f" {f'{start} to {start + width - 1}':>20}  {visits:>12}  {'#' * round(visits / most * 40)}"
+                         for start, visits in bins.items())
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        r"""Returns the report as a JSON object"""
+        return json.dumps({"steps": self.steps,
+                           "lines": [{"line": line, "hits": hits, "text": text} for line, hits, text in self.lines],
+                           "rules": [{"rule": rule, "line": line, "hits": hits} for rule, line, hits in self.rules],
+                           "states": {state: steps for state, steps in self.states},
+                           "min_position": self.min_position, "max_position": self.max_position,
+                           "cells": {str(position): visits for position, visits in self.cells}})
+
+def _rule_text(rule) -> str:
+    r"""Returns the text of an expanded tuple, or of a ``symbolic.SymbolicRule`` written with the class notation"""
+    if hasattr(rule, "string_tuple"):
+        return f"({rule.string_tuple})"
+    symbols = f"[{''.join(rule.current_symbols)}]"
+    return f"({rule.current_state},{symbols},{rule.new_state},{symbols if rule.new_symbol is None else rule.new_symbol}," \
+           f"{rule.movement})"
+
+class Profiler:
+
+    def __init__(self) -> None:
+        r"""
+        Creates a new instance of ``Profiler``, that counts the steps done by each tuple of a machine and the tuples
+        executed on each cell of the tape.
+
+        A machine is profiled only after ``attach()``, that replaces its loop with ``_profiled_run`` (the variant of
+        ``TuringMachine._run()`` that counts each step in ``rule_hits`` and ``visits``, without grouping the sweeps), so
+        a machine without a profiler runs the same code as before. The steps that are run again to step back the machine
+        are counted again, as they are part of the work done by the machine.
+        """
+
+        self.rule_hits = []
+        self.visits = {}
+
+    def clear(self) -> None:
+        r"""Resets all the counters"""
+        self.rule_hits = [0] * len(self.rule_hits)
+        self.visits = {}
+
+    def attach(self, machine) -> None:
+        r"""Profiles ``machine`` (a ``machine.TuringMachine``) from now on"""
+        if len(self.rule_hits) != len(machine.code):
+            self.rule_hits = [0] * len(machine.code)
+        machine.profiler = self
+        machine._run = MethodType(_profiled_run, machine)
+        machine._count_step = self.count_step
+
+    @staticmethod
+    def detach(machine) -> None:
+        r"""Stops profiling ``machine``, restoring its normal loop"""
+        machine.profiler = None
+        machine.__dict__.pop("_run", None)
+        machine.__dict__.pop("_count_step", None)
+
+    def count_step(self, index: int, position: int) -> None:
+        r"""Counts a step done with the tuple ``index`` on the cell at ``position`` (used by ``TuringMachine.step()``)"""
+        self.rule_hits[index] += 1
+        self.visits[position] = self.visits.get(position, 0) + 1
+
+    def report(self, machine) -> ProfileReport:
+        r"""Returns a ``ProfileReport`` with the counters, rolled up to the lines and the states of ``machine``"""
+        code = machine.code
+        code_map = machine.code_map if len(machine.code_map) == len(code) else [getattr(x, "index", 0) for x in code]
+        raw_code = machine.raw_code
+        lines, states = {}, {}
+        rules = []
+        for i, hits in enumerate(self.rule_hits):
+            if hits:
+                line = code_map[i]
+                lines[line] = lines.get(line, 0) + hits
+                states[code[i].current_state] = states.get(code[i].current_state, 0) + hits
+                rules.append((_rule_text(code[i]), line + 1, hits))
+        return ProfileReport(sum(self.rule_hits),
+                             tuple(sorted(((line + 1, hits, raw_code[line] if line < len(raw_code) else "")
+                                           for line, hits in lines.items()), key=lambda x: -x[1])),
+                             tuple(sorted(rules, key=lambda x: -x[2])),
+                             tuple(sorted(states.items(), key=lambda x: -x[1])),
+                             min(self.visits) if self.visits else None, max(self.visits) if self.visits else None,
+                             tuple(sorted(self.visits.items())))
@@ -0,0 +1,205 @@
+import os
+import sys
+import marshal
+from itertools import chain, islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, NamedTuple
+try:
+    from .tuples import TuringTuple
+    from .engine import CompiledCode
+    from .machine import _check_determinism
+    from .cache import ParseCache, _tuple_fields, _restore_tuple
+    from .symbolic import SymbolicRule, SymbolicCode, parse_symbolic
+except ImportError:
+    from tuples import TuringTuple
+    from engine import CompiledCode
+    from machine import _check_determinism
+    from cache import ParseCache, _tuple_fields, _restore_tuple
+    from symbolic import SymbolicRule, SymbolicCode, parse_symbolic
+
+_min_chunk_lines = 2000
+
+class Program(NamedTuple):
+    r"""
+    A parsed program, ready to be loaded in any number of machines. The fields are:
+     - ``tuples``: the expanded tuples (or the ``SymbolicRule`` of a symbolic program)
+     - ``breakpoints``: whether each line of the program has a breakpoint
+     - ``tuple_breakpoints``: whether each expanded tuple has a breakpoint
+     - ``raw_lines``: the lines of the program (empty if they were not kept)
+     - ``code_map``: the index of the line of each expanded tuple
+     - ``errors``: the parsing errors, non-deterministic tuples included
+     - ``compiled``: the ``CompiledCode`` transition table of the tuples
+    """
+    tuples: tuple[TuringTuple | SymbolicRule, ...]
+    breakpoints: tuple[bool, ...]
+    tuple_breakpoints: tuple[bool, ...]
+    raw_lines: tuple[str, ...]
+    code_map: tuple[int, ...]
+    errors: tuple
+    compiled: CompiledCode
+
+def _split_lines(input_string: str) -> Iterator[str]:
+    r"""Yields the lines of ``input_string`` one at a time, like the elements of ``input_string.split("\n")``"""
+    start = 0
+    while (end := input_string.find("\n", start)) >= 0:
+        yield input_string[start:end]
+        start = end + 1
+    yield input_string[start:]
+
+def _file_lines(file) -> Iterator[str]:
+    r"""Yields the lines of ``file`` as they are read, closing it at the end"""
+    with file:
+        for line in file:
+            yield line.removesuffix('\n')
+
+def _read_lines(input_string: str | Iterable[str], is_file: bool) -> Iterator[str]:
+    r"""
+    Returns an iterator on the lines of the program in the file named ``input_string`` (or in the standard input if
+    it's ``-``), in ``input_string`` itself if not ``is_file`` or, if ``input_string`` is not a string, in the lines it
+    yields
+    """
+    if not isinstance(input_string, str):
+        return (x.removesuffix('\n') for x in input_string)
+    if not is_file:
+        return _split_lines(input_string)
+    if input_string == "-":
+        return _file_lines(sys.stdin)
+    try:
+        return _file_lines(open(input_string))
+    except (FileNotFoundError, OSError) as e:
+        print("The file with the program was not found")
+        exit()
+
+def _is_stream(input_string: str | Iterable[str], is_file: bool) -> bool:
+    r"""Returns whether the lines of ``input_string`` can only be read once, as they arrive"""
+    return not isinstance(input_string, str) or is_file and input_string == "-"
+
+def _kept_lines(lines: Iterable[str], raw_tuples: list[str]) -> Iterator[str]:
+    r"""Yields the ``lines``, adding each of them to ``raw_tuples`` too"""
+    for line in lines:
+        raw_tuples.append(line)
+        yield line
+
+def _expand_lines(raw_tuples: list[str], start: int = 0) -> tuple[list, list, list, list, list]:
+    r"""
+    Expands the lines in ``raw_tuples``, the first of which is the line ``start`` of the program, returning the tuples,
+    the breakpoints of each line, the breakpoints of each tuple, the map from the tuples to the lines and the errors
+    """
+    code_tuples = []
+    code_map = []
+    breakpoint_list = []
+    remapped_breakpoint_list = []
+    pars_errors = []
+    for i, raw_tuple in enumerate(raw_tuples, start):
+        raw = TuringTuple(raw_tuple, i, True)
+        pars_errors.extend(raw.pars_errors) if raw.pars_errors else None
+        parsed_tuples = [x for x in raw.expanded_tuple if x != ""]
+        code_tuples.extend([TuringTuple(x, i, False) for x in parsed_tuples])
+        code_map.extend([i for _ in parsed_tuples])
+        breakpoint_list.append(raw.has_breakpoint())
+        remapped_breakpoint_list.extend([breakpoint_list[-1]] * len(parsed_tuples))
+    return code_tuples, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors
+
+def _expand_chunk(args: tuple[int, list[str]]) -> bytes:
+    r"""
+    Expands a chunk of lines in a worker process like ``_expand_lines()``, returning the result as a ``marshal`` dump
+    where the tuples are the values of their fields, which is much faster to send back than pickled ``TuringTuple``
+    """
+    code_tuples, *others = _expand_lines(args[1], args[0])
+    return marshal.dumps(([tuple(getattr(x, field) for field in _tuple_fields) for x in code_tuples], *others))
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[tuple[int, list[str]]]:
+    r"""Yields the ``lines`` in chunks of ``chunk_size`` lines, along with the index of the first line of each chunk"""
+    lines = iter(lines)
+    start = 0
+    while chunk := list(islice(lines, chunk_size)):
+        yield start, chunk
+        start += len(chunk)
+
+def _expand_parallel(raw_tuples: Iterable[str], workers: int | None) -> tuple[list, list, list, list, list]:
+    r"""
+    Expands the lines in ``raw_tuples`` like ``_expand_lines()`` on a pool of ``workers`` processes (by default one for
+    each CPU), splitting them in chunks of consecutive lines and merging the results back in the order of the lines.
+    The chunks are sent to the pool as they are read, so ``raw_tuples`` can also be a stream of lines.
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("The number of workers needs to be positive")
+    if workers == 1:
+        return _expand_lines(raw_tuples)
+    length = len(raw_tuples) if isinstance(raw_tuples, list) else 0
+    chunks = _chunks(raw_tuples, max(_min_chunk_lines, -(-length // (workers * 4))))
+    first_chunk = next(chunks, (0, []))
+    second_chunk = next(chunks, None)
+    if second_chunk is None:
+        return _expand_lines(first_chunk[1])
+    code_tuples = []
+    code_map = []
+    breakpoint_list = []
+    remapped_breakpoint_list = []
+    pars_errors = []
+    with Pool(workers) as pool:
+        for data in pool.imap(_expand_chunk, chain([first_chunk, second_chunk], chunks)):
+            chunk_tuples, chunk_breakpoints, chunk_remapped, chunk_map, chunk_errors = marshal.loads(data)
+            code_tuples.extend([_restore_tuple(x) for x in chunk_tuples])
+            breakpoint_list.extend(chunk_breakpoints)
+            remapped_breakpoint_list.extend(chunk_remapped)
+            code_map.extend(chunk_map)
+            pars_errors.extend(chunk_errors)
+    return code_tuples, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors
+
+def parse(input_string: str | Iterable[str], is_file: bool = True, cache: ParseCache = None, workers: int | None = 1,
+          keep_lines: bool = True):
+    cacheable = cache is not None and not _is_stream(input_string, is_file)
+    if cacheable:
+        # the cache is looked up with all the lines, so they are read before the expansion
+        raw_tuples = list(_read_lines(input_string, is_file))
+        if (cached := cache.load(raw_tuples)) is not None:
+            return cached if keep_lines else (*cached[:3], [], *cached[4:])
+        lines = raw_tuples
+    else:
+        raw_tuples = []
+        lines = _read_lines(input_string, is_file)
+        lines = _kept_lines(lines, raw_tuples) if keep_lines else lines
+
+    if workers == 1:
+        code_tuples, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors = _expand_lines(lines)
+    else:
+        code_tuples, breakpoint_list, remapped_breakpoint_list, code_map, pars_errors = _expand_parallel(lines, workers)
+
+    pars_errors.extend(_check_determinism(code_tuples))
+    if cacheable:
+        cache.store(raw_tuples, (code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors))
+    raw_tuples = raw_tuples if keep_lines else []
+    return code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors
+
+def compile_program(input_string: str | Iterable[str], is_file: bool = True, cache: ParseCache = None,
+                    symbolic: bool = False, workers: int | None = 1, keep_lines: bool = True) -> Program:
+    r"""
+    Parses the program in the file named ``input_string`` (or in ``input_string`` itself if not ``is_file``) in a single
+    pass with ``parse()``, checks its determinism and compiles its transition table, returning a ``Program``.
+
+    ``input_string`` can also be ``-`` for the standard input or any iterable of lines, like a pipe or a generator: the
+    lines are expanded as they arrive, and these programs are never cached since the cache needs all the lines before
+    the expansion. The lines of the program are kept in ``raw_lines`` only if ``keep_lines``, as they are only needed
+    to show the code of the program.
+
+    If ``symbolic``, the tuples are parsed with ``symbolic.parse_symbolic()`` instead (without using the ``cache``):
+    the ``Program`` holds a ``SymbolicRule`` for each group of tuples of a line that read different symbols, and
+    ``tuple_breakpoints`` and ``code_map`` refer to the rules.
+
+    With ``workers`` other than 1, large programs are expanded on a pool of ``workers`` processes (``None`` for one
+    for each CPU), each taking a chunk of consecutive lines, with the same result of the expansion in this process.
+    Symbolic programs are always parsed in this process.
+    """
+    if symbolic:
+        raw_tuples = []
+        lines = _read_lines(input_string, is_file)
+        rules, breakpoint_list, rule_breakpoints, code_map, pars_errors = parse_symbolic(
+            _kept_lines(lines, raw_tuples) if keep_lines else lines)
+        return Program(tuple(rules), tuple(breakpoint_list), tuple(rule_breakpoints), tuple(raw_tuples), tuple(code_map),
+                       tuple(pars_errors), SymbolicCode(rules, rule_breakpoints))
+    parsed = parse(input_string, is_file, cache, workers, keep_lines)
+    code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors = parsed
+    return Program(tuple(code_tuples), tuple(breakpoint_list), tuple(remapped_breakpoint_list), tuple(raw_tuples),
+                   tuple(code_map), tuple(pars_errors), CompiledCode(code_tuples, remapped_breakpoint_list))
@@ -0,0 +1,89 @@
+import sys
+import json
+import time
+
+_spinner_chars = "─\\|/"
+_stuck_threshold = 1_000_000
+
+class Progress:
+
+    def __init__(self, mode: str = "spinner", interval: float = 1.0, chunk_time: float = 0.05) -> None:
+        r"""
+        Creates a new instance of ``Progress``, that reports the progress of a machine running in instant mode.
+
+        The machine runs in chunks of ``chunk`` steps and the progress is only reported between two chunks, so the
+        simulation loop never reads the clock nor formats any string. The size of the chunks adapts to take about
+        ``chunk_time`` seconds each, so the reports keep the same pace on fast and slow programs.
+
+        ``mode`` is either ``"spinner"``, that prints a spinner with the steps per second on the standard output, or
+        ``"json"``, that writes a JSON line with the steps, the steps per second, the length of the used tape and the
+        state of the machine on the standard error every ``interval`` seconds, to be read by other programs.
+        """
+
+        if mode not in ("spinner", "json"):
+            raise ValueError(f"Unknown progress mode '{mode}', it can be either 'spinner' or 'json'")
+        self.mode = mode
+        self.interval = interval
+        self.chunk_time = chunk_time
+        self.chunk = 4000
+        self.start_time = self.last_time = time.perf_counter()
+        self.last_steps = 0
+        self.steps_second = 0.0
+        self.frame = 0
+
+    def _spinner(self) -> None:
+        r"""Prints the spinner with the last measured steps per second"""
+        steps_sec = f"       {self.steps_second:.0f} steps/s".ljust(40) if self.steps_second else ""
+        print(f"\rSimulating... {_spinner_chars[self.frame % 4]}{steps_sec}", end='', flush=True)
+
+    def _json(self, machine, **extra) -> None:
+        r"""Writes a JSON line with the progress of ``machine``, and the ``extra`` fields, on the standard error"""
+        print(json.dumps({"steps": machine.steps, "steps_per_second": round(self.steps_second),
+                          "tape_length": machine.cells.used_length(), "state": machine.state,
+                          "elapsed": round(time.perf_counter() - self.start_time, 3), "ended": machine.ended, **extra}),
+              file=sys.stderr, flush=True)
+
+    def start(self, machine) -> None:
+        r"""Reports the start of the simulation of ``machine``"""
+        if self.mode == "spinner":
+            print()
+            self._spinner()
+
+    def update(self, machine, steps: int, elapsed: float) -> None:
+        r"""
+        Reports the progress of ``machine`` after a chunk of ``steps`` steps that took ``elapsed`` seconds, adapting the
+        size of the next chunk
+        """
+        if elapsed < self.chunk_time / 2 and steps == self.chunk:
+            self.chunk *= 2
+        elif elapsed > self.chunk_time * 2:
+            self.chunk = max(self.chunk // 2, 1)
+        now = time.perf_counter()
+        if now - self.last_time >= self.interval:
+            self.steps_second = (machine.steps - self.last_steps) / (now - self.last_time)
+            self.last_time, self.last_steps = now, machine.steps
+            if self.mode == "json":
+                self._json(machine)
+        if self.mode == "spinner":
+            if machine.steps - steps < _stuck_threshold <= machine.steps:
+                print("\rThis program might be stuck in an infinite loop. To stop the simulation press \"Ctrl + C\"")
+            self.frame += 1
+            self._spinner()
+
+    def finish(self, machine, cycles=None) -> None:
+        r"""
+        Reports the end of the simulation of ``machine``, printing its output, or the loop it was found in by ``cycles``
+        (a ``CycleDetector``)
+        """
+        looping = cycles is not None and cycles.looping
+        if self.mode == "json":
+            self.steps_second = machine.steps / (time.perf_counter() - self.start_time)
+            self._json(machine, **({"looping": True, "cycle_length": cycles.cycle_length} if looping else {}))
+        if looping:
+            shift = f", shifted by {cycles.cycle_shift} cells" if cycles.cycle_shift else ""
+            print(("\r" if self.mode == "spinner" else "") + "Simulation stopped, the machine is stuck in a loop!"
+                  f"\n\nThe same configuration repeats every {cycles.cycle_length} steps{shift}"
+                  f"\nSteps: {machine.steps}    State: {machine.state}    Tape: {''.join(machine.tape).strip().upper()}")
+            return None
+        print(("\r" if self.mode == "spinner" else "") + "Simulation ended!"
+              f"\n\nSteps: {machine.steps}    State: {machine.state}    Output: {''.join(machine.tape).strip().upper()}")
@@ -0,0 +1,109 @@
+from itertools import product
+from typing import Iterable, NamedTuple
+try:
+    from .tuples import TuringTuple
+    from .engine import CompiledCode, _remapped_char, _movements
+except ImportError:
+    from tuples import TuringTuple
+    from engine import CompiledCode, _remapped_char, _movements
+
+class SymbolicRule(NamedTuple):
+    r"""
+    A group of expanded tuples of the same line that only differ in the symbol they read. The fields are:
+     - ``current_state``: the state of the tuples
+     - ``current_symbols``: the symbols read by the tuples (with the escapes resolved)
+     - ``new_state``: the new state of the tuples
+     - ``new_symbol``: the symbol written by the tuples, or None if each of them writes back the symbol it reads
+     - ``movement``: the movement of the tuples
+    """
+    current_state: str
+    current_symbols: tuple[str, ...]
+    new_state: str
+    new_symbol: str | None
+    movement: str
+
+class SymbolicCode(CompiledCode):
+    r"""
+    A ``CompiledCode`` made from a list of ``SymbolicRule``, where the rule sets are expanded one symbol at a time
+    straight into the transition lists, so ``rules`` holds the index of the ``SymbolicRule`` and not of a tuple
+    """
+
+    def _transitions(self, code: list[SymbolicRule]):
+        r"""Yields the transitions of each symbol of each rule in ``code``, like ``CompiledCode._transitions()``"""
+        for i, rule in enumerate(code):
+            movement = _movements.get(rule.movement, 0)
+            for symbol in rule.current_symbols:
+                new_symbol = symbol if rule.new_symbol is None else rule.new_symbol
+                yield i, rule.current_state, symbol, rule.new_state, new_symbol, movement
+
+def _line_rules(raw: TuringTuple) -> list[SymbolicRule]:
+    r"""
+    Groups the tuples of the line ``raw`` into ``SymbolicRule`` straight from the ``elements`` of the line, without
+    expanding them: when no other element is matched one by one with the read symbols (like the symbol to write in
+    ``(0, ^ab, 1, [ab], >)``), all of them go in a single rule for each combination of the other elements. Otherwise
+    the tuples with the same states, movement and symbol to write (or that write back the symbol they read) become a
+    single rule. The lines with syntax errors have no rules.
+    """
+    if not raw.elements or raw.pars_errors:
+        return []
+    elements = raw.elements
+    lengths = [max([len(x) for x, y in elements if y == class_type], default=1) for class_type in range(3)]
+    symbol_class = elements[1][1]
+    matched = any(len(x) != 1 for x, y in elements[:1] + elements[2:] if y == symbol_class)
+    if not matched:
+        lengths[symbol_class] = 1
+    groups = {}
+    for indexes in product(range(lengths[2]), range(lengths[1]), range(lengths[0])):
+        current_state, current_symbols, new_state, new_symbol, movement = \
+            [x[indexes[2 - y] if len(x) != 1 else 0] for x, y in elements]
+        new_symbol = _remapped_char(new_symbol)
+        if not matched:
+            symbols = groups.setdefault((current_state, new_state, new_symbol, movement), {})
+            symbols.update(dict.fromkeys(map(_remapped_char, elements[1][0])))
+            continue
+        current_symbol = _remapped_char(current_symbols)
+        key = (current_state, new_state, None if new_symbol == current_symbol else new_symbol, movement)
+        groups.setdefault(key, {})[current_symbol] = None
+    return [SymbolicRule(state, tuple(symbols), new_state, new_symbol, movement)
+            for (state, new_state, new_symbol, movement), symbols in groups.items()]
+
+def _find_symbolic_conflicts(rules: list[SymbolicRule]) -> list[list[int]]:
+    r"""Returns, for each state and symbol read by rules with different results, the indexes of all those rules"""
+    groups = {}
+    conflicting = {}
+    for i, rule in enumerate(rules):
+        for symbol in rule.current_symbols:
+            key = (rule.current_state, symbol)
+            result = (rule.new_state, symbol if rule.new_symbol is None else rule.new_symbol, rule.movement)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = (result, [i])
+            else:
+                group[1].append(i)
+                if group[0] != result:
+                    conflicting[key] = None
+    return [groups[key][1] for key in groups if key in conflicting]
+
+def parse_symbolic(raw_tuples: Iterable[str]):
+    r"""
+    Parses the lines in ``raw_tuples`` like ``program.parse()``, but the sets of symbols of each line are grouped in
+    ``SymbolicRule`` right away, without expanding its tuples or creating a ``TuringTuple`` for each of them.
+
+    Returns the rules, the breakpoints of each line, the breakpoints of each rule, the map from the rules to the lines
+    and the parsing errors, non-deterministic rules included.
+    """
+    rules = []
+    code_map = []
+    breakpoint_list = []
+    rule_breakpoints = []
+    pars_errors = []
+    for i, raw_tuple in enumerate(raw_tuples):
+        raw = TuringTuple(raw_tuple, i, True, expanded=False)
+        pars_errors.extend(raw.pars_errors) if raw.pars_errors else None
+        line_rules = _line_rules(raw)
+        rules.extend(line_rules)
+        code_map.extend([i] * len(line_rules))
+        breakpoint_list.append(raw.has_breakpoint())
+        rule_breakpoints.extend([breakpoint_list[-1]] * len(line_rules))
+    pars_errors.extend((indexes, 'non_deterministic') for indexes in _find_symbolic_conflicts(rules))
+    return rules, breakpoint_list, rule_breakpoints, code_map, pars_errors
@@ -0,0 +1,292 @@
+from array import array
+
+def _used_range(data, wide: bool) -> tuple[int, int]:
+    r"""Returns the indexes of the first cell of ``data`` that is not blank and of the cell after the last one"""
+    raw = data.tobytes() if wide else data
+    size = 4 if wide else 1
+    start = (len(raw) - len(raw.lstrip(b"\0"))) // size
+    end = -(-len(raw.rstrip(b"\0")) // size)
+    return (start, end) if end > start else (0, 0)
+
+class Tape:
+
+    def __init__(self, cells: list[int], wide: bool = False) -> None:
+        r"""
+        Creates a new instance of ``Tape``, a buffer of symbol ids that can grow in both directions.
+
+        ``cells`` are the symbol ids of the initial tape (0 is the blank symbol) and ``wide`` tells if the ids need more
+        than one byte to be stored. The buffer is a ``bytearray`` (or an ``array`` when ``wide``) and ``origin`` is the
+        index of the first cell of the initial tape inside it, so ``position - origin`` is the absolute position of a cell.
+
+        The buffer doubles its size each time the head reaches one of its ends, so the cost of growing is amortized O(1).
+        """
+
+        self.wide = wide
+        self.data = array("I", cells) if wide else bytearray(cells)
+        self.origin = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __setitem__(self, index, value) -> None:
+        self.data[index] = value
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def _blank(self, size: int):
+        r"""Returns a block of ``size`` blank cells of the same type of the buffer"""
+        return array("I", bytes(4 * size)) if self.wide else bytes(size)
+
+    def used_length(self) -> int:
+        r"""Returns the number of cells from the first to the last one that is not blank (0 if they are all blank)"""
+        start, end = _used_range(self.data, self.wide)
+        return end - start
+
+    def used(self) -> tuple:
+        r"""
+        Returns the absolute position of the first cell that is not blank and the cells from it to the last one that is
+        not blank, as a buffer of the same type of ``data``
+        """
+        start, end = _used_range(self.data, self.wide)
+        return start - self.origin, self.data[start:end]
+
+    def window(self, start: int, stop: int) -> list[int]:
+        r"""Returns the symbol ids of the cells from the absolute position ``start`` to ``stop`` (excluded)"""
+        data, origin = self.data, self.origin
+        return [data[i] if 0 <= i < len(data) else 0 for i in range(start + origin, stop + origin)]
+
+    def grow(self, position: int) -> int:
+        r"""
+        Grows the buffer on the side where ``position`` is, if ``position`` is on the first or on the last cell.
+
+        Returns the index of ``position`` in the grown buffer (it changes only when the buffer grows on the left)
+        """
+        size = max(len(self.data), 16)
+        if position >= len(self.data) - 1:
+            self.data.extend(self._blank(size))
+        if position <= 0:
+            self.data[0:0] = self._blank(size)
+            self.origin += size
+            position += size
+        return position
+
+    def reserve(self, start: int, stop: int) -> int:
+        r"""
+        Grows the buffer until the cells from ``start`` to ``stop`` (excluded) are all inside it.
+
+        Returns the number of cells added on the left, that needs to be added to any index of the old buffer
+        """
+        shift = 0
+        while stop > len(self.data):
+            self.data.extend(self._blank(max(len(self.data), 16)))
+        while start + shift < 0:
+            size = max(len(self.data), 16)
+            self.data[0:0] = self._blank(size)
+            self.origin += size
+            shift += size
+        return shift
+
+    def copy(self) -> "Tape":
+        r"""Returns a copy of the tape"""
+        tape = Tape.__new__(Tape)
+        tape.wide = self.wide
+        tape.data = self.data[:]
+        tape.origin = self.origin
+        return tape
+
+    @classmethod
+    def from_used(cls, start: int, cells, wide: bool = False) -> "Tape":
+        r"""Returns a new tape with ``cells`` from the absolute position ``start``, like the ones returned by ``used()``"""
+        tape = cls(cells, wide)
+        tape.origin = -start
+        return tape
+
+class SparseTape(Tape):
+
+    def __init__(self, cells: list[int], wide: bool = False, chunk_size: int = 4096, window_chunks: int = 64) -> None:
+        r"""
+        Creates a new instance of ``SparseTape``, a ``Tape`` for the machines that touch cells far apart from each other:
+        only the cells around the head are kept in the buffer and the rest of the tape is split in chunks of
+        ``chunk_size`` cells, allocated only for the chunks that are not blank.
+
+        ``data`` and ``origin`` work like in ``Tape``, so the machine runs on the buffer with the same code, but the
+        buffer, a window of whole chunks, stops growing at ``window_chunks`` chunks (``max_window`` cells): after that,
+        when the head reaches one of its ends, the half of the window on the other side (``keep`` cells, whole chunks) is
+        moved to ``chunks`` (a dictionary from the absolute index of each chunk to its cells), dropping the blank chunks,
+        and the chunks on the side of the head are moved back from there (or made blank). Each half of the window needs
+        to hold at least two cells, so the head is still inside the buffer after its next move. Moving the window keeps
+        the same buffer object and changes ``origin``, that can become negative, so the returned position needs to be
+        used like after ``Tape.grow()``.
+
+        The memory then grows with the cells that were written, not with the distance the head travelled, and ``used()``
+        and ``window()`` read the missing chunks as blank.
+        """
+
+        if chunk_size < 1 or window_chunks // 2 * chunk_size < 2:
+            raise ValueError("The window of the sparse tape needs at least two cells in each half")
+        super().__init__(cells, wide)
+        self.chunk_size = chunk_size
+        self.max_window = window_chunks * chunk_size
+        self.keep = window_chunks // 2 * chunk_size
+        self.chunks = {}
+        self.data.extend(self._blank(-len(self.data) % chunk_size or (0 if self.data else chunk_size)))
+
+    def _store(self, start: int, cells) -> None:
+        r"""Moves ``cells``, starting from the absolute position ``start`` of a chunk, to ``chunks``"""
+        size = self.chunk_size
+        for i in range(0, len(cells), size):
+            chunk = cells[i:i + size]
+            if chunk.count(0) != len(chunk):
+                self.chunks[(start + i) // size] = chunk if self.wide else bytes(chunk)
+
+    def _load(self, start: int, length: int):
+        r"""Takes the ``length`` cells from the absolute position ``start`` of a chunk out of ``chunks``"""
+        size = self.chunk_size
+        blank = self._blank(size)
+        chunks = [self.chunks.pop(i, blank) for i in range(start // size, (start + length) // size)]
+        if not self.wide:
+            return b"".join(chunks)
+        cells = array("I")
+        for chunk in chunks:
+            cells.extend(chunk)
+        return cells
+
+    def _growth(self) -> int:
+        r"""
+        Returns the number of cells to add to the buffer when it grows: like ``Tape.grow()``, but rounded up to whole
+        chunks, so the buffer always starts and ends on the edge of a chunk, and without going past ``max_window``
+        """
+        size = self.chunk_size
+        return min(-(-max(len(self.data), 16) // size) * size, max(self.max_window - len(self.data), size))
+
+    def grow(self, position: int) -> int:
+        r"""
+        Grows the buffer by whole chunks (see ``_growth()``) until it reaches ``max_window`` cells, then moves the window
+        to the side where ``position`` is. Returns the index of ``position`` in the new buffer.
+        """
+        data = self.data
+        if len(data) < self.max_window:
+            size = self._growth()
+            if position >= len(data) - 1:
+                data.extend(self._blank(size))
+            if position <= 0:
+                data[0:0] = self._blank(size)
+                self.origin += size
+                position += size
+            return position
+        keep = self.keep
+        removed = len(data) - keep
+        first = -self.origin
+        if position >= len(data) - 1:
+            end = first + len(data)
+            self._store(first, data[:removed])
+            del data[:removed]
+            data.extend(self._load(end, self.max_window - keep))
+            self.origin -= removed
+            return position - removed
+        if position <= 0:
+            self._store(first + keep, data[keep:])
+            del data[keep:]
+            added = self.max_window - keep
+            data[0:0] = self._load(first - added, added)
+            self.origin += added
+            return position + added
+        return position
+
+    def reserve(self, start: int, stop: int) -> int:
+        r"""
+        Makes the cells from ``start`` to ``stop`` (excluded) all inside the window: the window grows by whole chunks,
+        with the chunks from ``chunks``, until it reaches ``max_window`` cells, then it's moved like in ``grow()``,
+        keeping ``keep`` cells behind the reserved ones (it can only be larger than ``max_window`` if they don't fit in
+        it). Returns the number of cells added on the left, that can be negative after the window moved to the right.
+        """
+        data, size = self.data, self.chunk_size
+        origin = self.origin
+        first = -origin
+        low, high = start + first, stop + first
+        while len(data) < self.max_window and (low < first or high > first + len(data)):
+            added = self._growth()
+            if high > first + len(data):
+                data.extend(self._load(first + len(data), added))
+            else:
+                data[0:0] = self._load(first - added, added)
+                first -= added
+        if low < first or high > first + len(data):
+            if high > first + len(data):
+                new_first = low // size * size - self.keep
+                new_end = max(new_first + self.max_window, -(-high // size) * size)
+            else:
+                new_end = -(-high // size) * size + self.keep
+                new_first = min(new_end - self.max_window, low // size * size)
+            self._store(first, data)
+            data[:] = self._load(new_first, new_end - new_first)
+            first = new_first
+        self.origin = -first
+        return self.origin - origin
+
+    def used_length(self) -> int:
+        r"""Returns the number of cells from the first to the last one that is not blank (0 if they are all blank)"""
+        return len(self.used()[1])
+
+    def used(self) -> tuple:
+        r"""
+        Returns the absolute position of the first cell that is not blank and the cells from it to the last one that is
+        not blank, like ``Tape.used()``: only the chunks between the first and the last one that are not blank are read
+        """
+        size = self.chunk_size
+        first = -self.origin // size
+        last = first + len(self.data) // size
+        start, end = _used_range(self.data, self.wide)
+        indexes = list(self.chunks) + ([first, last - 1] if end > start else [])
+        if not indexes:
+            return -self.origin, self.data[:0]
+        low, high = min(indexes), max(indexes)
+        blank = self._blank(size)
+        cells = self.data[:0]
+        for i in range(low, high + 1):
+            if i == first:
+                cells += self.data
+            elif not first < i < last:
+                cells += self.chunks.get(i, blank)
+        start, end = _used_range(cells, self.wide)
+        return low * size + start, cells[start:end]
+
+    def window(self, start: int, stop: int) -> list[int]:
+        r"""Returns the symbol ids of the cells from the absolute position ``start`` to ``stop`` (excluded)"""
+        data, origin, size = self.data, self.origin, self.chunk_size
+        cells = []
+        for position in range(start, stop):
+            if 0 <= position + origin < len(data):
+                cells.append(data[position + origin])
+            else:
+                chunk = self.chunks.get(position // size)
+                cells.append(chunk[position % size] if chunk is not None else 0)
+        return cells
+
+    def copy(self) -> "SparseTape":
+        r"""Returns a copy of the tape, that shares the stored chunks (they are never changed in place)"""
+        tape = SparseTape.__new__(SparseTape)
+        tape.wide = self.wide
+        tape.data = self.data[:]
+        tape.origin = self.origin
+        tape.chunk_size = self.chunk_size
+        tape.max_window = self.max_window
+        tape.keep = self.keep
+        tape.chunks = dict(self.chunks)
+        return tape
+
+    @classmethod
+    def from_used(cls, start: int, cells, wide: bool = False) -> "SparseTape":
+        r"""Returns a new tape with ``cells`` from the absolute position ``start``, like the ones returned by ``used()``"""
+        tape = cls([], wide)
+        del tape.data[:]
+        padding = start % tape.chunk_size
+        tape.data.extend(tape._blank(padding))
+        tape.data.extend(cells)
+        tape.data.extend(tape._blank(-len(tape.data) % tape.chunk_size or (0 if len(tape.data) else tape.chunk_size)))
+        tape.origin = padding - start
+        return tape
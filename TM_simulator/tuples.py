@@ -1,12 +1,22 @@
+from itertools import product
+try:
+    from .lexer import tokenize
+except ImportError:
+    from lexer import tokenize
+
+_normal_chars = '-abcdefghijklmnopqrstuvwxyz0123456789!?£$%&|§:_.\"\'=*+;<>/@'
+_special_chars = '\\-()^,#[]{}'
+
 class TuringTuple:
 
-    def __init__(self, string_tuple: str, index: int, raw_string: bool = False) -> None:
+    def __init__(self, string_tuple: str, index: int, raw_string: bool = False, expanded: bool = True) -> None:
         r"""
         Creates a new instance of ``TuringTuple`` based on ``string_tuple``.
         ``index`` is the index of the tuple in the code and ``raw_string`` tells parsed and not parsed tuples apart
 
-        If ``raw_string`` is True, it runs ``expand()`` returning a list of parsed strings, else it splits ``string_tuple``
-        in ``current_state``, ``current_symbol``, ``new_state``, ``new_symbol`` and ``movement``
+        If ``raw_string`` is True, it reads the notations of the line in ``elements`` (see ``_read()``) and, if
+        ``expanded``, runs ``expand()`` returning a list of parsed strings, else it splits ``string_tuple`` in
+        ``current_state``, ``current_symbol``, ``new_state``, ``new_symbol`` and ``movement``
         """
 
         self.raw_string = raw_string
@@ -17,7 +27,11 @@ class TuringTuple:
             self.current_state, self.current_symbol, self.new_state, self.new_symbol, self.movement = self._split(
                 self.string_tuple, ',', '\\')
         else:
-            self.expanded_tuple = self.expand()
+            try:
+                self.elements = self._read()
+            except Exception:
+                self.elements = None
+            self.expanded_tuple = self.expand() if expanded else None
 
     def _split(self, input_string: str, split_char: str, special_char: str) -> list[str]:
         r"""
@@ -31,247 +45,197 @@ class TuringTuple:
 
         if split_char not in input_string:
             return [input_string]
-        index = 0
-        char_found = False
-        while index < len(input_string) and not char_found:
-            current_char = input_string[index]
-            if current_char == special_char:
-                index += 1
-            elif current_char == split_char:
-                char_found = True
-            index += 1
-        return [input_string[:index - 1]] + self._split(input_string[index:], split_char, special_char)
-
-    def _split_each(self, input_string: str, special_char: str) -> list[str]:
-        r"""
-        Splits ``input_string`` on each non-escaped character.
-        ``special_char`` can be used to escape a character.
-
-        Returns a list of all the substrings (characters or ``special_char`` and a character)
-
-        _split_each("a\\bc\\def", "\\") -> ["a", "\\b", "c", "\\d", "e", "f"]
-        """
-
         if special_char not in input_string:
-            return [x for x in input_string]
-        buffer_string = ""
+            return input_string.split(split_char)
         return_list = []
-        for char in input_string:
-            buffer_string += char
-            if char == special_char and len(buffer_string) < 2:
-                continue
-            else:
-                return_list.append(buffer_string)
-                buffer_string = ""
+        last_split_char = input_string.rfind(split_char)
+        start = 0
+        while start <= last_split_char:
+            index = start
+            char_found = False
+            while index < len(input_string) and not char_found:
+                current_char = input_string[index]
+                if current_char == special_char:
+                    index += 1
+                elif current_char == split_char:
+                    char_found = True
+                index += 1
+            if not char_found:
+                break
+            return_list.append(input_string[start:index - 1])
+            start = index
+        return_list.append(input_string[start:])
         return return_list
 
-    def _find(self, input_string: str, start_char: str, end_char: str, special_start_char: str, special_end_char: str,
-              start_included: bool, end_included: bool) -> str:
+    def _error(self, code: str, column: int) -> None:
+        r"""Adds the parsing error ``code`` at ``column`` of the line"""
+        self.pars_errors.append(([self.index], code, column))
+
+    def _double_dot_expansion(self, start: str, end: str, column: int) -> list[str]:
         r"""
-        Extract a substring from ``input_string`` limited from the leftmost ``start_char`` and rightmost ``end_char``.
-        Each ``start_char`` escaped by ``special_start_char`` or ``end_char`` escaped by ``end_start_char`` is ignored.
+        Expands the double dot notation between the symbols ``start`` and ``end`` (a character or an escape).
+        Check syntax.md to learn more about double dot notation.
 
-        Returns the substring with or without ``start_char`` and ``end_char`` based on ``end_included`` and ``end_included``
+        Returns the symbols from ``start`` to ``end``, or an empty list if the notation is not valid.
 
-        _find("a_bcd.e\\.f", "_", ".", "\\", "\\", True, False) -> "_bcd"
+        _double_dot_expansion("c", "f", 0) -> ["c", "d", "e", "f"]
         """
 
-        if start_char not in input_string or end_char not in input_string:
-            return ''
-        start_index = 0
-        char_found = False
-        while start_index < len(input_string) and not char_found:
-            current_char = input_string[start_index]
-            if current_char == special_start_char:
-                start_index += 2
-            elif current_char == start_char:
-                char_found = True
-            else:
-                start_index += 1
-        end_index = 0
-        char_found_index = 0
-        while end_index < len(input_string):
-            current_char = input_string[end_index]
-            if current_char == special_end_char:
-                end_index += 1
-            elif current_char == end_char:
-                char_found_index = end_index
-            end_index += 1
+        start_char, end_char = start[-1], end[0]
+        if start_char.isalpha() != end_char.isalpha():
+            self._error('incompatible_dot_limiters', column)
+        elif not start_char.isalnum() or not end_char.isalnum():
+            self._error('symbol_dot_limiter', column)
+        elif ord(start_char) > ord(end_char):
+            self._error('descending_order', column)
         else:
-            start_index = start_index if start_included else start_index + 1
-            char_found_index = char_found_index + 1 if end_included else char_found_index
-            return input_string[start_index:char_found_index]
+            return [start] + [chr(x) for x in range(ord(start_char) + 1, ord(end_char) + 1)]
+        return []
 
-    def _count(self, input_string: str, count_char: str, special_char: str) -> int:
+    def _exclusion_expansion(self, excluded: list[str]) -> list[str]:
         r"""
-        Counts the number of non-escaped ``count_char`` in ``input_string``.
-        ``special_char`` can be used to escape ``count_char`` or itself; other characters are ignored.
+        Expands the exclusion notation of the ``excluded`` symbols (characters or escapes).
+        Check syntax.md to learn more about exclusion notation.
 
-        Returns the number number of non-escaped ``count_char`` found
+        Returns all the symbols except the ``excluded`` ones.
 
-        _count("a.b..c\\.\\.d..e\\.f.", ".", "\\") -> 6
+        _exclusion_expansion(["a", "b", "c", "4", "5", "6"]) -> ["d", "e", ..., "0", "1", "2", "3", "8", "9", ..., "\\}"]
         """
 
-        counter = 0
-        index = 0
-        while index < len(input_string):
-            current_char = input_string[index]
-            if current_char == special_char:
-                index += 1
-            elif current_char == count_char:
-                counter += 1
-            index += 1
-        return counter
+        special_char = _special_chars
+        normal_char = _normal_chars
+        for symbol in excluded:
+            if len(symbol) == 2 and symbol[0] == '\\':
+                special_char = special_char.replace(symbol[1], '')
+            else:
+                normal_char = normal_char.replace(symbol, '')
+        return list(normal_char) + ['\\' + x for x in special_char]
 
-    def _remove_comment(self, input_string: str) -> str:
+    def _class_expansion(self, symbols: list[str], column: int) -> tuple[list[list[str]], int]:
         r"""
-        Removes comment from ``input_string``.
-        Comments are defined as everything after the first non-escaped ``#``, itself included.
+        Expands any class notation found in ``symbols`` (the characters and the escapes of an element of the tuple).
+        Check syntax.md to learn more about class notation.
 
-        Returns a string without comments or ``input_string`` itself if no comments are found
+        Returns a tuple of two elements: a list with the symbols of each element that expands from the class notation
+        and a value that identifies the type of class.
 
-        _remove_comment("(0,-,1,\\#,>) # heheha :)") -> "(0,-,1,\\#,>) "
+        _class_expansion(["a", "b", "[", "0", "1", "]", "f"], 0) -> ([["a", "b", "0", "f"], ["a", "b", "1", "f"]], 1)
         """
 
-        buffer_string = ""
-        skip_char = False
-        for char in input_string:
-            if char != "\\" and char != "#":
-                buffer_string += char
-                skip_char = False
-            elif skip_char:
-                buffer_string += char
-                skip_char = False
-            elif char == "\\" and not skip_char:
-                buffer_string += char
-                skip_char = True
-            elif char == "#" and not skip_char:
-                break
-        return buffer_string
-
-    def _double_dot_expansion(self, input_string: str) -> str:
+        brackets = {"[": [], "]": [], "{": [], "}": []}
+        for i, symbol in enumerate(symbols):
+            if symbol in brackets:
+                brackets[symbol].append(i)
+        class1_start, class1_end, class2_start, class2_end = brackets.values()
+        if not (class1_start or class1_end or class2_start or class2_end):
+            return [symbols], 0
+        elif symbols == ['[', ']'] or symbols == ['{', '}']:
+            self._error('empty_class', column)
+        elif len(class1_start) != len(class1_end) or len(class2_start) != len(class2_end):
+            self._error('missing_class_limiters', column)
+        elif any(len(x) > 1 for x in brackets.values()):
+            self._error('multiple_class', column)
+        class_symbols1 = symbols[class1_start[0] + 1:class1_end[-1]] if class1_start and class1_end else []
+        class_symbols2 = symbols[class2_start[0] + 1:class2_end[-1]] if class2_start and class2_end else []
+        if class1_start and class2_start:
+            self._error('multiple_class_types', column)
+        elif not class_symbols1 and not class_symbols2:
+            self._error('empty_class', column)
+            return [], 2
+        class_type = 1 if class_symbols1 else 2
+        start, end = (class1_start[0], class1_end[-1]) if class_symbols1 else (class2_start[0], class2_end[-1])
+        return [symbols[:start] + [x] + symbols[end + 1:] for x in symbols[start + 1:end]], class_type
+
+    def _read(self) -> list[tuple[list[str], int]] | None:
         r"""
-        Expands any double dot notation found in ``input_string``.
-        Check syntax.md to learn more about double dot notation.
-
-        Returns the expanded version of ``input_string`` or itself if no double dot notation is found.
+        Reads the line in ``self.string_tuple`` with ``lexer.tokenize()``, once, resolving the notations of each
+        element of the tuple straight from the tokens. Each error in ``self.pars_errors`` also has the column (from 0)
+        of the element of the tuple it was found in.
 
-        _double_dot_expansion("ac..f1..36") -> "acdef1236"
-        """
+        Returns, for each of the five elements, the list of its states (or symbols, or movements) and the type of class
+        they come from (0 without classes): the elements with the same type of class are matched one by one, while the
+        elements with a single value are matched with all the others. An empty line has no elements, and a line
+        without five elements returns None.
 
-        if '..' not in input_string:
-            return input_string
-        double_dot_count = input_string.count('..')
-        double_dot_list = []
-        connection_list = []
-        while double_dot_count > 0:
-            double_dot_index = input_string.index('..') - 1
-            if double_dot_index + 4 > len(input_string):
-                connection_list.append(input_string)
-            elif double_dot_index == -1:
-                input_string = input_string[3:]
-            else:
-                double_dot_list.append(input_string[double_dot_index:double_dot_index + 4])
-                connection_list.append(input_string[:double_dot_index])
-                input_string = input_string[double_dot_index + 4:]
-            double_dot_count -= 1
-        return_list = []
-        for expression in double_dot_list:
-            expansion_string = ''
-            current_char = expression[0]
-            notation_end_char = expression[-1]
-            if current_char.isalpha() != notation_end_char.isalpha():
-                self.pars_errors.append(([self.index], 'incompatible_dot_limiters'))
-            elif not current_char.isalnum() or not notation_end_char.isalnum():
-                self.pars_errors.append(([self.index], 'symbol_dot_limiter'))
-            elif ord(current_char) > ord(notation_end_char):
-                self.pars_errors.append(([self.index], 'descending_order'))
-            elif current_char != '.' or notation_end_char != '.':
-                ord_current_char = ord(current_char)
-                ord_notation_end = ord(notation_end_char)
-                while ord_current_char <= ord_notation_end:
-                    expansion_string += chr(ord_current_char)
-                    ord_current_char += 1
-                return_list.append(expansion_string)
-        merged_list = []
-        return_list = [''] if not return_list else return_list
-        while return_list or connection_list:
-            merged_list.append(connection_list.pop(0))
-            merged_list.append(return_list.pop(0))
-        return ''.join(merged_list) + input_string
-
-    def _exclusion_expansion(self, input_string: str) -> str:
-        r"""
-        Expands any exclusion notation found in ``input_string``.
-        Check syntax.md to learn more about exclusion notation.
-
-        Returns the expanded version of ``input_string`` or itself if no exclusion notation is found.
+        self.string_tuple = "(f[01], abc, g, [01], >)"
 
-        _exclusion_expansion("^abc456") -> "defghijklmnopqrstuvwxyz012389*" where * represents all the symbols
+        _read() -> [(["F0", "F1"], 1), (["A", "B", "C"], 0), (["G"], 0), (["0", "1"], 1), ([">"], 0)]
         """
 
-        special_char = '\\-()^,#[]{}'
-        normal_char = '-abcdefghijklmnopqrstuvwxyz0123456789!?£$%&|§:_.\"\'=*+;<>/@'
-        exception_string = self._find(input_string, '^', input_string[-1], '\\', '', start_included=False,
-                                      end_included=True)
-        exception_string = self._split(exception_string, ',', '\\')[0] if exception_string else ""
-        if exception_string == '':
-            return input_string
-        special_char_found = False
-        for index in range(len(exception_string)):
-            character = exception_string[index]
-            if character == '\\' and not special_char_found:
-                special_char_found = True
+        tokens, self.string_tuple = tokenize(self.string_tuple)
+        if self.string_tuple == "":
+            return []
+        last_token = tokens[-1] if tokens[-1].kind != "comment" else tokens[-2]
+        end_column = last_token.column + len(last_token.text)
+        if self.string_tuple[0] != "(" and self.string_tuple[:2] != "!(":
+            self._error('opening_char_missing', tokens[0].column)
+        if self.string_tuple[-1] != ")":
+            self._error('closing_char_missing', end_column)
+        first = next((i for i, x in enumerate(tokens) if x.kind == "open"), len(tokens))
+        last = next((i for i in range(len(tokens) - 1, first, -1) if tokens[i].kind == "close"), first)
+        elements = [[]]
+        columns = [tokens[first + 1].column if first + 1 < len(tokens) else end_column]
+        empty = [first + 1 >= last or tokens[first + 1].kind == "separator"]
+        double_dot = None
+        for i in range(first + 1, last):
+            token = tokens[i]
+            if token.kind == "separator":
+                if double_dot is not None:
+                    self._error('symbol_dot_limiter', columns[-1])
+                    double_dot = None
+                elements.append([])
+                columns.append(tokens[i + 1].column)
+                empty.append(i + 1 == last or tokens[i + 1].kind == "separator")
                 continue
-            elif character in special_char and special_char_found:
-                special_char = special_char.replace(character, '')
-            else:
-                normal_char = normal_char.replace(character, '')
-        return normal_char + '\\' + '\\'.join(special_char)
-
-    def _class_expansion(self, input_string: str) -> list[list[str], int]:
-        r"""
-        Expands any class notation found in ``input_string``.
-        Check syntax.md to learn more about class notation.
-
-        Returns a list of two elements: a list with all the strings that expands from the class notation and a value
-        that identifies the type of class.
-
-        _class_expansion("ab[0123]f") -> [["ab0f", "ab1f", "ab2f", "ab3f"], 1]
-        """
-
-        class1_start_count = self._count(input_string, '[', '\\')
-        class1_end_count = self._count(input_string, ']', '\\')
-        class2_start_count = self._count(input_string, '{', '\\')
-        class2_end_count = self._count(input_string, '}', '\\')
-        if class1_start_count == class1_end_count == 0 and class2_start_count == class2_end_count == 0:
-            return [[input_string], 0]
-        elif input_string == '[]' or input_string == '{}':
-            self.pars_errors.append(([self.index], 'empty_class'))
-        elif class1_start_count != class1_end_count or class2_start_count != class2_end_count:
-            self.pars_errors.append(([self.index], 'missing_class_limiters'))
-        elif class1_start_count > 1 or class1_end_count > 1 or class2_start_count > 1 or class2_end_count > 1:
-            self.pars_errors.append(([self.index], 'multiple_class'))
-        class_string1 = self._find(input_string, '[', ']', '\\', '\\', start_included=False, end_included=False)
-        class_string2 = self._find(input_string, '{', '}', '\\', '\\', start_included=False, end_included=False)
-        if class1_start_count != 0 and class2_start_count != 0:
-            self.pars_errors.append(([self.index], 'multiple_class_types'))
-        elif not class_string1 and not class_string2:
-            self.pars_errors.append(([self.index], 'empty_class'))
-        class_type = 1 if class_string1 else 2
-        class_string = class_string1 if class_string1 else class_string2
-        class_start_index = input_string.find(class_string)
-        class_end_index = class_start_index + len(class_string)
-        first_part = input_string[:class_start_index - 1]
-        last_part = input_string[class_end_index + 1:]
-        return_list = []
-        for character in self._split_each(class_string, "\\"):
-            return_list.append(first_part + character + last_part)
-        return [return_list, class_type]
+            if token.kind == "range":
+                if double_dot is not None or not elements[-1]:
+                    self._error('symbol_dot_limiter', columns[-1])
+                double_dot = elements[-1].pop() if elements[-1] else None
+                continue
+            symbols = [token.text] if token.kind == "escape" else token.text
+            if double_dot is not None:
+                elements[-1].extend(self._double_dot_expansion(double_dot, symbols[0], columns[-1]))
+                double_dot = None
+                symbols = symbols[1:]
+            elements[-1].extend(symbols)
+        if double_dot is not None:
+            self._error('symbol_dot_limiter', columns[-1])
+        if len(elements) != 5:
+            self._error('incorrect_arguments_amount', columns[5] if len(elements) > 5 else last_token.column)
+        if any(empty):
+            self._error('empty_rule', columns[empty.index(True)])
+
+        expanded_elements = []
+        for i, symbols in enumerate(elements):
+            if "^" in symbols and symbols.index("^") + 1 < len(symbols):
+                symbols = self._exclusion_expansion(symbols[symbols.index("^") + 1:])
+            expanded_elements.append(self._class_expansion(symbols, columns[i]))
+        if len(elements) != 5:
+            return None
+        (current_state, class_0), (current_symbol, class_1), (new_state, class_2), (new_symbol, class_3), \
+            (movement, class_4) = expanded_elements
+        if (not all(len(x) == 1 for x in current_symbol) and len(current_symbol) != 1) or \
+           (not all(len(x) == 1 for x in new_symbol) and len(new_symbol) != 1):
+            self._error('multiple_symbols', columns[1])
+        current_state = ["".join(x) for x in current_state]
+        new_state = ["".join(x) for x in new_state]
+        current_symbol = current_symbol[0] if len(current_symbol) == 1 else ["".join(x) for x in current_symbol]
+        new_symbol = new_symbol[0] if len(new_symbol) == 1 else ["".join(x) for x in new_symbol]
+        movement = movement[0] if len(movement) == 1 else ["".join(x) for x in movement]
+        if not all([x in [">", "<", "-"] for x in movement]):
+            self._error('unrecognised_movement', columns[4])
+        elements = [(current_state, class_0), (current_symbol, class_1), (new_state, class_2), (new_symbol, class_3),
+                    (movement, class_4)]
+        for class_type in range(3):
+            lengths = [len(x) for x, y in elements if y == class_type and x]  # the empty ones are already errors
+            if not all(x == max(lengths) or x == 1 for x in lengths):
+                self._error('different_class_sizes', columns[0])
+                break
+        return elements
 
     def expand(self) -> list[str]:
         r"""
-        Expands a ``self.string_tuple`` into all the possible tuples.
+        Expands the ``elements`` of the tuple, read from ``self.string_tuple``, into all the possible tuples.
 
         Returns a list of all the tuples with ``current_symbol``, ``new_symbol`` and ``movement`` of length 1.
 
@@ -280,73 +244,15 @@ class TuringTuple:
         expand() -> ["(f0,a,g,0,>)", "(f0,b,g,0,>)", "(f0,c,g,0,>)", "(f1,a,g,1,>)", "(f1,b,g,1,>)", "(f1,c,g,1,>)"]
         """
 
+        if self.elements is None:
+            return ["(0,0,0,0,0)"]
+        if not self.elements:
+            return [""]
+        lengths = [max([len(x) for x, y in self.elements if y == class_type], default=1) for class_type in range(3)]
         try:
-            self.string_tuple = self._remove_comment(self.string_tuple).upper().replace(" ", "")
-            if self.string_tuple == "":
-                return [""]
-            if self.string_tuple[0] != "(" and self.string_tuple[:2] != "!(":
-                self.pars_errors.append(([self.index], 'opening_char_missing'))
-            if self.string_tuple[-1] != ")":
-                self.pars_errors.append(([self.index], 'closing_char_missing'))
-            clean_tuple = self._find(self.string_tuple, "(", ")", "\\", "\\", start_included=False, end_included=False)
-            split_tuple = self._split(clean_tuple, ",", "\\")
-            if len(split_tuple) != 5:
-                self.pars_errors.append(([self.index], 'incorrect_arguments_amount'))
-            if not all([bool(x) for x in split_tuple]):
-                self.pars_errors.append(([self.index], 'empty_rule'))
-            split_tuple = [self._exclusion_expansion(self._double_dot_expansion(x)) for x in split_tuple]
-            split_expanded_tuple = [self._class_expansion(x) for x in split_tuple]
-            current_symbol = split_expanded_tuple[1][0]
-            new_symbol = split_expanded_tuple[3][0]
-            movement = split_expanded_tuple[4][0]
-            if (not all([len(x) == 1 or (len(x) == 2 and x[0] == "\\") for x in current_symbol]) and len(current_symbol) != 1) or \
-               (not all([len(x) == 1 or (len(x) == 2 and x[0] == "\\") for x in new_symbol]) and len(new_symbol) != 1):
-                self.pars_errors.append(([self.index], 'multiple_symbols'))
-            current_symbol = self._split_each(current_symbol[0], "\\") if len(current_symbol) == 1 else current_symbol
-            new_symbol = self._split_each(new_symbol[0], "\\") if len(new_symbol) == 1 else new_symbol
-            movement = self._split_each(movement[0], "\\") if len(movement) == 1 else movement
-            split_expanded_tuple[1][0] = current_symbol
-            split_expanded_tuple[3][0] = new_symbol
-            split_expanded_tuple[4][0] = movement
-            current_state, _, new_state, _, _ = [x[0] for x in split_expanded_tuple]
-            if not all([x in [">", "<", "-"] for x in movement]):
-                self.pars_errors.append(([self.index], 'unrecognised_movement'))
-            class_0_elements = [x for x in split_expanded_tuple if x[1] == 0]
-            class_1_elements = [x for x in split_expanded_tuple if x[1] == 1]
-            class_2_elements = [x for x in split_expanded_tuple if x[1] == 2]
-            class_0 = [x[1] == 0 for x in split_expanded_tuple]
-            class_1 = [x[1] == 1 for x in split_expanded_tuple]
-            class_2 = [x[1] == 2 for x in split_expanded_tuple]
-            max_len_class_0 = max([len(y[0]) for y in split_expanded_tuple if y[1] == 0], default=1)
-            max_len_class_1 = max([len(y[0]) for y in split_expanded_tuple if y[1] == 1], default=1)
-            max_len_class_2 = max([len(y[0]) for y in split_expanded_tuple if y[1] == 2], default=1)
-            if not all([len(x[0]) == max_len_class_2 or len(x[0]) == 1 for x in class_2_elements]) or \
-               not all([len(x[0]) == max_len_class_1 or len(x[0]) == 1 for x in class_1_elements]) or \
-               not all([len(x[0]) == max_len_class_0 or len(x[0]) == 1 for x in class_0_elements]):
-                self.pars_errors.append(([self.index], 'different_class_sizes'))
-            return_list = []
-            for i_2 in range(max_len_class_2):
-                current_state_loop = current_state[i_2 if len(current_state) != 1 else 0] if class_2[0] else None
-                current_symbol_loop = current_symbol[i_2 if len(current_symbol) != 1 else 0] if class_2[1] else None
-                new_state_loop = new_state[i_2 if len(new_state) != 1 else 0] if class_2[2] else None
-                new_symbol_loop = new_symbol[i_2 if len(new_symbol) != 1 else 0] if class_2[3] else None
-                movement_loop = movement[i_2 if len(movement) != 1 else 0] if class_2[4] else None
-                for i_1 in range(max_len_class_1):
-                    current_state_loop = current_state[i_1 if len(current_state) != 1 else 0] if class_1[0] else current_state_loop
-                    current_symbol_loop = current_symbol[i_1 if len(current_symbol) != 1 else 0] if class_1[1] else current_symbol_loop
-                    new_state_loop = new_state[i_1 if len(new_state) != 1 else 0] if class_1[2] else new_state_loop
-                    new_symbol_loop = new_symbol[i_1 if len(new_symbol) != 1 else 0] if class_1[3] else new_symbol_loop
-                    movement_loop = movement[i_1 if len(movement) != 1 else 0] if class_1[4] else movement_loop
-                    for i_0 in range(max_len_class_0):
-                        current_state_loop = current_state[i_0 if len(current_state) != 1 else 0] if class_0[0] else current_state_loop
-                        current_symbol_loop = current_symbol[i_0 if len(current_symbol) != 1 else 0] if class_0[1] else current_symbol_loop
-                        new_state_loop = new_state[i_0 if len(new_state) != 1 else 0] if class_0[2] else new_state_loop
-                        new_symbol_loop = new_symbol[i_0 if len(new_symbol) != 1 else 0] if class_0[3] else new_symbol_loop
-                        movement_loop = movement[i_0 if len(movement) != 1 else 0] if class_0[4] else movement_loop
-                        return_list.append(','.join([current_state_loop, current_symbol_loop, new_state_loop,
-                                                     new_symbol_loop, movement_loop]))
-            return return_list
-        except Exception:
+            return [','.join([x[indexes[2 - y] if len(x) != 1 else 0] for x, y in self.elements])
+                    for indexes in product(range(lengths[2]), range(lengths[1]), range(lengths[0]))]
+        except IndexError:
             return ["(0,0,0,0,0)"]
 
     def has_breakpoint(self) -> bool:
@@ -0,0 +1,17 @@
+import os
+from functools import lru_cache
+import pytest
+import TM_simulator as tm
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+
+@pytest.fixture(scope="session")
+def program():
+    r"""
+    Returns a function that compiles the example ``filename`` (as a symbolic program if ``symbolic``), only once in the
+    whole session
+    """
+    @lru_cache(maxsize=None)
+    def compiled(filename: str, symbolic: bool = False) -> tm.Program:
+        return tm.compile_program(os.path.join(EXAMPLES, filename), symbolic=symbolic)
+    return compiled
@@ -0,0 +1,51 @@
+import os
+import pytest
+import TM_simulator as tm
+from TM_simulator.analysis import _find_conflicts
+from TM_simulator.tuples import TuringTuple
+from conftest import EXAMPLES
+
+PROGRAM = "(0, a, 1, b, >)\n(0, a, 2, b, <)\n(1, [ab], 1, -, >)\n(0, a, 1, b, >)\n(1, -, end, -, <)\n" \
+          "(9, a, 8, a, >)\n# comment\n(0, [bc], 0, x, >)\n(0, c, 0, y, >)"
+
+def _tuples(*strings: str) -> list[TuringTuple]:
+    return [TuringTuple(x, i) for i, x in enumerate(strings)]
+
+@pytest.mark.parametrize("strings, conflicts", [
+    ((), []),
+    (("0,A,1,B,>", "0,B,1,B,>", "1,A,0,A,<"), []),
+    (("0,A,1,B,>", "0,A,1,B,>"), []),
+    (("0,A,1,B,>", "0,A,1,B,<"), [[0, 1]]),
+    (("0,A,1,B,>", "1,A,1,B,>", "0,A,1,B,>", "0,A,2,B,>"), [[0, 2, 3]]),
+    (("0,A,1,B,>", "0,B,1,C,>", "0,B,1,C,-", "0,A,1,C,>"), [[0, 3], [1, 2]]),
+])
+def test_find_conflicts_groups_the_tuples_with_different_results(strings, conflicts):
+    assert _find_conflicts(_tuples(*strings)) == conflicts
+
+def test_report_of_a_program():
+    report = tm.analyze_program(PROGRAM, False)
+    assert report.conflicts == (("0", "A", (1, 2, 4)), ("0", "C", (8, 9)))
+    assert report.states == ("0", "1", "2", "END", "9", "8")
+    assert report.unreachable_states == ("9",)
+    assert report.halting_states == ("2", "END", "8")
+    assert report.alphabet == (" ", "A", "B", "X", "C", "Y")
+
+def test_report_summary():
+    summary = tm.analyze_program(PROGRAM, False).summary().split("\n")
+    assert summary[:4] == ["States: 6    Symbols: 6", "Alphabet: - A B X C Y", "Halting states: 2, END, 8",
+                           "Unreachable states: 9"]
+    assert summary[4:] == ["Non-deterministic rules: 2", " - state 0, symbol 'A' at lines 1, 2, 4",
+                           " - state 0, symbol 'C' at lines 8, 9"]
+    deterministic = tm.analyze_program("(0, -, 0, -, >)", False).summary().split("\n")
+    assert deterministic[2:] == ["Halting states: none", "Unreachable states: none", "The program is deterministic"]
+
+@pytest.mark.parametrize("filename", ["int-division.txt", "reverse.txt", "bin-dec.txt", "palindrome.txt"])
+def test_examples_are_deterministic(program, filename):
+    report = tm.analyze_program(program(filename))
+    assert report.conflicts == ()
+    assert report == tm.analyze_program(os.path.join(EXAMPLES, filename))
+    assert report.unreachable_states == ()
+
+def test_analysis_raises_on_syntax_errors():
+    with pytest.raises(RuntimeError):
+        tm.analyze_program("(0, [ab, 1, -, >)", False)
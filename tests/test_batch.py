@@ -0,0 +1,56 @@
+import os
+import pytest
+import TM_simulator as tm
+from TM_simulator.tuples import TuringTuple
+from conftest import EXAMPLES
+
+TAPES = ["1234/56", "100/7", "0/3", "99/1", "5/5", "42/1", "", "12/"]
+
+def _serial(program: tm.Program, tapes: list[str], threshold: int) -> list[tuple]:
+    r"""Runs each tape on its own machine, returning the state, the steps, the tape and the status of each run"""
+    results = []
+    for tape in tapes:
+        machine = tm.TuringMachine.load_program(program, tape)
+        machine.set_threshold(threshold)
+        machine.run()
+        results.append((machine.state, machine.steps, machine.tape, "halted" if machine.ended else "timeout"))
+    return results
+
+def _outcome(results) -> list[tuple]:
+    return [(x.state, x.steps, x.tape, x.status) for x in sorted(results, key=lambda x: x.index)]
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, None), (2, None), (2, 1), (3, 5)])
+@pytest.mark.parametrize("threshold", [100_000, 300])
+def test_run_batch_matches_the_serial_runs(program, workers, chunk_size, threshold):
+    division = program("int-division.txt")
+    results = list(tm.run_batch(division, TAPES, workers=workers, threshold=threshold, chunk_size=chunk_size))
+    assert [x.index for x in results] == list(range(len(TAPES)))
+    assert [x.cycle_length for x in results] == [None] * len(TAPES)
+    assert _outcome(results) == _serial(division, TAPES, threshold)
+
+def test_run_batch_unordered_returns_every_tape(program):
+    division = program("int-division.txt")
+    results = list(tm.run_batch(division, TAPES * 3, workers=2, threshold=10_000, chunk_size=2, ordered=False))
+    assert sorted(x.index for x in results) == list(range(len(TAPES) * 3))
+    assert _outcome(results) == _serial(division, TAPES, 10_000) * 3
+
+def test_run_batch_with_parsed_tuples():
+    code = tm.parse_tuples(os.path.join(EXAMPLES, "reverse.txt"))
+    results = list(tm.run_batch(code, ["AB", "BBA", ""], workers=1))
+    assert [(x.tape, x.status) for x in results] == [("BA", "halted"), ("ABB", "halted"), ("", "halted")]
+
+def test_run_batch_detects_the_loops():
+    code = tm.parse_tuples("(0, -, 1, -, >)\n(1, -, 0, -, <)\n(0, A, 0, B, >)", False)
+    results = list(tm.run_batch(code, ["", "AAA", "A"], workers=1, threshold=100_000, detect_cycles=True))
+    assert [x.status for x in results] == ["looping", "looping", "looping"]
+    assert [x.cycle_length for x in results] == [2, 2, 2]
+    assert all(x.steps < 100_000 for x in results)
+
+@pytest.mark.parametrize("arguments", [{"workers": 0}, {"workers": -2}, {"chunk_size": 0}])
+def test_run_batch_checks_the_arguments_when_called(program, arguments):
+    with pytest.raises(ValueError):
+        tm.run_batch(program("int-division.txt"), TAPES, **arguments)
+
+def test_run_batch_rejects_raw_tuples():
+    with pytest.raises(ValueError):
+        tm.run_batch([TuringTuple("(0, -, 0, -, >)", 0, True)], ["A"])
@@ -0,0 +1,63 @@
+import pytest
+from TM_simulator.bench import BenchCase, BenchResult, Regression, run_bench, save_bench, load_bench, compare_bench, \
+    format_regression
+
+OLD = [BenchResult("fast", 0.01, 1000, 1_000_000.0, 2 ** 20, 0.02),
+       BenchResult("slow", 0.5, 10 ** 6, 200_000.0, 2 ** 24, 5.5),
+       BenchResult("tiny", 0.0001, 10, 50_000.0, 1024, 0.0002)]
+
+def _changed(result: BenchResult, **fields) -> BenchResult:
+    return result._replace(**fields)
+
+def test_same_results_have_no_regressions():
+    assert compare_bench(OLD, OLD) == []
+
+def test_better_results_have_no_regressions():
+    new = [_changed(x, parse_time=x.parse_time / 2, steps_per_second=x.steps_per_second * 2,
+                    peak_memory=x.peak_memory // 2, wall_time=x.wall_time / 2) for x in OLD]
+    assert compare_bench(OLD, new) == []
+
+def test_worse_results_are_regressions():
+    new = [_changed(OLD[0], steps_per_second=500_000.0, wall_time=0.03), _changed(OLD[1], peak_memory=2 ** 25)]
+    assert compare_bench(OLD, new) == [Regression("fast", "steps_per_second", 1_000_000.0, 500_000.0, 1.0),
+                                       Regression("fast", "wall_time", 0.02, 0.03, 0.5),
+                                       Regression("slow", "peak_memory", 2 ** 24, 2 ** 25, 1.0)]
+
+@pytest.mark.parametrize("threshold, regressions", [(0.05, 2), (0.1, 1), (0.2, 0)])
+def test_threshold_of_the_regressions(threshold, regressions):
+    new = [_changed(OLD[1], parse_time=0.5 * 1.08, wall_time=5.5 * 1.15)]
+    assert len(compare_bench(OLD, new, threshold)) == regressions
+
+def test_short_times_are_ignored():
+    new = [_changed(OLD[2], parse_time=0.0009, wall_time=0.0008)]
+    assert compare_bench(OLD, new) == []
+    assert [x.metric for x in compare_bench(OLD, new, min_time=0.00001)] == ["parse_time", "wall_time"]
+    assert [x.metric for x in compare_bench(OLD, [_changed(OLD[2], wall_time=0.002)])] == ["wall_time"]
+
+def test_new_cases_and_zero_values_are_skipped():
+    new = [BenchResult("other", 9.0, 1, 1.0, 2 ** 30, 9.0), _changed(OLD[0], steps_per_second=0.0, peak_memory=0)]
+    assert compare_bench(OLD, new) == []
+
+def test_format_regression():
+    line = format_regression(Regression("fast", "wall_time", 0.02, 0.03, 0.5))
+    assert line.startswith("fast") and "wall_time" in line and line.endswith("(+50.0%)")
+
+def test_saved_results_are_loaded(tmp_path):
+    path = str(tmp_path / "bench.json")
+    save_bench(OLD, path)
+    assert load_bench(path) == OLD
+
+def test_run_bench_measures_the_cases(tmp_path):
+    cases = [BenchCase("right", "(0, -, 1, 1, >)\n(1, -, 0, 1, >)", "", 5_000),
+             BenchCase("missing", "missing.txt", "", 10, True)]
+    reported = []
+    results = run_bench(cases, repeats=2, warmup=0, examples=str(tmp_path), report=reported.append)
+    assert reported == results
+    assert [(x.name, x.steps) for x in results] == [("right", 5_000)]
+    assert results[0].steps_per_second > 0 and results[0].wall_time >= results[0].parse_time > 0
+    assert compare_bench(results, results) == []
+
+@pytest.mark.parametrize("repeats, warmup", [(0, 1), (1, -1)])
+def test_run_bench_checks_the_arguments(repeats, warmup):
+    with pytest.raises(ValueError):
+        run_bench([], repeats, warmup)
@@ -0,0 +1,117 @@
+import os
+import marshal
+import zlib
+import pytest
+import TM_simulator as tm
+from TM_simulator.cache import ParseCache
+from TM_simulator.program import parse
+
+PROGRAM = "(0, [a..c], 0, [xyz], >)\n!(0, -, end, -, <)\n(end, x, end, a, <)"
+INVALID = "(0, a, 1, b, >)\n(0, a, 2, b, <)\n(1, [ab, 1, -, >)"
+
+def _outcome(parsed: tuple) -> tuple:
+    code_tuples, *rest = parsed
+    return [x.__dict__ for x in code_tuples], rest
+
+class _CountingCache(ParseCache):
+    r"""A ``ParseCache`` that counts its hits and misses"""
+
+    def __init__(self, directory: str, max_size: int = 64 * 2 ** 20) -> None:
+        super().__init__(directory, max_size)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, raw_tuples: list[str]) -> tuple | None:
+        result = super().load(raw_tuples)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+def _files(directory) -> list[str]:
+    return sorted(x for x in os.listdir(directory) if x.endswith(".bin")) if os.path.isdir(directory) else []
+
+@pytest.mark.parametrize("program", [PROGRAM, INVALID])
+def test_cache_hit_returns_the_parsed_program(tmp_path, program):
+    cache = _CountingCache(str(tmp_path))
+    missed = parse(program, False, cache)
+    hit = parse(program, False, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(_files(tmp_path)) == 1
+    assert _outcome(hit) == _outcome(missed) == _outcome(parse(program, False))
+    assert (hit[-1] == []) == (program == PROGRAM)
+
+def test_cache_keeps_the_determinism_errors(tmp_path):
+    cache = _CountingCache(str(tmp_path))
+    errors = [parse(INVALID, False, cache)[-1] for _ in range(2)]
+    assert errors[0] == errors[1]
+    assert {x[1] for x in errors[1]} >= {"non_deterministic", "missing_class_limiters"}
+
+def test_cache_misses_a_changed_program(tmp_path):
+    cache = _CountingCache(str(tmp_path))
+    parse(PROGRAM, False, cache)
+    parse(PROGRAM + "\n(end, -, end2, -, >)", False, cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(_files(tmp_path)) == 2
+
+@pytest.mark.parametrize("content", [b"", b"garbage", zlib.compress(b"garbage"),
+                                     zlib.compress(marshal.dumps(([("1", 0)], [], [], [0], []))),
+                                     zlib.compress(marshal.dumps(([], [], [], [0], []))),
+                                     zlib.compress(marshal.dumps((1, 2, 3)))])
+def test_corrupted_file_is_a_miss_and_is_replaced(tmp_path, content):
+    cache = _CountingCache(str(tmp_path))
+    expected = parse(PROGRAM, False, cache)
+    path = os.path.join(tmp_path, _files(tmp_path)[0])
+    with open(path, "wb") as file:
+        file.write(content)
+    assert _outcome(parse(PROGRAM, False, cache)) == _outcome(expected)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert _outcome(parse(PROGRAM, False, cache)) == _outcome(expected)
+    assert cache.hits == 1
+
+def test_unreadable_file_is_a_miss_and_is_kept(tmp_path):
+    cache = _CountingCache(str(tmp_path))
+    path = cache._path(PROGRAM.split("\n"))
+    os.makedirs(path)
+    parse(PROGRAM, False, cache)
+    assert cache.misses == 1
+    assert os.path.isdir(path)
+
+def test_failed_access_time_update_is_still_a_hit(tmp_path, monkeypatch):
+    cache = _CountingCache(str(tmp_path))
+    parse(PROGRAM, False, cache)
+    def utime(*args, **kwargs):
+        raise PermissionError("read-only cache")
+    monkeypatch.setattr(os, "utime", utime)
+    parse(PROGRAM, False, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(_files(tmp_path)) == 1
+
+def test_cache_evicts_the_least_recently_used_files(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    programs = [PROGRAM + f"\n(end, -, s{i}, -, >)" for i in range(3)]
+    for i, program in enumerate(programs):
+        parse(program, False, cache)
+        path = cache._path(program.split("\n"))
+        os.utime(path, (1000 + i, 1000 + i))
+    parse(programs[0], False, cache)  # a hit updates the access time of the oldest file
+    sizes = [os.path.getsize(os.path.join(tmp_path, x)) for x in _files(tmp_path)]
+    cache.max_size = sum(sizes) - 1
+    parse(PROGRAM, False, cache)
+    remaining = _files(tmp_path)
+    assert os.path.basename(cache._path(programs[1].split("\n"))) not in remaining
+    assert os.path.basename(cache._path(programs[0].split("\n"))) in remaining
+    assert os.path.basename(cache._path(PROGRAM.split("\n"))) in remaining
+
+def test_cache_is_disabled_by_default(tmp_path, monkeypatch):
+    assert tm._parse_cache is None
+    monkeypatch.setattr(tm, "_parse_cache", None)
+    tm.set_cache(True, str(tmp_path))
+    tm.parse_tuples(PROGRAM, False)
+    assert len(_files(tmp_path)) == 1
+    tm.clear_cache()
+    assert _files(tmp_path) == []
+    tm.set_cache(False)
+    tm.parse_tuples(PROGRAM, False)
+    assert _files(tmp_path) == []
@@ -0,0 +1,76 @@
+import pytest
+import TM_simulator as tm
+from TM_simulator.cycles import CycleDetector
+
+PROGRAMS = {
+    "exact": ("(0, -, 1, -, >)\n(1, -, 0, -, <)", ""),
+    "right": ("(0, -, 0, X, >)", ""),
+    "left": ("(0, -, 0, X, <)", ""),
+    "zigzag": ("(0, -, 1, 1, >)\n(1, -, 2, 0, <)\n(2, 1, 3, 1, >)\n(3, 0, 0, 0, >)", ""),
+    "three": ("(0, -, 1, -, >)\n(1, -, 2, -, >)\n(2, -, 0, -, <)\n(0, X, 0, X, <)", ""),
+    "sweep": ("(0, A, 0, A, >)\n(0, -, 1, A, >)\n(1, -, 0, A, >)", "A" * 20),
+    "counter": ("(0, 0..8, 1, 1..9, >)\n(0, 9, 0, 0, <)\n(0, -, 1, 1, >)\n(1, 0..9, 1, 0..9, >)\n(1, -, 0, -, <)", "0"),
+    "halts": ("(0, A, 0, B, >)", "AAAA"),
+}
+
+def _machine(name: str) -> tm.TuringMachine:
+    code, tape = PROGRAMS[name]
+    return tm.TuringMachine.load_tuples(tm.parse_tuples(code, False), tm.parse_breakpoints(code, False), tape)
+
+def _detect(name: str, interval: int, max_steps: int, chunk: int = None) -> tuple:
+    machine = _machine(name)._machine
+    detector = CycleDetector(interval)
+    steps = 0
+    while steps < max_steps and not (machine.ended or detector.looping):
+        done = detector.run(machine, min(chunk or max_steps, max_steps - steps))
+        if not done:
+            break
+        steps += done
+    assert steps == machine.steps
+    return detector.looping, detector.cycle_length, detector.cycle_shift, machine.ended
+
+@pytest.mark.parametrize("name, length, shift", [("exact", 2, 0), ("right", 1, 1), ("left", 1, -1), ("zigzag", 4, 2),
+                                                 ("three", 3, 1), ("sweep", 2, 2)])
+@pytest.mark.parametrize("interval", [1, 7])
+def test_detector_finds_the_shortest_cycle(name, length, shift, interval):
+    assert _detect(name, interval, 200_000) == (True, length, shift, False)
+
+@pytest.mark.parametrize("name, ended", [("counter", False), ("halts", True)])
+def test_detector_does_not_stop_machines_without_cycles(name, ended):
+    assert _detect(name, 1, 100_000) == (False, None, None, ended)
+
+@pytest.mark.parametrize("chunk", [1, 3, 50])
+@pytest.mark.parametrize("name", ["exact", "zigzag", "three", "sweep"])
+def test_detector_in_chunks_samples_the_same_steps(name, chunk):
+    machine = _machine(name)
+    whole = CycleDetector(5)
+    whole.run(machine._machine, 200_000)
+    assert _detect(name, 5, 200_000, chunk) == (True, whole.cycle_length, whole.cycle_shift, False)
+
+def test_translated_cycle_is_found_after_the_same_steps_in_chunks():
+    steps = []
+    for chunk in (None, 1, 4):
+        machine = _machine("three")._machine
+        detector = CycleDetector(1)
+        while not detector.looping:
+            detector.run(machine, chunk or float("inf"))
+        steps.append(machine.steps)
+    assert steps[0] == steps[1] == steps[2]
+
+def test_detector_reset_forgets_the_cycle():
+    machine = _machine("exact")
+    detector = CycleDetector(1)
+    detector.run(machine._machine)
+    assert detector.looping
+    detector.reset()
+    assert (detector.looping, detector.cycle_length, detector.cycle_shift, detector.saved) == (False, None, None, None)
+
+def test_cycle_detection_of_the_machine():
+    machine = _machine("zigzag")
+    machine.set_threshold(1_000_000)
+    machine.set_cycle_detection(True)
+    machine.run()
+    assert machine.looping and machine.cycle_length == 4
+    assert machine.steps < 1_000_000 and not machine.ended
+    machine.reset()
+    assert not machine.looping and machine.cycle_length is None
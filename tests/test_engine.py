@@ -0,0 +1,91 @@
+import os
+import random
+import pytest
+import TM_simulator as tm
+from TM_simulator.engine import _remapped_char
+from conftest import EXAMPLES
+
+_movements = {"<": -1, "-": 0, ">": 1}
+
+def _reference_run(code, tape: str, max_steps: int) -> tuple[int, str, str, bool]:
+    r"""
+    Runs the parsed tuples in ``code`` on ``tape`` looking them up in a dictionary by state and symbol, like the machine
+    did before the compiled transition table. Returns the steps, the state, the used part of the tape and if it ended
+    """
+    rules = {(x.current_state, _remapped_char(x.current_symbol)): x for x in code}
+    cells = dict(enumerate(tape))
+    state, position, steps, ended = "0", 0, 0, False
+    while steps < max_steps:
+        rule = rules.get((state, cells.get(position, " ")))
+        if rule is None:
+            ended = True
+            break
+        cells[position] = _remapped_char(rule.new_symbol)
+        state = rule.new_state
+        position += _movements[rule.movement]
+        steps += 1
+    written = [i for i, x in cells.items() if x != " "]
+    used = "".join(cells.get(i, " ") for i in range(min(written), max(written) + 1)) if written else ""
+    return steps, state, used, ended
+
+def _random_program(seed: int) -> str:
+    r"""Returns a random deterministic program with a few states and symbols, without a halting state for some symbols"""
+    rng = random.Random(seed)
+    states = [str(x) for x in range(rng.randint(1, 5))]
+    symbols = ["-", "A", "B", "C"]
+    lines = []
+    for state in states:
+        for symbol in symbols:
+            if rng.random() < 0.85:
+                lines.append(f"({state}, {symbol}, {rng.choice(states + ['H'])}, {rng.choice(symbols)}, "
+                             f"{rng.choice('<>-')})")
+    return "\n".join(lines)
+
+@pytest.mark.parametrize("filename, tape, expected", [
+    ("dots.txt", ".....", (6, "END", "O")),
+    ("even-odd.txt", "12345", (16, "END", "O")),
+    ("palindrome.txt", "ABABA", (21, "END", "Y")),
+    ("palindrome.txt", "AB", (5, "END", "N")),
+    ("reverse.txt", "ABBAB", (78, "END", "BABBA")),
+    ("bin-dec.txt", "101010", (710, "END", "42")),
+    ("bin-dec.txt", "10x1", (4, "TO_DEC", "$10X1")),
+    ("int-division.txt", "1234/56", (2045, "FINE", "22|2")),
+    ("int-division.txt", "98765/43", (183442, "FINE", "2296|37")),
+])
+def test_examples_match_the_baseline(filename, tape, expected):
+    machine = tm.TuringMachine.load_file(os.path.join(EXAMPLES, filename), tape)
+    machine.set_threshold(-1)
+    machine.run()
+    assert (machine.steps, machine.state, machine.tape) == expected
+    assert machine.ended
+
+@pytest.mark.parametrize("filename, tape", [("reverse.txt", "ABBABAB"), ("bin-dec.txt", "1101"), ("palindrome.txt", "ABBA")])
+def test_examples_match_the_reference(filename, tape):
+    code = tm.parse_tuples(os.path.join(EXAMPLES, filename))
+    machine = tm.TuringMachine.load_tuples(code, tm.parse_breakpoints(os.path.join(EXAMPLES, filename)), tape)
+    machine.set_threshold(-1)
+    machine.run()
+    steps, state, used, ended = _reference_run(code, tape, 10 ** 6)
+    assert (machine.steps, machine.state, machine.tape) == (steps, state, used)
+    assert machine.ended == ended
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_programs_match_the_reference(seed):
+    program = _random_program(seed)
+    code = tm.parse_tuples(program, False)
+    tape = "".join(random.Random(seed).choice("ABC") for _ in range(seed % 7))
+    machine = tm.TuringMachine.load_tuples(code, tm.parse_breakpoints(program, False), tape)
+    machine.set_threshold(500)
+    machine.run()
+    steps, state, used, _ = _reference_run(code, tape, 500)
+    assert (machine.steps, machine.state, machine.tape) == (steps, state, used)
+
+def test_steps_in_chunks_match_a_single_run():
+    path = os.path.join(EXAMPLES, "int-division.txt")
+    machine = tm.TuringMachine.load_file(path, "100/7")
+    stepped = tm.TuringMachine.load_file(path, "100/7")
+    machine.set_threshold(-1)
+    machine.run()
+    while not stepped.ended:
+        stepped.step(37)
+    assert (stepped.steps, stepped.state, stepped.tape) == (machine.steps, machine.state, machine.tape)
@@ -0,0 +1,133 @@
+import pytest
+import TM_simulator as tm
+
+CASES = [("int-division.txt", "1234/56"), ("reverse.txt", "ABBABBBAAB")]
+
+def _load(program: tm.Program, tape: str) -> tm.TuringMachine:
+    return tm.TuringMachine.load_program(program, tape)
+
+def _status(machine: tm.TuringMachine) -> tuple:
+    return machine.steps, machine.state, machine.tape, machine.head
+
+def _status_after(program: tm.Program, tape: str, steps: int) -> tuple:
+    r"""Returns the status of a new machine stepped forward ``steps`` times"""
+    machine = _load(program, tape)
+    machine.step(steps)
+    return _status(machine)
+
+@pytest.mark.parametrize("filename, tape", CASES)
+@pytest.mark.parametrize("interval", [1, 7, 50, -1])
+def test_step_back_from_the_checkpoints(program, filename, tape, interval):
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(interval)
+    machine.step(400)
+    for times in (1, 13, 50, 100, 1000):
+        expected = _status_after(compiled, tape, max(machine.steps - times, 0))
+        machine.step_back(times)
+        assert _status(machine) == expected
+        machine.step(times // 2)
+        assert _status(machine) == _status_after(compiled, tape, machine.steps)
+
+def test_step_back_an_ended_machine(program):
+    filename, tape = CASES[0]
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(100)
+    machine.run()
+    assert machine.ended
+    machine.step_back(10)
+    assert _status(machine) == _status_after(compiled, tape, 2035)
+    assert not machine.ended
+    machine.run()
+    assert _status(machine) == _status_after(compiled, tape, 2045)
+    assert machine.ended
+
+def test_checkpoints_restore_the_closest_snapshot(program):
+    filename, tape = CASES[0]
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(100)
+    machine.step(1000)
+    checkpoints = machine._machine.checkpoints
+    assert checkpoints.steps == list(range(100, 1001, 100))
+    machine.step_back(250)
+    assert checkpoints.steps == list(range(100, 701, 100))
+    assert _status(machine) == _status_after(compiled, tape, 750)
+
+def test_checkpoints_evict_the_oldest_snapshots(program):
+    filename, tape = CASES[0]
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(10, memory=2000)
+    machine.step(1000)
+    checkpoints = machine._machine.checkpoints
+    assert 0 < checkpoints.size <= 2000
+    assert checkpoints.steps[-1] == 1000 and checkpoints.steps[0] > 10
+    machine.step_back(995)
+    assert _status(machine) == _status_after(compiled, tape, 5)
+
+def test_step_back_with_the_sparse_tape():
+    program = "(0, -, 0, A, >)"
+    code, breakpoints = tm.parse_tuples(program, False), tm.parse_breakpoints(program, False)
+    machine = tm.TuringMachine.load_tuples(code, breakpoints, "")
+    machine.set_sparse_tape(True)
+    machine.set_checkpoints(1000)
+    machine.step(20000)
+    machine.step_back(7777)
+    assert (machine.steps, machine.head, machine.tape) == (12223, 12223, "A" * 12223)
+
+def _load_tuples(program: str, tape: str) -> tm.TuringMachine:
+    return tm.TuringMachine.load_tuples(tm.parse_tuples(program, False), tm.parse_breakpoints(program, False), tape)
+
+def _journal_steps(machine: tm.TuringMachine) -> int:
+    r"""Returns the number of steps recorded in the journal of ``machine`` (a sweep is a single entry)"""
+    return sum(1 if isinstance(x, int) else len(x[1]) for x in machine._machine.journal.entries)
+
+@pytest.mark.parametrize("filename, tape", CASES)
+def test_step_back_from_the_journal(program, filename, tape):
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(-1)
+    machine.set_journal(1000)
+    machine.step(600)
+    for times in (1, 2, 30, 100):
+        recorded = _journal_steps(machine)
+        expected = _status_after(compiled, tape, machine.steps - times)
+        machine.step_back(times)
+        assert _status(machine) == expected
+        assert _journal_steps(machine) == recorded - times  # undone from the journal, not run again from the start
+
+def test_step_back_inside_a_sweep():
+    program = "(0, A, 0, B, >)\n(0, -, 1, -, <)"
+    machine = _load_tuples(program, "A" * 100)
+    machine.set_journal(1000)
+    machine.step(60)
+    assert len(machine._machine.journal.entries) == 2  # the first step, on the edge of the buffer, and the sweep
+    machine.step_back(25)
+    assert (machine.steps, machine.head, machine.tape) == (35, 35, "B" * 35 + "A" * 65)
+    machine.step_back(30)
+    assert (machine.steps, machine.head, machine.tape) == (5, 5, "B" * 5 + "A" * 95)
+    machine.run()
+    assert (machine.steps, machine.state, machine.head, machine.tape) == (101, "1", 99, "B" * 100)
+
+def test_step_back_past_the_journal_uses_the_checkpoints(program):
+    filename, tape = CASES[0]
+    compiled = program(filename)
+    machine = _load(compiled, tape)
+    machine.set_checkpoints(100)
+    machine.set_journal(10)
+    machine.step(400)
+    machine.step_back(50)
+    assert _status(machine) == _status_after(compiled, tape, 350)
+    machine.step(20)
+    machine.step_back(5)
+    assert _status(machine) == _status_after(compiled, tape, 365)
+
+def test_step_back_from_the_journal_after_the_tape_grew_on_the_left():
+    machine = _load_tuples("(0, -, 0, A, <)", "")
+    machine.set_checkpoints(-1)
+    machine.set_journal(10_000)
+    machine.step(5000)
+    machine.step_back(4000)
+    assert (machine.steps, machine.head, machine.tape) == (1000, -1000, "A" * 1000)
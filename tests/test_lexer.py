@@ -0,0 +1,80 @@
+import pytest
+from TM_simulator.lexer import tokenize, Token
+from TM_simulator.tuples import TuringTuple
+
+def _errors(line: str) -> list[tuple[str, int]]:
+    return [(x[1], x[2]) for x in TuringTuple(line, 0, True).pars_errors]
+
+def _expanded(line: str) -> list[str]:
+    return TuringTuple(line, 0, True).expanded_tuple
+
+def test_tokenize_keeps_the_columns_of_the_line():
+    tokens, clean = tokenize("!(a, \\,) # c")
+    assert clean == "!(A,\\,)"
+    assert tokens == [Token("breakpoint", "!", 0), Token("open", "(", 1), Token("text", "A", 2),
+                      Token("separator", ",", 3), Token("escape", "\\,", 5), Token("close", ")", 7),
+                      Token("comment", "# C", 9)]
+
+def test_tokenize_skips_the_spaces():
+    tokens, clean = tokenize("(q0, a .. c, -)")
+    assert clean == "(Q0,A..C,-)"
+    assert [(x.kind, x.column) for x in tokens] == [("open", 0), ("text", 1), ("separator", 3), ("text", 5),
+                                                    ("range", 7), ("text", 10), ("separator", 11), ("text", 13),
+                                                    ("close", 14)]
+
+def test_tokenize_classes():
+    tokens, clean = tokenize("([^ab], {x})")
+    assert clean == "([^AB],{X})"
+    assert [x.kind for x in tokens] == ["open", "class_open", "exclusion", "text", "class_close", "separator",
+                                        "class_open", "text", "class_close", "close"]
+
+@pytest.mark.parametrize("line, errors", [
+    ("0, a, 1, a, >)", [("opening_char_missing", 0), ("incorrect_arguments_amount", 13), ("empty_rule", 14)]),
+    ("(0, a, 1, a, >", [("closing_char_missing", 14), ("incorrect_arguments_amount", 13), ("empty_rule", 1)]),
+    ("(0, a, 1, a)", [("incorrect_arguments_amount", 11)]),
+    ("(0, a, 1, a, >, b)", [("incorrect_arguments_amount", 16)]),
+    ("(0, a, , a, >)", [("empty_rule", 7)]),
+    ("(0, a, 1, a, x)", [("unrecognised_movement", 13)]),
+    ("(0, c..a, 1, a, >)", [("descending_order", 4)]),
+    ("(0, [ab, 1, a, >)", [("missing_class_limiters", 4), ("empty_class", 4)]),
+    ("!(0, [ab, 1, a, >)", [("missing_class_limiters", 5), ("empty_class", 5)]),
+    ("(0, [a]{b}, 1, a, >)", [("multiple_class_types", 4)]),
+    ("(0, [a][b], 1, a, >)", [("multiple_class", 4)]),
+    ("(0, ab, 1, [ab]c, >)", [("multiple_symbols", 4)]),
+    ("(0, [ab], 1, [abc], >)", [("different_class_sizes", 1)]),
+    ("(0, ..c, 1, a, >)", [("symbol_dot_limiter", 4)]),
+    ("(0, a.., 1, a, >)", [("symbol_dot_limiter", 4)]),
+    ("(a,,c,d,>)", [("empty_rule", 3)]),
+    ("(a,b,c,,)", [("empty_rule", 7)]),
+    ("(,,,,)", [("empty_rule", 1)]),
+    ("(a,,[bc],d,>)", [("empty_rule", 3)]),
+    ("(a,b..,c,d,>)", [("symbol_dot_limiter", 3)]),
+    ("(a,b..,[cd],d,>)", [("symbol_dot_limiter", 3)]),
+    ("([ab],c,[def],f,>)", [("different_class_sizes", 1)]),
+])
+def test_errors_point_to_the_column_of_the_line(line, errors):
+    assert _errors(line) == errors
+
+@pytest.mark.parametrize("line", ["(0, a, 1, a, >) # comment", "  (q0 ,  a..c , q1, x, <)", "(0, \\,, 1, \\(, >)"])
+def test_valid_lines_have_no_errors(line):
+    assert _errors(line) == []
+
+@pytest.mark.parametrize("line, expanded", [
+    ("(0, a..c..e, 1, -, >)", ["0,A,1,-,>", "0,B,1,-,>", "0,C,1,-,>", "0,D,1,-,>", "0,E,1,-,>"]),
+    ("(0, A[A], 1, -, >)", ["0,A,1,-,>", "0,A,1,-,>"]),
+    ("(0, [a..c], 1, [x..z], >)", ["0,A,1,X,>", "0,B,1,Y,>", "0,C,1,Z,>"]),
+    ("(0, {ab}, 1, {ab}, >)", ["0,A,1,A,>", "0,B,1,B,>"]),
+    ("(0, \\,, 1, \\(, >)", ["0,\\,,1,\\(,>"]),
+    ("(0, ..c, 1, a, >)", ["0,C,1,A,>"]),
+])
+def test_expansion(line, expanded):
+    assert _expanded(line) == expanded
+
+@pytest.mark.parametrize("line, excluded", [
+    ("(0, [^\\,], 1, -, >)", {"\\,"}),
+    ("(0, [^\\,$\\]], 1, -, >)", {"\\,", "$", "\\]"}),
+    ("(0, ^$/, 1, -, >)", {"$", "/"}),
+])
+def test_exclusion_removes_only_the_excluded_symbols(line, excluded):
+    everything = set(_expanded("(0, [^\\,], 1, -, >)")) | {"0,\\,,1,-,>"}
+    assert set(_expanded(line)) == everything - {f"0,{x},1,-,>" for x in excluded}
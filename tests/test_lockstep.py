@@ -0,0 +1,29 @@
+import pytest
+import TM_simulator as tm
+from TM_simulator.tuples import TuringTuple
+
+np = pytest.importorskip("numpy")
+
+def _outcome(results) -> list[tuple]:
+    return [(x.index, x.tape, x.state, x.steps, x.status) for x in results]
+
+@pytest.mark.parametrize("filename, tapes", [
+    ("int-division.txt", ["1234/56", "100/7", "0/3", "99/1", "5/5", "", "12/"]),
+    ("reverse.txt", ["A", "AB", "ABBABBBAAB", "B" * 40, ""]),
+    ("bin-dec.txt", ["1", "101010", "1111111", "10x1"]),
+])
+@pytest.mark.parametrize("threshold", [50_000, 250, 1])
+def test_run_lockstep_matches_the_serial_runs(program, filename, tapes, threshold):
+    serial = tm.run_batch(program(filename), tapes, workers=1, threshold=threshold)
+    assert _outcome(tm.run_lockstep(program(filename), tapes, threshold)) == _outcome(serial)
+
+def test_run_lockstep_grows_the_tapes_on_both_sides():
+    code = tm.parse_tuples("(0, A, 0, A, >)\n(0, -, 1, D, <)\n(1, A, 1, B, <)\n(1, -, 2, C, >)\n(2, B, 2, A, >)\n"
+                           "(2, D, 3, D, -)", False)
+    tapes = ["A" * 100, "A", "A" * 37]
+    assert _outcome(tm.run_lockstep(code, tapes)) == _outcome(tm.run_batch(code, tapes, workers=1))
+    assert [x.tape for x in tm.run_lockstep(code, tapes)] == ["C" + "A" * x + "D" for x in (100, 1, 37)]
+
+def test_run_lockstep_rejects_raw_tuples():
+    with pytest.raises(ValueError):
+        tm.run_lockstep([TuringTuple("(0, -, 0, -, >)", 0, True)], ["A"])
@@ -0,0 +1,75 @@
+import pytest
+import TM_simulator as tm
+
+def _load_tuples(program: str, tape: str) -> tm.TuringMachine:
+    return tm.TuringMachine.load_tuples(tm.parse_tuples(program, False), tm.parse_breakpoints(program, False), tape)
+
+@pytest.mark.parametrize("filename, tape", [("int-division.txt", "1234/56"), ("reverse.txt", "ABBABBBAAB"),
+                                            ("bin-dec.txt", "1011011"), ("palindrome.txt", "ABBBA")])
+@pytest.mark.parametrize("block, cache_size", [(1, 1), (3, 2), (8, 100_000), (32, 7)])
+def test_macro_mode_matches_the_normal_mode(program, filename, tape, block, cache_size):
+    normal = tm.TuringMachine.load_program(program(filename), tape)
+    macro = tm.TuringMachine.load_program(program(filename), tape)
+    normal.set_threshold(-1)
+    macro.set_threshold(-1)
+    normal.run()
+    macro.run(mode="macro", block=block, cache_size=cache_size)
+    assert (macro.steps, macro.state, macro.tape, macro.head, macro.ended) == \
+           (normal.steps, normal.state, normal.tape, normal.head, normal.ended)
+    assert macro.cache_info()["currsize"] <= cache_size
+
+@pytest.mark.parametrize("threshold", [1, 5, 99, 1000])
+def test_macro_mode_stops_at_the_threshold(program, threshold):
+    machine = tm.TuringMachine.load_program(program("int-division.txt"), "1234/56")
+    machine.set_threshold(threshold)
+    machine.run(mode="macro", block=16)
+    expected = tm.TuringMachine.load_program(program("int-division.txt"), "1234/56")
+    expected.step(threshold)
+    assert (machine.steps, machine.state, machine.tape, machine.head) == \
+           (expected.steps, expected.state, expected.tape, expected.head)
+
+def test_macro_cache_counts_hits_and_misses():
+    machine = _load_tuples("(0, A, 0, A, >)", "A" * 50)
+    machine.run(mode="macro", block=1, cache_size=10)
+    assert machine.ended and machine.steps == 50
+    assert machine.cache_info() == {"block": 1, "hits": 49, "misses": 2, "maxsize": 10, "currsize": 2}
+
+@pytest.mark.parametrize("cache_size, hits, misses", [(1, 1, 6), (2, 2, 5), (3, 3, 4)])
+def test_macro_cache_evicts_the_least_recently_used(cache_size, hits, misses):
+    # the blocks are A, A, B, A, C, B and the blank: with two entries C evicts B, not A, as A was used after B
+    machine = _load_tuples("(0, ABC, 0, ABC, >)", "AABACB")
+    machine.run(mode="macro", block=1, cache_size=cache_size)
+    info = machine.cache_info()
+    assert (info["hits"], info["misses"], info["currsize"]) == (hits, misses, min(cache_size, 4))
+
+def test_macro_cache_is_kept_between_runs():
+    machine = _load_tuples("(0, A, 0, A, >)", "A" * 50)
+    machine.set_threshold(10)
+    machine.run(mode="macro", block=1)
+    machine.run(mode="macro", block=1)
+    assert machine.cache_info()["misses"] == 1
+    machine.run(mode="macro", block=2)
+    assert machine.cache_info()["misses"] == 1 and machine.cache_info()["block"] == 2
+
+def test_macro_mode_stops_at_the_breakpoints():
+    program = "(0, AB, 0, AB, >)\n!(0, C, 0, C, >)"
+    normal = _load_tuples(program, "ABABABCABAB")
+    macro = _load_tuples(program, "ABABABCABAB")
+    for machine in (normal, macro):
+        machine.set_breakpoints(True)
+    normal.run()
+    macro.run(mode="macro", block=4)
+    assert (macro.steps, macro.head, macro.paused) == (normal.steps, normal.head, normal.paused) == (7, 7, True)
+
+def test_macro_mode_keeps_the_window_of_the_sparse_tape():
+    normal = _load_tuples("(0, -, 0, X, >)\n(0, A, 0, A, >)", "AAA")
+    macro = _load_tuples("(0, -, 0, X, >)\n(0, A, 0, A, >)", "AAA")
+    for machine in (normal, macro):
+        machine.set_sparse_tape(True)
+        machine.set_threshold(600_000)
+    normal.run()
+    macro.run(mode="macro", block=16)
+    tape = macro._machine.cells
+    assert len(tape.data) <= tape.max_window < 600_000
+    assert (macro.steps, macro.head, macro.state) == (normal.steps, normal.head, normal.state) == (600_000, 600_000, "0")
+    assert macro._machine.cells.used() == normal._machine.cells.used()
@@ -0,0 +1,83 @@
+import os
+import json
+import pytest
+import TM_simulator as tm
+from TM_simulator.machine import TuringMachine as _TMachine
+from TM_simulator.profiler import ProfileReport
+from conftest import EXAMPLES
+
+CASES = [("reverse.txt", "ABBABBBAAB"), ("bin-dec.txt", "1011011"), ("int-division.txt", "1234/56"),
+         ("dots.txt", "." * 40)]
+
+def _profiled(filename: str, tape: str) -> tm.TuringMachine:
+    machine = tm.TuringMachine.load_file(os.path.join(EXAMPLES, filename), tape)
+    machine.set_profile(True)
+    return machine
+
+def _from_json(text: str) -> ProfileReport:
+    data = json.loads(text)
+    return ProfileReport(data["steps"], tuple((x["line"], x["hits"], x["text"]) for x in data["lines"]),
+                         tuple((x["rule"], x["line"], x["hits"]) for x in data["rules"]), tuple(data["states"].items()),
+                         data["min_position"], data["max_position"],
+                         tuple((int(position), visits) for position, visits in data["cells"].items()))
+
+@pytest.mark.parametrize("filename, tape", CASES)
+def test_profile_counts_add_up_to_the_steps(filename, tape):
+    machine = _profiled(filename, tape)
+    machine.run()
+    report = machine.profile()
+    assert report.steps == machine.steps > 0
+    assert sum(x[1] for x in report.lines) == sum(x[2] for x in report.rules) == report.steps
+    assert sum(x[1] for x in report.states) == sum(x[1] for x in report.cells) == report.steps
+    assert report.min_position == report.cells[0][0] and report.max_position == report.cells[-1][0]
+    assert [x[1] for x in report.lines] == sorted((x[1] for x in report.lines), reverse=True)
+
+@pytest.mark.parametrize("filename, tape", CASES)
+def test_profile_to_json_round_trips(filename, tape):
+    machine = _profiled(filename, tape)
+    machine.run()
+    report = machine.profile()
+    assert _from_json(report.to_json()) == report
+
+@pytest.mark.parametrize("filename, tape", CASES)
+def test_profiled_run_matches_the_plain_run(filename, tape):
+    plain = tm.TuringMachine.load_file(os.path.join(EXAMPLES, filename), tape)
+    profiled = _profiled(filename, tape)
+    for machine in (plain, profiled):
+        machine.step(17)
+        machine.run()
+    assert (profiled.steps, profiled.state, profiled.tape, profiled.head) == \
+           (plain.steps, plain.state, plain.tape, plain.head)
+
+def test_profile_counts_each_step_of_a_sweep():
+    whole = _profiled("dots.txt", "." * 1000)
+    whole.run()
+    single = _profiled("dots.txt", "." * 1000)
+    while not single.ended:
+        single.step(1)
+    assert whole.profile() == single.profile()
+    assert whole.profile().steps == whole.steps
+
+def test_profile_is_cleared_by_reset():
+    machine = _profiled("reverse.txt", "ABBA")
+    machine.run()
+    machine.reset()
+    assert machine.profile().steps == 0 and machine.profile().cells == ()
+    machine.run()
+    assert machine.profile().steps == machine.steps
+
+def test_profiler_swaps_the_loop_of_the_machine():
+    machine = tm.TuringMachine.load_file(os.path.join(EXAMPLES, "reverse.txt"), "ABBA")
+    assert "_run" not in machine._machine.__dict__ and machine.profile() is None
+    machine.set_profile(True)
+    assert machine._machine._run.__name__ == "_profiled_run"
+    machine.set_profile(False)
+    assert "_run" not in machine._machine.__dict__ and machine._machine._run.__func__ is _TMachine._run
+    assert machine.profile() is None
+
+def test_summary():
+    machine = _profiled("reverse.txt", "ABBA")
+    machine.run()
+    summary = machine.profile().summary(top=3)
+    assert summary.startswith(f"Steps: {machine.steps}    ")
+    assert "Hottest lines:" in summary and "Steps per state:" in summary and "Visits per tape cell:" in summary
@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+import pytest
+import TM_simulator as tm
+from TM_simulator.cache import ParseCache
+from TM_simulator.program import parse, _min_chunk_lines
+
+PROGRAM = "(0, [a..c], 0, [xyz], >)\n!(0, -, end, -, <)\n# comment\n\n(end, x, end, a, <)"
+
+def _outcome(parsed: tuple) -> tuple:
+    code_tuples, *rest = parsed
+    return [x.__dict__ for x in code_tuples], rest
+
+def _fields(program: tm.Program) -> tuple:
+    r"""Returns the fields of ``program`` but the compiled table, with the fields of each tuple instead of the tuple"""
+    return tuple(x.__dict__ if hasattr(x, "__dict__") else x for x in program.tuples), *program[1:-1]
+
+def _files(directory) -> list[str]:
+    return sorted(x for x in os.listdir(directory) if x.endswith(".bin")) if os.path.isdir(directory) else []
+
+def _large_program(length: int) -> str:
+    r"""
+    Returns a program of ``length`` lines with breakpoints, comments, syntax errors in different chunks and a tuple at
+    the end that conflicts with the first line
+    """
+    lines = []
+    for i in range(length):
+        if i % 101 == 50:
+            lines.append(f"(q{i}, [ab, q{i + 1}, -, >)")
+        elif i % 37 == 0:
+            lines.append(f"# line {i}" if i % 2 else "")
+        else:
+            lines.append(f"{'!' if i % 97 == 0 else ''}(q{i}, [ab], q{i + 1}, [ba], {'<>-'[i % 3]})")
+    lines.append("(q1, a, q0, a, <)")
+    return "\n".join(lines)
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_parse_matches_the_serial_parse(workers):
+    program = _large_program(_min_chunk_lines * 3 + 17)
+    serial = parse(program, False, None, workers=1)
+    parallel = parse(program, False, None, workers=workers)
+    assert _outcome(parallel) == _outcome(serial)
+    code_tuples, breakpoint_list, remapped_breakpoint_list, raw_tuples, code_map, pars_errors = serial
+    assert sum(breakpoint_list) > 3 and len(remapped_breakpoint_list) == len(code_map) == len(code_tuples)
+    assert {x[0][0] // _min_chunk_lines for x in pars_errors if x[1] != 'non_deterministic'} == {0, 1, 2, 3}
+    assert [x for x in pars_errors if x[1] == 'non_deterministic'] != []
+
+def test_parallel_parse_of_a_small_program_is_serial():
+    program = _large_program(50)
+    assert _outcome(parse(program, False, None, workers=2)) == _outcome(parse(program, False, None, workers=1))
+
+def test_parallel_parse_checks_the_workers():
+    with pytest.raises(ValueError):
+        parse(_large_program(10), False, None, workers=0)
+
+@pytest.mark.parametrize("lines", [PROGRAM.split("\n"), [x + "\n" for x in PROGRAM.split("\n")]])
+def test_iterable_of_lines_is_parsed_like_the_string(lines):
+    assert _outcome(parse(iter(lines), False)) == _outcome(parse(PROGRAM, False))
+    assert _outcome(parse(iter(lines), True)) == _outcome(parse(PROGRAM, False))
+
+def test_standard_input_is_parsed_like_the_string(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(PROGRAM + "\n"))
+    assert _outcome(parse("-", True)) == _outcome(parse(PROGRAM, False))
+    monkeypatch.setattr(sys, "stdin", io.StringIO(PROGRAM))
+    program = tm.compile_program("-")
+    assert program.raw_lines == tuple(PROGRAM.split("\n"))
+    machine = tm.TuringMachine.load_program(program, "ABC")
+    machine.run()
+    assert machine.ended and machine.tape == "XYZ"
+
+def test_streams_are_not_cached(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    parse(iter(PROGRAM.split("\n")), False, cache)
+    assert _files(str(tmp_path)) == []
+    parse(PROGRAM, False, cache)
+    assert len(_files(str(tmp_path))) == 1
+
+def test_parallel_parse_of_a_stream_matches_the_serial_parse():
+    program = _large_program(_min_chunk_lines * 2 + 5)
+    assert _outcome(parse(iter(program.split("\n")), False, None, workers=2)) == \
+           _outcome(parse(program, False, None, workers=1))
+
+@pytest.mark.parametrize("symbolic", [False, True])
+@pytest.mark.parametrize("stream", [False, True])
+def test_lines_are_dropped_without_keep_lines(symbolic, stream):
+    source = iter(PROGRAM.split("\n")) if stream else PROGRAM
+    program = tm.compile_program(source, False, symbolic=symbolic, keep_lines=False)
+    kept = tm.compile_program(PROGRAM, False, symbolic=symbolic)
+    assert program.raw_lines == () and kept.raw_lines == tuple(PROGRAM.split("\n"))
+    assert _fields(program._replace(raw_lines=kept.raw_lines)) == _fields(kept)
+
+def test_cached_program_drops_the_lines_without_keep_lines(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    parse(PROGRAM, False, cache)
+    assert parse(PROGRAM, False, cache, keep_lines=False)[3] == []
+    assert parse(PROGRAM, False, cache)[3] == PROGRAM.split("\n")
@@ -0,0 +1,79 @@
+import json
+import pytest
+import TM_simulator as tm
+from TM_simulator.cycles import CycleDetector
+from TM_simulator.progress import Progress
+
+def _machine(program: str, tape: str):
+    return tm.TuringMachine.load_tuples(tm.parse_tuples(program, False), tm.parse_breakpoints(program, False),
+                                        tape)._machine
+
+def _lines(capsys) -> list[dict]:
+    captured = capsys.readouterr()
+    assert captured.err.endswith("\n")
+    return [json.loads(x) for x in captured.err.splitlines()]
+
+def test_json_progress_reports_every_interval(capsys):
+    machine = _machine("(0, -, 1, X, >)\n(1, -, 0, Y, >)", "")
+    progress = Progress("json", interval=0)
+    progress.start(machine)
+    for _ in range(3):
+        progress.update(machine, machine.run(10, False), 0.001)
+    lines = _lines(capsys)
+    assert [x["steps"] for x in lines] == [10, 20, 30]
+    assert all(set(x) == {"steps", "steps_per_second", "tape_length", "state", "elapsed", "ended"} for x in lines)
+    assert [(x["state"], x["tape_length"]) for x in lines] == [("0", 10), ("0", 20), ("0", 30)]
+    assert not lines[-1]["ended"] and all(x["steps_per_second"] >= 0 for x in lines)
+
+def test_json_progress_waits_for_the_interval(capsys):
+    machine = _machine("(0, -, 0, -, >)", "")
+    progress = Progress("json", interval=3600)
+    progress.start(machine)
+    progress.update(machine, machine.run(100, False), 0.001)
+    assert capsys.readouterr().err == ""
+
+def test_json_finish_reports_the_end(capsys):
+    machine = _machine("(0, A, 0, B, >)", "AAAA")
+    progress = Progress("json")
+    progress.start(machine)
+    machine.run(float("inf"), False)
+    progress.finish(machine)
+    captured = capsys.readouterr()
+    (line,) = [json.loads(x) for x in captured.err.splitlines()]
+    assert (line["steps"], line["ended"], line["tape_length"]) == (4, True, 4)
+    assert "looping" not in line
+    assert "Simulation ended!" in captured.out and "Output: BBBB" in captured.out
+
+def test_json_finish_reports_the_loop(capsys):
+    machine = _machine("(0, -, 1, 1, >)\n(1, -, 2, 0, <)\n(2, 1, 3, 1, >)\n(3, 0, 0, 0, >)", "")
+    cycles = CycleDetector(1)
+    progress = Progress("json")
+    cycles.run(machine, 10_000)
+    progress.finish(machine, cycles)
+    captured = capsys.readouterr()
+    (line,) = [json.loads(x) for x in captured.err.splitlines()]
+    assert (line["looping"], line["cycle_length"], line["ended"]) == (True, 4, False)
+    assert "every 4 steps, shifted by 2 cells" in captured.out
+
+def test_chunk_adapts_to_the_time():
+    machine = _machine("(0, -, 0, -, >)", "")
+    progress = Progress("json", interval=3600, chunk_time=0.05)
+    progress.update(machine, progress.chunk, 0.001)
+    assert progress.chunk == 8000
+    progress.update(machine, 10, 0.001)
+    assert progress.chunk == 8000
+    for _ in range(20):
+        progress.update(machine, progress.chunk, 1.0)
+    assert progress.chunk == 1
+
+def test_spinner_prints_on_the_standard_output(capsys):
+    machine = _machine("(0, -, 0, -, >)", "")
+    progress = Progress()
+    progress.start(machine)
+    progress.update(machine, machine.run(10, False), 0.001)
+    captured = capsys.readouterr()
+    assert captured.err == "" and "Simulating..." in captured.out
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        Progress("xml")
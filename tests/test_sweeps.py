@@ -0,0 +1,61 @@
+import pytest
+import TM_simulator as tm
+
+PROGRAM = """(0, A, 0, B, >)
+!(0, C, 0, C, >)
+(0, D, 0, D, >)
+(0, -, 1, -, <)
+(1, BC, 1, BC, <)
+!(1, D, 1, D, <)
+(1, -, end, -, >)"""
+
+def _load(tape: str, breakpoints: bool = True) -> tm.TuringMachine:
+    machine = tm.TuringMachine.load_tuples(tm.parse_tuples(PROGRAM, False), tm.parse_breakpoints(PROGRAM, False), tape)
+    machine.set_breakpoints(breakpoints)
+    return machine
+
+def test_sweep_stops_after_a_breakpoint_tuple():
+    machine = _load("AAAAACAAAA")
+    machine.run()
+    assert (machine.steps, machine.state, machine.tape, machine.head) == (6, "0", "BBBBBCAAAA", 6)
+    assert machine.paused and not machine.ended
+
+def test_sweep_stops_at_a_breakpoint_on_the_way_back():
+    machine = _load("AADAA")
+    machine.step(5)
+    assert machine.steps == 5
+    machine.run()
+    assert (machine.steps, machine.state, machine.head) == (9, "1", 1)
+    assert machine.paused
+
+def test_sweep_without_breakpoints_runs_to_the_end():
+    machine = _load("AAAAACAAAA", breakpoints=False)
+    machine.run()
+    assert (machine.steps, machine.state, machine.tape, machine.head) == (22, "END", "BBBBBCBBBB", 0)
+    assert machine.ended
+
+@pytest.mark.parametrize("steps", [1, 2, 3, 7, 10, 11, 15, 21])
+def test_sweep_stops_at_the_step_limit(steps):
+    machine = _load("AAAAACAAAA", breakpoints=False)
+    machine.step(steps)
+    assert machine.steps == steps
+    assert machine.head == (steps if steps <= 10 else 20 - steps)
+
+def test_sweep_stops_at_the_threshold():
+    machine = _load("A" * 100, breakpoints=False)
+    machine.set_threshold(40)
+    machine.run()
+    assert (machine.steps, machine.head, machine.tape) == (40, 40, "B" * 40 + "A" * 60)
+
+@pytest.mark.parametrize("tape", ["AAAAACAAAA", "AADAA", "A" * 50 + "C" + "D" * 50, ""])
+def test_sweeps_match_the_single_steps(tape):
+    machine = _load(tape)
+    single = _load(tape)
+    single.set_profile(True)  # the profiled loop doesn't group the sweeps
+    for _ in range(4):
+        machine.run()
+        single.run()
+        assert (machine.steps, machine.state, machine.tape, machine.head, machine.paused) == \
+               (single.steps, single.state, single.tape, single.head, single.paused)
+        machine.step(7)
+        single.step(7)
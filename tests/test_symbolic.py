@@ -0,0 +1,78 @@
+import random
+import pytest
+import TM_simulator as tm
+from TM_simulator.program import compile_program
+from TM_simulator.engine import _remapped_char
+
+ALPHABETS = {"reverse.txt": "AB", "palindrome.txt": "AB", "bin-dec.txt": "01", "even-odd.txt": "0123456789",
+             "dots.txt": ".", "int-division.txt": "0123456789/", "benchmark.txt": "."}
+
+def _tapes(alphabet: str, seed: int, count: int = 40) -> list[str]:
+    generator = random.Random(seed)
+    return ["".join(generator.choice(alphabet) for _ in range(generator.randrange(12))) for _ in range(count)]
+
+def _outcome(results) -> list[tuple]:
+    return [(x.index, x.state, x.steps, x.tape, x.status) for x in results]
+
+@pytest.mark.parametrize("filename", sorted(ALPHABETS))
+def test_symbolic_batch_matches_the_expanded_program(program, filename):
+    expanded, symbolic = program(filename), program(filename, True)
+    assert len(symbolic.tuples) <= len(expanded.tuples)
+    tapes = _tapes(ALPHABETS[filename], len(filename))
+    assert _outcome(tm.run_batch(symbolic, tapes, workers=1, threshold=20_000)) == \
+           _outcome(tm.run_batch(expanded, tapes, workers=1, threshold=20_000))
+
+@pytest.mark.parametrize("filename", sorted(ALPHABETS))
+def test_symbolic_machine_runs_the_same_lines(program, filename):
+    expanded, symbolic = program(filename), program(filename, True)
+    for tape in _tapes(ALPHABETS[filename], len(filename), 5):
+        machines = [tm.TuringMachine.load_program(x, tape) for x in (expanded, symbolic)]
+        for _ in range(300):
+            for machine in machines:
+                machine.step(1)
+            assert machines[1].state == machines[0].state and machines[1].head == machines[0].head
+            assert symbolic.code_map[machines[1]._machine.prec_index] == \
+                   expanded.code_map[machines[0]._machine.prec_index]
+            if machines[0].ended:
+                break
+        assert machines[1].tape == machines[0].tape and machines[1].ended == machines[0].ended
+
+@pytest.mark.parametrize("filename", sorted(ALPHABETS))
+def test_symbolic_rules_keep_the_tuples_of_their_line(program, filename):
+    expanded, symbolic = program(filename), program(filename, True)
+    assert symbolic.raw_lines == expanded.raw_lines and symbolic.breakpoints == expanded.breakpoints
+    lines = {}
+    for rule, line in zip(symbolic.tuples, symbolic.code_map):
+        lines.setdefault(line, set()).update(
+            (rule.current_state, symbol, rule.new_state, symbol if rule.new_symbol is None else rule.new_symbol,
+             rule.movement) for symbol in rule.current_symbols)
+    assert set(symbolic.code_map) == set(expanded.code_map)
+    for line in lines:
+        tuples = {(x.current_state, _remapped_char(x.current_symbol), x.new_state, _remapped_char(x.new_symbol),
+                   x.movement) for x, y in zip(expanded.tuples, expanded.code_map) if y == line}
+        assert lines[line] == tuples
+
+def test_symbolic_breakpoints_refer_to_the_rules():
+    code = "(0, ab, 0, ab, >)\n!(0, -, back, -, <)\n(back, [ab], back, [ba], <)\n!(back, -, end, -, >)"
+    expanded, symbolic = (tm.compile_program(code, False, symbolic=x) for x in (False, True))
+    assert symbolic.tuple_breakpoints == tuple(symbolic.breakpoints[x] for x in symbolic.code_map)
+    machines = [tm.TuringMachine.load_program(x, "ABBA") for x in (expanded, symbolic)]
+    for machine in machines:
+        machine.set_breakpoints(True)
+        machine.run()
+    assert all(x.paused and not x.ended for x in machines)
+    assert machines[1].steps == machines[0].steps == 5
+    assert symbolic.code_map[machines[1]._machine.prec_index] == expanded.code_map[machines[0]._machine.prec_index] == 1
+
+def test_symbolic_determinism_errors_refer_to_the_rules():
+    code = "(0, ab, 1, -, >)\n(1, -, 1, -, >)\n(0, [bc], 2, -, <)"
+    expanded, symbolic = (compile_program(code, False, None, x) for x in (False, True))
+    assert [x[1] for x in symbolic.errors] == [x[1] for x in expanded.errors] == ["non_deterministic"]
+    assert {symbolic.code_map[x] for x in symbolic.errors[0][0]} == \
+           {expanded.code_map[x] for x in expanded.errors[0][0]} == {0, 2}
+    messages = []
+    for value in (False, True):
+        with pytest.raises(RuntimeError) as error:
+            tm.compile_program(code, False, symbolic=value)
+        messages.append(str(error.value))
+    assert messages[0] == messages[1] and "lines 1, 3" in messages[0]
@@ -0,0 +1,202 @@
+import random
+import pytest
+import TM_simulator as tm
+from TM_simulator.tape import Tape, SparseTape
+
+def _walk(tape: Tape, seed: int, steps: int, cells: dict, position: int = 0) -> int:
+    r"""
+    Moves on ``tape`` like the machine does, from the cell at ``position``, writing random symbols (blank too) on a
+    random walk, and checks the cells against the ``cells`` dictionary, updated at each step. Returns the position
+    """
+    rng = random.Random(seed)
+    for _ in range(steps):
+        index = position + tape.origin
+        assert tape.data[index] == cells.get(position, 0)
+        symbol = rng.choice((0, 0, 1, 2, 3))
+        tape.data[index] = symbol
+        cells[position] = symbol
+        if index == 0 or index == len(tape.data) - 1:
+            index = tape.grow(index)
+            assert index == position + tape.origin
+        move = rng.choice((-1, 1, 1)) if seed % 2 else rng.choice((-1, -1, 1))
+        position += move
+        if rng.random() < 0.01:
+            assert tape.window(position - 9, position + 10) == [cells.get(x, 0) for x in range(position - 9, position + 10)]
+    return position
+
+def _used(cells: dict) -> tuple[int, bytes]:
+    written = [x for x, y in cells.items() if y]
+    if not written:
+        return None, b""
+    return min(written), bytes(cells.get(x, 0) for x in range(min(written), max(written) + 1))
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("chunk_size, window_chunks", [(1, 4), (2, 2), (4, 2), (4, 3), (16, 5), (3, 4), (6, 4), (5, 3),
+                                                       (40, 2)])
+def test_sparse_tape_with_small_chunks_matches_the_cells(seed, chunk_size, window_chunks):
+    tape = SparseTape([1, 2, 3], chunk_size=chunk_size, window_chunks=window_chunks)
+    cells = {0: 1, 1: 2, 2: 3}
+    _walk(tape, seed, 3000, cells)
+    assert len(tape.data) <= chunk_size * window_chunks
+    start, used = tape.used()
+    expected_start, expected = _used(cells)
+    assert bytes(used) == expected
+    if expected:
+        assert start == expected_start
+
+@pytest.mark.parametrize("chunk_size, window_chunks", [(0, 64), (4, 1), (1, 2), (1, 3)])
+def test_sparse_tape_needs_two_cells_in_each_half_of_the_window(chunk_size, window_chunks):
+    with pytest.raises(ValueError):
+        SparseTape([], chunk_size=chunk_size, window_chunks=window_chunks)
+
+def test_sparse_tape_drops_the_blank_chunks():
+    tape = SparseTape([], chunk_size=4, window_chunks=2)
+    position = tape.origin
+    for i in range(1000):
+        tape.data[position] = 1 if i % 100 == 0 else 0
+        if position == len(tape.data) - 1:
+            position = tape.grow(position)
+        position += 1
+    assert 0 < len(tape.chunks) <= 10
+    assert all(chunk.count(0) != len(chunk) for chunk in tape.chunks.values())
+    start, used = tape.used()
+    assert start == 0 and len(used) == 901 and bytes(used).count(1) == 10
+
+def test_sparse_tape_copy_is_independent():
+    tape = SparseTape([1], chunk_size=4, window_chunks=2)
+    cells = {0: 1}
+    position = _walk(tape, 1, 500, cells)
+    copy = tape.copy()
+    used = copy.used()
+    _walk(tape, 2, 500, dict(cells), position)
+    assert copy.used() == used
+    _walk(copy, 3, 500, cells, position)
+
+def test_reserve_loads_the_stored_chunks():
+    tape = SparseTape([], chunk_size=4, window_chunks=2)
+    cells = {}
+    _walk(tape, 3, 2000, cells)
+    first, last = min(cells) - 3, max(cells) + 3
+    tape.reserve(first + tape.origin, last + tape.origin + 1)
+    assert [tape.data[x + tape.origin] for x in range(first, last + 1)] == [cells.get(x, 0) for x in range(first, last + 1)]
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("chunk_size, window_chunks, block", [(4, 4, 5), (3, 4, 3), (6, 5, 8), (1, 8, 2)])
+def test_reserve_moves_the_window_by_blocks(seed, chunk_size, window_chunks, block):
+    # like the macro mode, that reads and writes whole blocks of cells through reserve()
+    tape = SparseTape([1, 2], chunk_size=chunk_size, window_chunks=window_chunks)
+    cells = {0: 1, 1: 2}
+    rng = random.Random(seed)
+    position = 0
+    for _ in range(2000):
+        start = position + tape.origin
+        start += tape.reserve(start, start + block)
+        assert 0 <= start and start + block <= len(tape.data) <= max(tape.max_window, block + 2 * tape.keep)
+        assert list(tape.data[start:start + block]) == [cells.get(position + i, 0) for i in range(block)]
+        for i in range(block):
+            symbol = rng.choice((0, 0, 1, 2))
+            tape.data[start + i] = symbol
+            cells[position + i] = symbol
+        position += block * rng.choice((-1, 1, 1) if seed % 2 else (-1, -1, 1))
+    start, used = tape.used()
+    expected_start, expected = _used(cells)
+    assert bytes(used) == expected and (not expected or start == expected_start)
+
+PROGRAMS = [
+    "(0, -, 1, A, >)\n(1, A, 1, A, >)\n(1, -, 2, A, <)\n(2, A, 2, A, <)\n(2, -, 1, A, >)",
+    "(0, -, 1, X, >)\n(1, -, 2, -, >)\n(2, -, 3, -, >)\n(3, -, 4, -, >)\n(4, -, 5, -, >)\n(5, -, 0, -, >)",
+    "(0, -, 1, X, <)\n(1, -, 2, -, <)\n(2, -, 3, -, <)\n(3, -, 4, -, <)\n(4, -, 5, -, <)\n(5, -, 0, -, <)",
+]
+
+def _wandering_program(seed: int) -> str:
+    r"""Returns a random program that never halts and always moves the head, so it travels far on both sides"""
+    rng = random.Random(seed)
+    states = [str(x) for x in range(4)]
+    return "\n".join(f"({state}, {symbol}, {rng.choice(states)}, {rng.choice('-1')}, {rng.choice('<>')})"
+                     for state in states for symbol in "-1")
+
+def _small_chunks(machine: tm.TuringMachine, chunk_size: int, window_chunks: int) -> tm.TuringMachine:
+    r"""Moves the tape of ``machine`` to a ``SparseTape`` with chunks of ``chunk_size`` cells"""
+    inner = machine._machine
+    start, cells = inner.cells.used()
+    inner.cells = SparseTape(list(cells), chunk_size=chunk_size, window_chunks=window_chunks)
+    inner.initial_cells = inner.cells.copy()
+    inner.tape_position = inner.cells.origin - start if cells else inner.cells.origin
+    inner.checkpoints.clear()
+    return machine
+
+def _machines(program: str, tape: str, chunk_size: int, window_chunks: int) -> tuple:
+    code, breakpoints = tm.parse_tuples(program, False), tm.parse_breakpoints(program, False)
+    dense = tm.TuringMachine.load_tuples(code, breakpoints, tape)
+    return dense, _small_chunks(tm.TuringMachine.load_tuples(code, breakpoints, tape), chunk_size, window_chunks)
+
+@pytest.mark.parametrize("program", PROGRAMS)
+@pytest.mark.parametrize("chunk_size, window_chunks", [(4, 3), (3, 4), (6, 4)])
+def test_machine_with_small_chunks_matches_the_dense_tape(program, chunk_size, window_chunks):
+    dense, sparse = _machines(program, "", chunk_size, window_chunks)
+    sparse.set_checkpoints(97)
+    for steps in (1, 10, 100, 1000, 3000):
+        dense.step(steps)
+        sparse.step(steps)
+        assert (sparse.steps, sparse.state, sparse.head, sparse.tape, sparse.window(9), sparse.cell(-3)) == \
+               (dense.steps, dense.state, dense.head, dense.tape, dense.window(9), dense.cell(-3))
+    sparse.step_back(1234)
+    dense.step_back(1234)
+    assert (sparse.steps, sparse.state, sparse.head, sparse.tape) == (dense.steps, dense.state, dense.head, dense.tape)
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("chunk_size, window_chunks", [(3, 4), (6, 4), (5, 2)])
+def test_random_programs_with_small_chunks_match_the_dense_tape(seed, chunk_size, window_chunks):
+    dense, sparse = _machines(_wandering_program(seed), "1-1", chunk_size, window_chunks)
+    sparse.set_checkpoints(50)
+    for machine in (dense, sparse):
+        machine.set_threshold(3000)
+        machine.run()
+    assert (sparse.steps, sparse.state, sparse.head, sparse.tape) == (dense.steps, dense.state, dense.head, dense.tape)
+    for steps in (1, 1, 7, 120):
+        sparse.step_back(steps)
+        dense.step_back(steps)
+        assert (sparse.steps, sparse.head, sparse.tape) == (dense.steps, dense.head, dense.tape)
+
+def _view_machine() -> tm.TuringMachine:
+    machine = tm.TuringMachine.load_tuples(tm.parse_tuples("(0, A, 0, B, >)\n(0, B, 0, A, >)", False), [False, False],
+                                           "ABBA")
+    machine.step(2)
+    return machine
+
+def test_tape_view_is_a_read_only_view_of_the_buffer():
+    machine = _view_machine()
+    with machine.tape_view() as (view, origin):
+        assert view.readonly and view.obj is machine._machine.cells.data
+        assert "".join(machine.symbols[x] for x in view[origin:origin + 4]) == machine.tape == "BABA"
+        assert (bytes(view), origin) == machine.copy_tape_buffer()
+        with pytest.raises(TypeError):
+            view[origin] = 0
+    with pytest.raises(ValueError):
+        view[origin]
+
+@pytest.mark.parametrize("change", [lambda x: x.run(), lambda x: x.step(), lambda x: x.step_back(), lambda x: x.reset(),
+                                    lambda x: setattr(x, "tape", "AA"), lambda x: x.set_sparse_tape(True)])
+def test_machine_does_not_change_while_a_view_is_open(change):
+    machine = _view_machine()
+    with machine.tape_view() as (view, origin):
+        with pytest.raises(ValueError):
+            change(machine)
+        assert (machine.steps, machine.tape) == (2, "BABA")
+    change(machine)
+    machine.run()
+    assert machine.ended
+
+def test_tape_view_is_released_after_an_exception():
+    machine = _view_machine()
+    with pytest.raises(KeyError):
+        with machine.tape_view():
+            raise KeyError()
+    machine.run()
+    assert machine.tape == "BAAB"
+
+def test_copy_tape_buffer_does_not_change():
+    machine = _view_machine()
+    buffer, origin = machine.copy_tape_buffer()
+    machine.run()
+    assert bytes(buffer[origin:origin + 4]) == bytes(machine.symbols.index(x) for x in "BABA")